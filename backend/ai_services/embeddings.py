@@ -1,4 +1,5 @@
 import logging
+from core.instrumentation import timed
 try:
     import numpy as np
     from sentence_transformers import SentenceTransformer
@@ -24,6 +25,7 @@ class EmbeddingService:
             logger.error(f"Failed to load embedding model: {e}")
             self.is_loaded = False
     
+    @timed('embedding')
     def encode_text(self, text):
         """Convert text to embedding vector."""
         if not self.is_loaded:
@@ -35,6 +37,7 @@ class EmbeddingService:
             logger.error(f"Embedding error: {e}")
             return None
     
+    @timed('embedding')
     def encode_texts(self, texts):
         """Convert multiple texts to embeddings."""
         if not self.is_loaded:
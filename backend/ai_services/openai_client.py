@@ -1,15 +1,20 @@
 import os
 import logging
+from django.conf import settings
 try:
     import openai
 except ImportError:
     openai = None
 
+from core.instrumentation import timed
+from core.ratelimit import rate_limiter
+
 logger = logging.getLogger(__name__)
 
 class OpenAIClient:
     def __init__(self):
         self.api_key = os.environ.get('OPENAI_API_KEY', '')
+        self.timeout = getattr(settings, 'OPENAI_REQUEST_TIMEOUT', 60)
         if self.api_key and openai:
             openai.api_key = self.api_key
         else:
@@ -18,34 +23,40 @@ class OpenAIClient:
     def is_available(self):
         return bool(self.api_key and openai)
     
+    @timed('llm')
     async def generate_completion(self, prompt, max_tokens=500, temperature=0.7):
         """Generate text completion using OpenAI."""
         if not self.is_available():
             return {"error": "OpenAI not configured"}
         
         try:
+            rate_limiter.extend_lease()
             response = await openai.ChatCompletion.acreate(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=max_tokens,
-                temperature=temperature
+                temperature=temperature,
+                request_timeout=self.timeout,
             )
             return response.choices[0].message.content
         except Exception as e:
             logger.error(f"OpenAI API error: {e}")
             return {"error": str(e)}
     
+    @timed('llm')
     def generate_completion_sync(self, prompt, max_tokens=500, temperature=0.7):
         """Synchronous version for non-async contexts."""
         if not self.is_available():
             return {"error": "OpenAI not configured"}
         
         try:
+            rate_limiter.extend_lease()
             response = openai.ChatCompletion.create(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=max_tokens,
-                temperature=temperature
+                temperature=temperature,
+                request_timeout=self.timeout,
             )
             return response.choices[0].message.content
         except Exception as e:
@@ -2,22 +2,20 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from django_ratelimit.decorators import ratelimit
-from django.utils.decorators import method_decorator
-from django.views.decorators.csrf import csrf_exempt
 
 from .job_matching import job_matching_service
 from .profile_optimizer import profile_optimizer
 from .resume_parser import resume_parser
 from jobs.models import Job
 from profiles.models import Profile
+from core.ratelimit import rate_limit
 import logging
 
 logger = logging.getLogger(__name__)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
-@ratelimit(key='user', rate='10/m', method='POST')
+@rate_limit(scope='ai', cost=6, concurrency='ai')
 def analyze_job_match(request):
     """Analyze job match score for user and specific job."""
     try:
@@ -65,7 +63,7 @@ def analyze_job_match(request):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
-@ratelimit(key='user', rate='5/m', method='POST')
+@rate_limit(scope='ai', cost=12, concurrency='ai')
 def analyze_skill_gaps(request):
     """Analyze skill gaps for a specific job."""
     try:
@@ -95,7 +93,7 @@ def analyze_skill_gaps(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-@ratelimit(key='user', rate='3/m', method='GET')
+@rate_limit(scope='ai', cost=20, concurrency='ai')
 def suggest_career_paths(request):
     """Get AI-powered career path suggestions."""
     try:
@@ -121,7 +119,7 @@ def suggest_career_paths(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-@ratelimit(key='user', rate='5/m', method='GET')
+@rate_limit(scope='ai', cost=12, concurrency='ai')
 def optimize_profile(request):
     """Get AI-powered profile optimization suggestions."""
     try:
@@ -171,7 +169,7 @@ def optimize_profile(request):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
-@ratelimit(key='user', rate='2/h', method='POST')
+@rate_limit(scope='resume', cost=1, concurrency='ai')
 def parse_resume(request):
     """Parse uploaded resume file."""
     try:
@@ -215,6 +213,7 @@ def parse_resume(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@rate_limit(scope='ai', cost=1)
 def ai_status(request):
     """Get AI services status."""
     from .openai_client import openai_client
@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from analytics.rollups import rollup_service
+from analytics.sketches import unique_viewer_sketches
+
+class Command(BaseCommand):
+    help = 'Re-aggregate rollups for a date range, one day at a time (does not move the watermark).'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--start', required=True, help='YYYY-MM-DD')
+        parser.add_argument('--end', help='YYYY-MM-DD, exclusive; defaults to today')
+    
+    def handle(self, *args, **options):
+        start = timezone.make_aware(datetime.strptime(options['start'], '%Y-%m-%d'))
+        end = timezone.make_aware(datetime.strptime(options['end'], '%Y-%m-%d')) if options['end'] else timezone.now()
+        written = 0
+        day = start
+        while day < end:
+            written += rollup_service.aggregate_range(day, min(day + timedelta(days=1), end))
+            unique_viewer_sketches.update_range(day, min(day + timedelta(days=1), end))
+            day += timedelta(days=1)
+        self.stdout.write(self.style.SUCCESS(f'Re-aggregated {written} rollup rows'))
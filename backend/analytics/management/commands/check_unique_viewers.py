@@ -0,0 +1,41 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db.models import Case, CharField, Count, Value, When
+from django.db.models.functions import Cast, Concat
+from django.utils import timezone
+from analytics.sketches import unique_viewer_sketches
+from jobs.models import JobView
+
+class Command(BaseCommand):
+    help = 'Compare HyperLogLog unique-viewer estimates with exact COUNT(DISTINCT) for the busiest jobs.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30)
+        parser.add_argument('--jobs', type=int, default=20)
+    
+    def handle(self, *args, **options):
+        # Sketches are per day, so compare whole days
+        end_day = timezone.now().date()
+        start_day = end_day - timedelta(days=options['days'])
+        views = JobView.objects.filter(created_at__date__gte=start_day, created_at__date__lte=end_day)
+        viewer = Case(
+            When(user__isnull=False, then=Concat(Value('u:'), Cast('user_id', CharField()))),
+            default=Concat(Value('ip:'), 'ip_address'),
+            output_field=CharField(),
+        )
+        busiest = (
+            views.values('job_id')
+            .annotate(exact=Count(viewer, distinct=True))
+            .order_by('-exact')[:options['jobs']]
+        )
+        sketch_error = None
+        worst = 0.0
+        for row in busiest:
+            sketch = unique_viewer_sketches.sketch_for(row['job_id'], start_day, end_day)
+            estimate = sketch.count()
+            sketch_error = sketch.standard_error
+            error = abs(estimate - row['exact']) / row['exact'] if row['exact'] else 0.0
+            worst = max(worst, error)
+            self.stdout.write(f"{row['job_id']}: exact={row['exact']} estimate={estimate} error={error:.2%}")
+        if sketch_error is not None:
+            self.stdout.write(f'Worst error {worst:.2%} (standard error {sketch_error:.2%}, 3-sigma {3 * sketch_error:.2%})')
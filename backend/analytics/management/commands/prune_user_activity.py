@@ -0,0 +1,36 @@
+import gzip
+import json
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from analytics.tracking import ActivityRetention
+
+class Command(BaseCommand):
+    help = 'Delete UserActivity rows older than --days in small chunks, optionally archiving them first.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90)
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--archive-dir', help='Write purged rows as gzipped JSON lines, one file per day')
+    
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        archive = self.archiver(Path(options['archive_dir'])) if options['archive_dir'] else None
+        deleted = ActivityRetention(chunk_size=options['chunk_size']).purge(cutoff, archive=archive)
+        self.stdout.write(self.style.SUCCESS(f'Purged {deleted} activity rows older than {cutoff:%Y-%m-%d}'))
+    
+    def archiver(self, archive_dir):
+        """Callback appending purged rows to one gzipped JSON-lines file per day."""
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        
+        def archive(rows):
+            by_day = defaultdict(list)
+            for row in rows:
+                by_day[f"{row['created_at']:%Y-%m-%d}"].append(json.dumps(row, cls=DjangoJSONEncoder))
+            for day, lines in by_day.items():
+                with gzip.open(archive_dir / f'user_activity_{day}.jsonl.gz', 'at') as f:
+                    f.write('\n'.join(lines) + '\n')
+        return archive
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from analytics.rollups import rollup_service
+
+class Command(BaseCommand):
+    help = 'Fold new JobView/Application/UserActivity events into hourly and daily rollups.'
+    
+    def handle(self, *args, **options):
+        written = rollup_service.update()
+        self.stdout.write(self.style.SUCCESS(f'Upserted {written} rollup rows'))
@@ -0,0 +1,40 @@
+from .tracking import activity_buffer
+
+# (url_name, method) -> UserActivity.activity_type
+TRACKED_ROUTES = {
+    ('job-detail', 'GET'): 'job_view',
+    ('job-list-create', 'GET'): 'job_search',
+    ('application-list-create', 'POST'): 'application_submit',
+    ('profile-detail', 'GET'): 'profile_view',
+}
+
+class ActivityTrackingMiddleware:
+    """Queues a UserActivity event for tracked routes; never touches the DB inline."""
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        response = self.get_response(request)
+        match = getattr(request, 'resolver_match', None)
+        user = getattr(request, 'user', None)
+        if match is None or user is None or not user.is_authenticated or response.status_code >= 400:
+            return response
+        
+        activity_type = TRACKED_ROUTES.get((match.url_name, request.method))
+        if activity_type == 'job_search' and 'search' not in request.GET:
+            activity_type = None
+        # profile-detail serves the requester's own profile; looking at yourself is not a profile view
+        if activity_type == 'profile_view' and str(match.kwargs.get('user_id', user.pk)) == str(user.pk):
+            activity_type = None
+        if activity_type:
+            metadata = {'path': request.path, **{k: str(v) for k, v in match.kwargs.items()}}
+            if activity_type == 'job_search':
+                metadata['query'] = request.GET.get('search', '')
+            activity_buffer.track(
+                user.pk,
+                activity_type,
+                metadata=metadata,
+                ip_address=request.META.get('REMOTE_ADDR'),
+                user_agent=request.META.get('HTTP_USER_AGENT', ''),
+            )
+        return response
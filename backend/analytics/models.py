@@ -69,4 +69,39 @@ class JobAnalytics(BaseModel):
         indexes = [
             models.Index(fields=['views_count', 'applications_count']),
             models.Index(fields=['conversion_rate', 'created_at']),
-        ]
\ No newline at end of file
+        ]
+
+class MetricRollup(models.Model):
+    """Pre-aggregated metric per time bucket and dimension (job, company, activity type)."""
+    GRANULARITIES = [
+        ('hour', 'Hourly'),
+        ('day', 'Daily'),
+    ]
+    
+    granularity = models.CharField(max_length=10, choices=GRANULARITIES)
+    bucket = models.DateTimeField()
+    metric = models.CharField(max_length=50)
+    dimension_type = models.CharField(max_length=30)
+    dimension_id = models.CharField(max_length=64)
+    value = models.BigIntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['granularity', 'bucket', 'metric', 'dimension_type', 'dimension_id']
+        indexes = [
+            models.Index(fields=['metric', 'dimension_type', 'dimension_id', 'granularity', 'bucket']),
+        ]
+
+class RollupWatermark(models.Model):
+    """Upper bound of source events already folded into MetricRollup."""
+    name = models.CharField(max_length=50, unique=True)
+    position = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+class JobViewSketch(models.Model):
+    """Daily HyperLogLog sketch of distinct viewers of a job (see analytics.hyperloglog)."""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='view_sketches')
+    day = models.DateField()
+    registers = models.BinaryField()
+    
+    class Meta:
+        unique_together = ['job', 'day']
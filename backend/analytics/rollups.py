@@ -0,0 +1,152 @@
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+from .models import MetricRollup, RollupWatermark, UserActivity
+from .sketches import unique_viewer_sketches
+
+logger = logging.getLogger(__name__)
+
+TRUNC = {'hour': TruncHour, 'day': TruncDay}
+
+class RollupService:
+    """Maintains hourly/daily MetricRollup rows from JobView, Application and UserActivity.
+    
+    Each run re-aggregates only the buckets between the watermark and
+    now - lag, so runs are idempotent and dashboards never scan raw events.
+    """
+    WATERMARK = 'metrics'
+    
+    def __init__(self):
+        self.lag = timedelta(seconds=getattr(settings, 'ROLLUP_LAG_SECONDS', 120))
+        self.initial_lookback = timedelta(days=getattr(settings, 'ROLLUP_INITIAL_LOOKBACK_DAYS', 30))
+    
+    def update(self):
+        """Fold events since the watermark into rollups and advance it."""
+        upto = timezone.now() - self.lag
+        watermark = RollupWatermark.objects.filter(name=self.WATERMARK).first()
+        start = watermark.position if watermark else upto - self.initial_lookback
+        if start >= upto:
+            return 0
+        written = self.aggregate_range(start, upto)
+        unique_viewer_sketches.update_range(start, upto)
+        RollupWatermark.objects.update_or_create(name=self.WATERMARK, defaults={'position': upto})
+        return written
+    
+    def aggregate_range(self, start, end):
+        """Recompute every hour and day bucket touching [start, end)."""
+        written = 0
+        for granularity in ('hour', 'day'):
+            bucket_start = self._floor(start, granularity)
+            bucket_end = self._floor(end, granularity) + self._step(granularity)
+            rows = self._collect(granularity, bucket_start, min(bucket_end, end))
+            with transaction.atomic():
+                MetricRollup.objects.bulk_create(
+                    rows,
+                    batch_size=1000,
+                    update_conflicts=True,
+                    unique_fields=['granularity', 'bucket', 'metric', 'dimension_type', 'dimension_id'],
+                    update_fields=['value'],
+                )
+            written += len(rows)
+        return written
+    
+    def series(self, metric, dimension_type, dimension_id, start, end, granularity='day'):
+        """[(bucket, value)] for a dashboard chart, read from rollups only."""
+        return list(
+            MetricRollup.objects.filter(
+                metric=metric,
+                dimension_type=dimension_type,
+                dimension_id=str(dimension_id),
+                granularity=granularity,
+                bucket__gte=start,
+                bucket__lt=end,
+            ).order_by('bucket').values_list('bucket', 'value')
+        )
+    
+    def totals(self, dimension_type, dimension_id, start, end, metrics=('job_views', 'applications')):
+        rows = (
+            MetricRollup.objects.filter(
+                metric__in=metrics,
+                dimension_type=dimension_type,
+                dimension_id=str(dimension_id),
+                granularity='day',
+                bucket__gte=self._floor(start, 'day'),
+                bucket__lt=end,
+            ).values('metric').annotate(total=Sum('value'))
+        )
+        totals = {metric: 0 for metric in metrics}
+        totals.update({row['metric']: row['total'] for row in rows})
+        if 'job_views' in totals and 'applications' in totals:
+            views = totals['job_views']
+            totals['conversion_rate'] = round(totals['applications'] / views, 4) if views else 0.0
+        return totals
+    
+    def _collect(self, granularity, start, end):
+        from applications.models import Application
+        from jobs.models import JobView
+        
+        trunc = TRUNC[granularity]
+        values = defaultdict(int)
+        
+        views = (
+            JobView.objects.filter(created_at__gte=start, created_at__lt=end)
+            .annotate(bucket=trunc('created_at'))
+            .values('bucket', 'job_id', 'job__company_id')
+            # Same viewer definition as the sketches: a user, or an IP for anonymous views
+            .annotate(
+                n=Count('id'),
+                unique=Count('user', distinct=True) + Count('ip_address', distinct=True, filter=Q(user__isnull=True)),
+            )
+        )
+        for row in views:
+            values[(row['bucket'], 'job_views', 'job', row['job_id'])] += row['n']
+            values[(row['bucket'], 'unique_viewers', 'job', row['job_id'])] += row['unique']
+            values[(row['bucket'], 'job_views', 'company', row['job__company_id'])] += row['n']
+        
+        applications = (
+            Application.objects.filter(created_at__gte=start, created_at__lt=end)
+            .annotate(bucket=trunc('created_at'))
+            .values('bucket', 'job_id', 'job__company_id')
+            .annotate(n=Count('id'))
+        )
+        for row in applications:
+            values[(row['bucket'], 'applications', 'job', row['job_id'])] += row['n']
+            values[(row['bucket'], 'applications', 'company', row['job__company_id'])] += row['n']
+        
+        activities = (
+            UserActivity.objects.filter(created_at__gte=start, created_at__lt=end)
+            .annotate(bucket=trunc('created_at'))
+            .values('bucket', 'activity_type')
+            .annotate(n=Count('id'))
+        )
+        for row in activities:
+            values[(row['bucket'], 'activity', 'activity_type', row['activity_type'])] += row['n']
+        
+        return [
+            MetricRollup(
+                granularity=granularity,
+                bucket=bucket,
+                metric=metric,
+                dimension_type=dimension_type,
+                dimension_id=str(dimension_id),
+                value=value,
+            )
+            for (bucket, metric, dimension_type, dimension_id), value in values.items()
+        ]
+    
+    def _floor(self, moment, granularity):
+        moment = moment.replace(minute=0, second=0, microsecond=0)
+        if granularity == 'day':
+            moment = moment.replace(hour=0)
+        return moment
+    
+    def _step(self, granularity):
+        return timedelta(hours=1) if granularity == 'hour' else timedelta(days=1)
+
+# Global instance
+rollup_service = RollupService()
@@ -0,0 +1,69 @@
+from collections import defaultdict
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import TruncDate
+from .hyperloglog import HyperLogLog
+from .models import JobViewSketch
+
+class UniqueViewerSketches:
+    """Maintains per-job daily HLL sketches and answers unique-viewer queries for any window.
+    
+    Adding a viewer twice is a no-op, so the rollup job may replay overlapping
+    ranges safely.
+    """
+    def __init__(self):
+        self.precision = getattr(settings, 'HLL_PRECISION', 12)
+    
+    def viewer_key(self, user_id, ip_address):
+        # A viewer is a user, or an IP for anonymous views; rollups count the same way
+        return f'u:{user_id}' if user_id else f'ip:{ip_address}'
+    
+    def update_range(self, start, end):
+        """Fold JobView rows created in [start, end) into their (job, day) sketches."""
+        from jobs.models import JobView
+        
+        pending = defaultdict(list)
+        views = (
+            JobView.objects.filter(created_at__gte=start, created_at__lt=end)
+            .annotate(day=TruncDate('created_at'))
+            .values_list('job_id', 'day', 'user_id', 'ip_address')
+        )
+        for job_id, day, user_id, ip_address in views.iterator():
+            pending[(job_id, day)].append(self.viewer_key(user_id, ip_address))
+        if not pending:
+            return 0
+        
+        with transaction.atomic():
+            job_ids = {job_id for job_id, _ in pending}
+            days = {day for _, day in pending}
+            existing = {
+                (s.job_id, s.day): s
+                for s in JobViewSketch.objects.select_for_update().filter(job_id__in=job_ids, day__in=days)
+            }
+            to_create, to_update = [], []
+            for (job_id, day), keys in pending.items():
+                row = existing.get((job_id, day))
+                sketch = HyperLogLog(self.precision, row.registers if row else None)
+                sketch.update(keys)
+                if row:
+                    row.registers = sketch.to_bytes()
+                    to_update.append(row)
+                else:
+                    to_create.append(JobViewSketch(job_id=job_id, day=day, registers=sketch.to_bytes()))
+            JobViewSketch.objects.bulk_create(to_create, batch_size=500)
+            JobViewSketch.objects.bulk_update(to_update, ['registers'], batch_size=500)
+        return len(pending)
+    
+    def sketch_for(self, job_id, start_day, end_day):
+        """Merged sketch for days in [start_day, end_day]."""
+        merged = HyperLogLog(self.precision)
+        rows = JobViewSketch.objects.filter(job_id=job_id, day__gte=start_day, day__lte=end_day).values_list('registers', flat=True)
+        for registers in rows:
+            merged.merge(HyperLogLog(self.precision, registers))
+        return merged
+    
+    def unique_viewers(self, job_id, start_day, end_day):
+        return self.sketch_for(job_id, start_day, end_day).count()
+
+# Global instance
+unique_viewer_sketches = UniqueViewerSketches()
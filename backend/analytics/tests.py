@@ -0,0 +1,79 @@
+from datetime import timedelta
+from unittest import mock
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from authentication.models import User
+from companies.models import Company
+from jobs.models import Job, JobView
+from .hyperloglog import HyperLogLog
+from .models import MetricRollup
+from .rollups import rollup_service
+from .sketches import unique_viewer_sketches
+
+def make_user(name, **extra):
+    return User.objects.create(username=name, email=f'{name}@example.com', **extra)
+
+def make_job(recruiter):
+    company = Company.objects.create(name='Acme', description='', industry='Software', size='1-10', location='Remote')
+    return Job.objects.create(
+        title='Engineer', description='', requirements='', company=company, posted_by=recruiter,
+        location='Remote', job_type='full_time', experience_level='mid',
+    )
+
+class ActivityTrackingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(make_user('viewer'))
+    
+    def test_own_profile_is_not_a_profile_view(self):
+        with mock.patch('analytics.middleware.activity_buffer.track') as track:
+            self.assertEqual(self.client.get('/api/profiles/').status_code, 200)
+            track.assert_not_called()
+            self.client.get('/api/jobs/', {'search': 'python'})
+            self.assertEqual(track.call_args.args[1], 'job_search')
+
+class UniqueViewerTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_user('recruiter', role='recruiter')
+        self.job = make_job(self.recruiter)
+    
+    def test_rollup_and_sketch_agree_on_viewers(self):
+        viewers = [make_user(f'viewer{i}') for i in range(3)]
+        for i, viewer in enumerate(viewers):
+            JobView.objects.create(job=self.job, user=viewer, ip_address=f'10.0.0.{i}')
+        for ip in ('10.0.1.1', '10.0.1.2', '10.0.1.1'):
+            JobView.objects.create(job=self.job, ip_address=ip)
+        start, end = timezone.now() - timedelta(days=1), timezone.now() + timedelta(days=1)
+        rollup_service.aggregate_range(start, end)
+        unique_viewer_sketches.update_range(start, end)
+        
+        rolled_up = MetricRollup.objects.get(granularity='day', metric='unique_viewers', dimension_id=str(self.job.pk))
+        self.assertEqual(rolled_up.value, 5)
+        self.assertEqual(unique_viewer_sketches.unique_viewers(self.job.pk, start.date(), end.date()), 5)
+    
+    def test_malformed_days_uses_the_default(self):
+        client = APIClient()
+        client.force_authenticate(self.recruiter)
+        response = client.get(f'/api/analytics/jobs/{self.job.pk}/', {'days': 'x'})
+        self.assertEqual(response.status_code, 200)
+
+class HyperLogLogTests(SimpleTestCase):
+    """Estimates stay within three standard errors of the exact distinct count."""
+    def assertWithinBound(self, sketch, exact):
+        error = abs(sketch.count() - exact) / exact
+        self.assertLessEqual(error, 3 * sketch.standard_error, f'{exact} distinct: error {error:.2%}')
+    
+    def test_error_is_bounded_across_cardinalities(self):
+        for exact in (10, 1000, 5000, 50000):
+            sketch = HyperLogLog(12)
+            # Every value is added twice; duplicates must not move the estimate
+            sketch.update(f'u:{i % exact}' for i in range(2 * exact))
+            self.assertWithinBound(sketch, exact)
+    
+    def test_merged_days_count_the_union(self):
+        monday, tuesday = HyperLogLog(12), HyperLogLog(12)
+        monday.update(f'ip:{i}' for i in range(0, 30000))
+        tuesday.update(f'ip:{i}' for i in range(20000, 40000))
+        merged = HyperLogLog(12, monday.to_bytes()).merge(tuesday)
+        self.assertWithinBound(merged, 40000)
@@ -0,0 +1,110 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from django.conf import settings
+from django.db import close_old_connections
+from .models import UserActivity
+
+logger = logging.getLogger(__name__)
+
+class ActivityBuffer:
+    """In-process queue of UserActivity rows flushed with bulk_create.
+    
+    Request threads only append to a deque; a daemon thread writes batches
+    every flush_interval seconds or as soon as batch_size rows are waiting.
+    When the buffer is full, new events are dropped and counted rather than
+    blocking requests.
+    """
+    def __init__(self):
+        self.batch_size = getattr(settings, 'ACTIVITY_BATCH_SIZE', 500)
+        self.flush_interval = getattr(settings, 'ACTIVITY_FLUSH_INTERVAL', 2.0)
+        self.max_buffer = getattr(settings, 'ACTIVITY_MAX_BUFFER', 50000)
+        self.queue = deque()
+        self.dropped = 0
+        self.wakeup = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.pid = None
+    
+    def track(self, user_id, activity_type, metadata=None, ip_address=None, user_agent=''):
+        if len(self.queue) >= self.max_buffer:
+            self.dropped += 1
+            return
+        self.queue.append(UserActivity(
+            user_id=user_id,
+            activity_type=activity_type,
+            metadata=metadata or {},
+            ip_address=ip_address,
+            user_agent=user_agent[:512],
+        ))
+        self._ensure_flusher()
+        if len(self.queue) >= self.batch_size:
+            self.wakeup.set()
+    
+    def flush(self):
+        """Write everything currently queued; returns the number of rows written."""
+        written = 0
+        while self.queue:
+            batch = []
+            while self.queue and len(batch) < self.batch_size:
+                batch.append(self.queue.popleft())
+            try:
+                UserActivity.objects.bulk_create(batch, batch_size=self.batch_size)
+                written += len(batch)
+            except Exception as e:
+                logger.error(f"Activity flush failed, dropped {len(batch)} events: {e}")
+        if self.dropped:
+            logger.warning(f"Activity buffer full, dropped {self.dropped} events")
+            self.dropped = 0
+        return written
+    
+    def _ensure_flusher(self):
+        # Threads do not survive fork, so each gunicorn worker starts its own
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.pid = os.getpid()
+            self.thread = threading.Thread(target=self._run, name='activity-flusher', daemon=True)
+            self.thread.start()
+            atexit.register(self.flush)
+    
+    def _run(self):
+        while True:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+class ActivityRetention:
+    """Deletes (optionally archiving) old UserActivity rows in short chunks."""
+    def __init__(self, chunk_size=5000, pause=0.05):
+        self.chunk_size = chunk_size
+        self.pause = pause
+    
+    def purge(self, cutoff, archive=None):
+        """Remove rows created before cutoff; archive(rows) is called per chunk first."""
+        total = 0
+        while True:
+            ids = list(
+                UserActivity.all_objects.filter(created_at__lt=cutoff)
+                .order_by('created_at')
+                .values_list('id', flat=True)[:self.chunk_size]
+            )
+            if not ids:
+                return total
+            if archive is not None:
+                archive(UserActivity.all_objects.filter(id__in=ids).values())
+            deleted, _ = UserActivity.all_objects.filter(id__in=ids).delete()
+            total += deleted
+            # Short transactions with a pause let writers interleave
+            time.sleep(self.pause)
+
+# Global instance
+activity_buffer = ActivityBuffer()
@@ -1,5 +1,7 @@
 from django.urls import path
+from . import views
 
 urlpatterns = [
-    # Analytics endpoints will be implemented later
-]
\ No newline at end of file
+    path('jobs/<uuid:pk>/', views.job_dashboard, name='analytics-job'),
+    path('companies/<uuid:pk>/', views.company_dashboard, name='analytics-company'),
+]
@@ -0,0 +1,55 @@
+from datetime import timedelta
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from core.params import int_param
+from .rollups import rollup_service
+from .sketches import unique_viewer_sketches
+from companies.models import Company, CompanyMember
+from jobs.models import Job
+
+def _window(request):
+    days = int_param(request, 'days', 30, maximum=365)
+    granularity = 'hour' if request.GET.get('granularity') == 'hour' else 'day'
+    end = timezone.now()
+    return end - timedelta(days=days), end, granularity
+
+def _series(dimension_type, dimension_id, start, end, granularity, metrics):
+    return {
+        metric: [
+            {'bucket': bucket, 'value': value}
+            for bucket, value in rollup_service.series(metric, dimension_type, dimension_id, start, end, granularity)
+        ]
+        for metric in metrics
+    }
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def job_dashboard(request, pk):
+    """Views, unique viewers, applications and conversion for a job, served from rollups."""
+    job = get_object_or_404(Job, pk=pk)
+    if job.posted_by_id != request.user.pk and request.user.role != 'admin':
+        return Response({'error': 'Not allowed'}, status=status.HTTP_403_FORBIDDEN)
+    start, end, granularity = _window(request)
+    totals = rollup_service.totals('job', job.pk, start, end)
+    # Per-bucket distinct counts cannot be summed; merge daily sketches instead
+    totals['unique_viewers'] = unique_viewer_sketches.unique_viewers(job.pk, start.date(), end.date())
+    return Response({
+        'totals': totals,
+        'series': _series('job', job.pk, start, end, granularity, ['job_views', 'unique_viewers', 'applications']),
+    })
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def company_dashboard(request, pk):
+    company = get_object_or_404(Company, pk=pk)
+    is_member = CompanyMember.objects.filter(company=company, user=request.user, is_admin=True).exists()
+    if not is_member and request.user.role != 'admin':
+        return Response({'error': 'Not allowed'}, status=status.HTTP_403_FORBIDDEN)
+    start, end, granularity = _window(request)
+    return Response({
+        'totals': rollup_service.totals('company', company.pk, start, end),
+        'series': _series('company', company.pk, start, end, granularity, ['job_views', 'applications']),
+    })
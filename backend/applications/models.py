@@ -1,5 +1,5 @@
 from django.db import models
-from core.models import BaseModel
+from core.models import BaseModel, DELETED_ROWS, LIVE_ROWS
 from authentication.models import User
 from jobs.models import Job
 
@@ -21,8 +21,15 @@ class Application(BaseModel):
     ], default='pending')
     notes = models.TextField(blank=True)
     
+    soft_delete_cascade = ['recruiter_notes']
+    
     class Meta:
         unique_together = ['job', 'applicant']
+        indexes = [
+            models.Index(fields=['job', 'status', 'created_at'], condition=LIVE_ROWS, name='app_job_status_live_idx'),
+            models.Index(fields=['applicant', 'created_at'], condition=LIVE_ROWS, name='app_applicant_live_idx'),
+            models.Index(fields=['deleted_at'], condition=DELETED_ROWS, name='app_purge_idx'),
+        ]
     
     def __str__(self):
         return f"{self.applicant.email} - {self.job.title}"
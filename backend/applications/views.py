@@ -1,17 +1,27 @@
+from django.db.models import Prefetch
 from rest_framework import generics, permissions
+from jobs.models import Job
+from jobs.serializers import JobSerializer
 from .models import Application
 from .serializers import ApplicationSerializer, ApplicationCreateSerializer
+from core.conditional import ConditionalGetMixin
+from core.db import retry_on_locked
 from core.permissions import IsOwnerOrReadOnly
 
-class ApplicationListCreateView(generics.ListCreateAPIView):
+class ApplicationListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    etag_dependencies = ['jobs.Job', 'companies.Company', 'authentication.User', 'jobs.JobView']
     
     def get_queryset(self):
         user = self.request.user
         if user.role == 'recruiter':
-            return Application.objects.filter(job__posted_by=user)
-        return Application.objects.filter(applicant=user)
+            queryset = Application.objects.filter(job__posted_by=user)
+        else:
+            queryset = Application.objects.filter(applicant=user)
+        # Each job once, with its counts annotated, instead of per-row queries in JobSerializer
+        jobs = JobSerializer.with_counts(Job.all_objects.select_related('company', 'posted_by'))
+        return queryset.prefetch_related(Prefetch('job', queryset=jobs))
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -19,7 +29,7 @@ class ApplicationListCreateView(generics.ListCreateAPIView):
         return ApplicationSerializer
     
     def perform_create(self, serializer):
-        serializer.save(applicant=self.request.user)
+        retry_on_locked(serializer.save)(applicant=self.request.user)
 
 class ApplicationDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Application.objects.all()
@@ -0,0 +1,73 @@
+import copy
+import threading
+import time
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .models import User
+
+class UserCache:
+    """Per-process TTL cache of User rows for token authentication.
+    
+    Entries are dropped on User save/delete in this process (see signals);
+    other workers pick up changes within AUTH_USER_CACHE_TTL seconds.
+    """
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def ttl(self):
+        return getattr(settings, 'AUTH_USER_CACHE_TTL', 30)
+    
+    def get(self, user_id):
+        """Cached user or a single-row fetch; returns a copy callers may mutate, or None."""
+        now = time.monotonic()
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < now:
+            user = User.objects.filter(pk=user_id).first()
+            if user is None:
+                self.invalidate(user_id)
+                return None
+            entry = (now + self.ttl, user)
+            with self._lock:
+                if len(self._entries) >= getattr(settings, 'AUTH_USER_CACHE_SIZE', 10000):
+                    self._evict(now)
+                self._entries[user_id] = entry
+        return copy.copy(entry[1])
+    
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def _evict(self, now):
+        expired = [key for key, (expires, _) in self._entries.items() if expires < now]
+        for key in expired or list(self._entries)[:len(self._entries) // 2]:
+            del self._entries[key]
+
+user_cache = UserCache()
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """simplejwt bearer auth that resolves the user through user_cache instead of a query per request."""
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+        
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+        user = user_cache.get(user_id)
+        if user is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return user
@@ -0,0 +1,72 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from .backends import user_cache
+from .models import User
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        self.user = User.objects.create_user(email='ada@example.com', username='ada', password='correct-horse')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+    
+    def profile(self):
+        return self.client.get('/api/auth/profile/')
+    
+    def test_cached_request_makes_no_user_query(self):
+        self.assertEqual(self.profile().status_code, 200)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.profile()
+        self.assertEqual(response.data['email'], 'ada@example.com')
+        self.assertEqual([q['sql'] for q in queries if 'authentication_user' in q['sql']], [])
+    
+    def test_saving_a_user_invalidates_the_cache(self):
+        self.assertEqual(self.profile().data['role'], 'candidate')
+        self.user.role = 'recruiter'
+        self.user.save()
+        self.assertEqual(self.profile().data['role'], 'recruiter')
+    
+    def test_inactive_user_is_rejected(self):
+        self.assertEqual(self.profile().status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.profile().status_code, 401)
+    
+    def test_deleted_user_is_rejected(self):
+        self.assertEqual(self.profile().status_code, 200)
+        self.user.delete()
+        self.assertEqual(self.profile().status_code, 401)
+
+class TokenResponseTests(TestCase):
+    """The frontend reads tokens.access and tokens.refresh from register and login."""
+    def assert_tokens(self, response, email):
+        self.assertEqual(set(response.data), {'user', 'tokens'})
+        self.assertEqual(set(response.data['tokens']), {'access', 'refresh'})
+        self.assertEqual(response.data['user']['email'], email)
+        access = AccessToken(response.data['tokens']['access'])
+        self.assertEqual(access['user_id'], response.data['user']['id'])
+        RefreshToken(response.data['tokens']['refresh'])
+        
+        profile = APIClient()
+        profile.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['tokens']['access']}")
+        self.assertEqual(profile.get('/api/auth/profile/').status_code, 200)
+    
+    def test_register_and_login_return_tokens(self):
+        client = APIClient()
+        response = client.post('/api/auth/register/', {
+            'email': 'grace@example.com', 'username': 'grace', 'first_name': 'Grace', 'last_name': 'Hopper',
+            'role': 'candidate', 'password': 'correct-horse', 'password_confirm': 'correct-horse',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assert_tokens(response, 'grace@example.com')
+        
+        response = client.post('/api/auth/login/', {'email': 'grace@example.com', 'password': 'correct-horse'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assert_tokens(response, 'grace@example.com')
+        
+        response = client.post('/api/auth/login/', {'email': 'grace@example.com', 'password': 'wrong'}, format='json')
+        self.assertEqual(response.status_code, 400)
@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from .serializers import UserRegistrationSerializer, UserLoginSerializer, UserSerializer
 from .models import User
+from core.db import retry_on_locked
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
@@ -11,7 +12,7 @@ def register(request):
     """User registration endpoint."""
     serializer = UserRegistrationSerializer(data=request.data)
     if serializer.is_valid():
-        user = serializer.save()
+        user = retry_on_locked(serializer.save)()
         refresh = RefreshToken.for_user(user)
         return Response({
             'user': UserSerializer(user).data,
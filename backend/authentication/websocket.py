@@ -0,0 +1,44 @@
+from urllib.parse import parse_qs
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from .backends import CachedJWTAuthentication
+
+# Sec-WebSocket-Protocol: bearer, <access token>
+SUBPROTOCOL = 'bearer'
+
+def token_from_scope(scope):
+    """Access token from the 'bearer' subprotocol pair or a ?token= query parameter."""
+    subprotocols = scope.get('subprotocols') or []
+    if SUBPROTOCOL in subprotocols:
+        index = subprotocols.index(SUBPROTOCOL)
+        if index + 1 < len(subprotocols):
+            return subprotocols[index + 1]
+    tokens = parse_qs(scope.get('query_string', b'').decode()).get('token')
+    return tokens[0] if tokens else None
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """Sets scope['user'] from a simplejwt access token.
+    
+    Browsers cannot send an Authorization header on a WebSocket, so the SPA
+    passes its access token as a subprotocol or query parameter instead. Sockets
+    without a valid token keep the session user from AuthMiddlewareStack.
+    """
+    def __init__(self, inner):
+        super().__init__(inner)
+        self.authentication = CachedJWTAuthentication()
+    
+    async def __call__(self, scope, receive, send):
+        raw = token_from_scope(scope)
+        if raw:
+            user = await self.authenticate(raw)
+            if user is not None:
+                scope = dict(scope, user=user)
+        return await super().__call__(scope, receive, send)
+    
+    @database_sync_to_async
+    def authenticate(self, raw):
+        try:
+            return self.authentication.get_user(self.authentication.get_validated_token(raw))
+        except (InvalidToken, AuthenticationFailed):
+            return None
@@ -1,3 +1,4 @@
+from datetime import timedelta
 from pathlib import Path
 import os
 import dj_database_url
@@ -17,18 +18,39 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'corsheaders',
+    'channels',
+    'django_filters',
+    'core',
+    'authentication',
+    'profiles',
+    'companies',
+    'jobs',
+    'applications',
+    'skills',
+    'social',
+    'messaging',
+    'notifications',
+    'analytics',
+    'ai_services',
 ]
 
+AUTH_USER_MODEL = 'authentication.User'
+
 MIDDLEWARE = [
+    'core.middleware.InstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ProfilingMiddleware',
+    'core.routers.ReplicaPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'analytics.middleware.ActivityTrackingMiddleware',
 ]
 
 ROOT_URLCONF = 'careeropen.urls'
@@ -50,15 +72,62 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'careeropen.wsgi.application'
+ASGI_APPLICATION = 'careeropen.asgi.application'
+
+# Realtime channel layer: in-process by default, Redis when REDIS_URL is set. The
+# in-process layer only reaches sockets on the same worker, so it needs a single
+# worker (WEB_CONCURRENCY=1); run more workers only with REDIS_URL.
+if os.environ.get('REDIS_URL'):
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [os.environ['REDIS_URL']]},
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}
+    }
 
 # Database configuration - Use SQLite for production (simple deployment)
+# core.backends.sqlite enables WAL and BEGIN IMMEDIATE (see DEFAULT_PRAGMAS)
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'core.backends.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'timeout': 20,
+        },
+        # A file rather than shared-cache memory, so threaded tests hit WAL and busy_timeout
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
+def _database_from_url(url):
+    config = dj_database_url.parse(
+        url,
+        conn_max_age=int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+        conn_health_checks=True,
+    )
+    if config['ENGINE'] == 'django.db.backends.sqlite3':
+        config['ENGINE'] = 'core.backends.sqlite'
+        config['OPTIONS'] = {'timeout': 20}
+    # Transaction-mode poolers (pgbouncer) cannot hold server-side cursors
+    if os.environ.get('DB_POOLER') == 'pgbouncer':
+        config['DISABLE_SERVER_SIDE_CURSORS'] = True
+    return config
+
+# Set DATABASE_URL to move off SQLite (e.g. postgres://...); DATABASE_REPLICA_URLS
+# is a comma-separated list of read replicas (sqlite:///replica.sqlite3 works locally)
+if os.environ.get('DATABASE_URL'):
+    DATABASES['default'] = _database_from_url(os.environ['DATABASE_URL'])
+for i, url in enumerate(filter(None, os.environ.get('DATABASE_REPLICA_URLS', '').split(','))):
+    DATABASES[f'replica_{i}'] = _database_from_url(url.strip())
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+REPLICA_READ_APPS = ['jobs', 'companies', 'analytics']
+REPLICA_PIN_SECONDS = 5
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -78,11 +147,35 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'authentication.backends.CachedJWTAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+    ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# Bearer tokens are verified from the signature alone; the user row comes from
+# authentication.backends.user_cache (per process, dropped on User save/delete)
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=15),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
+    'SIGNING_KEY': SECRET_KEY,
+    'AUTH_HEADER_TYPES': ('Bearer',),
+}
+AUTH_USER_CACHE_TTL = 30
+AUTH_USER_CACHE_SIZE = 10000
+
 # CORS configuration
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
@@ -107,4 +200,134 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
-]
\ No newline at end of file
+]
+
+# Home feed (social.feed)
+FEED_TIMELINE_SIZE = 800
+FEED_CELEBRITY_THRESHOLD = 5000
+FEED_FANOUT_BATCH_SIZE = 1000
+FEED_CELEBRITY_CACHE_TTL = 600
+
+# Comment threads (social.comments)
+COMMENT_PAGE_SIZE = 20
+COMMENT_MAX_DEPTH = 4
+
+# Connection graph (social.graph)
+CONNECTION_GRAPH_CACHE_TIMEOUT = 60 * 60 * 24
+CONNECTION_GRAPH_MAX_FRONTIER = 5000
+
+# Company page aggregate (companies.page)
+COMPANY_PAGE_CACHE_TIMEOUT = 300
+
+# Notification pipeline (notifications.pipeline)
+NOTIFICATION_BATCH_SIZE = 500
+NOTIFICATION_COALESCE_WINDOW = 60 * 60
+# Distinct actor ids kept per coalesced notification; later actors are still counted
+NOTIFICATION_MAX_ACTOR_IDS = 1000
+NOTIFICATION_DELIVERY_WORKERS = 4
+NOTIFICATION_DELIVERY_QUEUE = 1000
+
+# Saved-search job alerts (jobs.alerts)
+JOB_ALERT_SEMANTIC_THRESHOLD = 0.45
+
+# Activity ingestion (analytics.tracking)
+ACTIVITY_BATCH_SIZE = 500
+ACTIVITY_FLUSH_INTERVAL = 2.0
+ACTIVITY_MAX_BUFFER = 50000
+
+# Analytics rollups (analytics.rollups)
+ROLLUP_LAG_SECONDS = 120
+ROLLUP_INITIAL_LOOKBACK_DAYS = 30
+HLL_PRECISION = 12
+
+# Soft-delete archival (core.archive)
+ARCHIVE_MODELS = [
+    'social.Post',
+    'social.Comment',
+    'social.PostLike',
+    'messaging.Message',
+    'notifications.Notification',
+    'jobs.Job',
+    'applications.Application',
+]
+ARCHIVE_AFTER_DAYS = 90
+ARCHIVE_CHUNK_SIZE = 500
+
+# API response compression (core.middleware) and conditional GET (core.conditional)
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 4
+# Models whose changes invalidate ETags of views that embed them (etag_dependencies)
+# JobView feeds views_count; a viewer's repeat GETs reuse their row, so it only bumps on a new viewer
+CONDITIONAL_GET_TRACKED_MODELS = [
+    'jobs.Job',
+    'jobs.JobView',
+    'applications.Application',
+    'companies.Company',
+    'authentication.User',
+]
+
+# Rate limiting (core.ratelimit): Redis when REDIS_URL is set, else a shared SQLite file
+RATE_LIMIT_SQLITE_PATH = BASE_DIR / 'ratelimit.sqlite3'
+# scope -> (bucket capacity, refill tokens/second); views pass a cost per call
+RATE_LIMIT_BUCKETS = {
+    'default': (60, 1.0),
+    'ai': (60, 1.0),
+    'resume': (2, 2 / 3600),
+}
+# Max in-flight requests across all workers for model-backed endpoints
+RATE_LIMIT_CONCURRENCY = {
+    'ai': 4,
+}
+# Upper bound on one LLM request (ai_services.openai_client)
+OPENAI_REQUEST_TIMEOUT = 60
+# A slot's lease outlives one LLM request; the client extends it before every call
+RATE_LIMIT_LEASE_SECONDS = OPENAI_REQUEST_TIMEOUT + 30
+
+# Request instrumentation (core.instrumentation): Server-Timing for admins,
+# /api/internal/metrics/, and a JSON line on the core.middleware logger for each
+# request slower than INSTRUMENTATION_LOG_MIN_MS (INFO); faster ones log at DEBUG
+INSTRUMENTATION_ENABLED = True
+INSTRUMENTATION_LOG_MIN_MS = int(os.environ.get('INSTRUMENTATION_LOG_MIN_MS', '500'))
+
+# Sampling profiler (core.profiling): admins send X-Profile: 1; PROFILER_SAMPLE_RATE
+# profiles a random fraction of all requests. Read results with profile_report
+PROFILER_SAMPLE_RATE = float(os.environ.get('PROFILER_SAMPLE_RATE', '0'))
+PROFILER_INTERVAL = 0.005
+PROFILER_HEADER = 'X-Profile'
+PROFILER_DIR = BASE_DIR / 'logs' / 'profiles'
+# Retention: newest per-request files kept per endpoint, distinct stacks kept per
+# endpoint aggregate, and how often the sampler thread rewrites the aggregates
+PROFILER_MAX_FILES = 500
+PROFILER_MAX_STACKS = 10000
+PROFILER_FLUSH_SECONDS = 10
+
+# Slow-query recorder (core.slowqueries), run on requests by InstrumentationMiddleware:
+# set SLOW_QUERY_THRESHOLD_MS=None to disable
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_EXPLAIN = True
+SLOW_QUERY_LOG = BASE_DIR / 'logs' / 'slow_queries.jsonl'
+
+# Default cache: per process unless REDIS_URL is set. The connection graph, company
+# pages and feed celebrity set are invalidated on write, so with several workers
+# use Redis so every worker sees the invalidation.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {'BACKEND': 'core.instrumentation.InstrumentedRedisCache', 'LOCATION': os.environ['REDIS_URL']},
+    }
+else:
+    CACHES = {
+        'default': {'BACKEND': 'core.instrumentation.InstrumentedLocMemCache'},
+    }
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.middleware': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+        'core.slowqueries': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
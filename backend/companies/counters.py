@@ -0,0 +1,40 @@
+import logging
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from .models import Company
+
+logger = logging.getLogger(__name__)
+
+def is_open_job(job):
+    return job.is_published and not job.is_deleted
+
+def adjust_open_jobs(company_id, delta):
+    if company_id and delta:
+        Company.all_objects.filter(pk=company_id).update(open_jobs_count=F('open_jobs_count') + delta)
+
+def recount_open_jobs(company_id):
+    from jobs.models import Job
+    
+    count = Job.objects.filter(company_id=company_id, is_published=True).count()
+    Company.all_objects.filter(pk=company_id).update(open_jobs_count=count)
+
+def reconcile_open_jobs():
+    """Recount open jobs for every company whose counter drifted."""
+    from jobs.models import Job
+    
+    open_jobs = (
+        Job.objects.filter(company=OuterRef('pk'), is_published=True)
+        .values('company').annotate(n=Count('id')).values('n')
+    )
+    drifted = (
+        Company.all_objects.annotate(actual=Coalesce(Subquery(open_jobs), 0))
+        .filter(~Q(open_jobs_count=F('actual')))
+        .values_list('pk', 'actual')
+    )
+    fixed = 0
+    for pk, actual in drifted.iterator():
+        Company.all_objects.filter(pk=pk).update(open_jobs_count=actual)
+        fixed += 1
+    if fixed:
+        logger.warning(f"Reconciled open_jobs_count on {fixed} companies")
+    return fixed
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from companies.counters import reconcile_open_jobs
+
+class Command(BaseCommand):
+    help = 'Recount Company.open_jobs_count from published jobs.'
+    
+    def handle(self, *args, **options):
+        fixed = reconcile_open_jobs()
+        self.stdout.write(self.style.SUCCESS(f'Reconciled {fixed} companies'))
@@ -19,6 +19,10 @@ class Company(BaseModel):
     ])
     location = models.CharField(max_length=200)
     founded_year = models.IntegerField(null=True, blank=True)
+    # Published, non-deleted jobs; maintained by companies.signals
+    open_jobs_count = models.IntegerField(default=0)
+    
+    soft_delete_cascade = ['jobs', 'members']
     
     class Meta:
         verbose_name_plural = 'companies'
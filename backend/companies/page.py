@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Prefetch, Q
+from .models import Company, CompanyMember
+from .serializers import CompanySerializer, CompanyPageMemberSerializer, CompanyJobSummarySerializer
+
+class CompanyPageService:
+    """Builds the company page (profile, members, recent jobs, counts) in one round trip.
+    
+    The page is assembled from a single annotated company query with sliced
+    prefetches and cached until a job, membership or the company changes.
+    """
+    KEY_PREFIX = 'company:page:'
+    
+    def __init__(self):
+        self.timeout = getattr(settings, 'COMPANY_PAGE_CACHE_TIMEOUT', 300)
+        self.members_limit = getattr(settings, 'COMPANY_PAGE_MEMBERS', 12)
+        self.jobs_limit = getattr(settings, 'COMPANY_PAGE_RECENT_JOBS', 5)
+    
+    def get_page(self, company_id):
+        key = self._key(company_id)
+        page = cache.get(key)
+        if page is None:
+            page = self.build_page(company_id)
+            cache.set(key, page, self.timeout)
+        return page
+    
+    def build_page(self, company_id):
+        from jobs.models import Job
+        
+        company = (
+            Company.objects
+            .annotate(members_count=Count('members', filter=Q(members__is_deleted=False), distinct=True))
+            .prefetch_related(
+                Prefetch(
+                    'members',
+                    queryset=CompanyMember.objects.select_related('user').order_by('-is_admin', 'created_at')[:self.members_limit],
+                    to_attr='page_members',
+                ),
+                Prefetch(
+                    'jobs',
+                    queryset=Job.objects.filter(is_published=True).order_by('-created_at')[:self.jobs_limit],
+                    to_attr='recent_jobs',
+                ),
+            )
+            .get(pk=company_id)
+        )
+        return {
+            'company': CompanySerializer(company).data,
+            'members': CompanyPageMemberSerializer(company.page_members, many=True).data,
+            'recent_jobs': CompanyJobSummarySerializer(company.recent_jobs, many=True).data,
+            'counts': {
+                'open_jobs': company.open_jobs_count,
+                'members': company.members_count,
+            },
+        }
+    
+    def invalidate(self, company_id):
+        cache.delete(self._key(company_id))
+    
+    def _key(self, company_id):
+        return f'{self.KEY_PREFIX}{company_id}'
+
+# Global instance
+company_page_service = CompanyPageService()
@@ -1,15 +1,13 @@
 from rest_framework import serializers
 from .models import Company, CompanyMember
+from jobs.models import Job
 
 class CompanySerializer(serializers.ModelSerializer):
-    jobs_count = serializers.SerializerMethodField()
+    jobs_count = serializers.IntegerField(source='open_jobs_count', read_only=True)
     
     class Meta:
         model = Company
-        fields = '__all__'
-    
-    def get_jobs_count(self, obj):
-        return obj.jobs.filter(is_published=True).count()
+        exclude = ['open_jobs_count']
 
 class CompanyMemberSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
@@ -17,4 +15,16 @@ class CompanyMemberSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = CompanyMember
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+class CompanyPageMemberSerializer(serializers.ModelSerializer):
+    user = serializers.StringRelatedField(read_only=True)
+    
+    class Meta:
+        model = CompanyMember
+        fields = ['id', 'user', 'role', 'is_admin']
+
+class CompanyJobSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = ['id', 'title', 'location', 'job_type', 'experience_level', 'salary_min', 'salary_max', 'created_at']
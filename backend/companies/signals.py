@@ -0,0 +1,52 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core.signals import bulk_restored, bulk_soft_deleted
+from jobs.models import Job
+from .counters import adjust_open_jobs, is_open_job, recount_open_jobs
+from .models import Company, CompanyMember
+from .page import company_page_service
+
+@receiver(post_save, sender=Job)
+def update_open_jobs_on_save(sender, instance, created, **kwargs):
+    """Move the job's contribution between companies/states as a pair of F() deltas."""
+    now_open = is_open_job(instance)
+    state = getattr(instance, '_saved_state', None)
+    if created:
+        old_company_id, was_open = None, False
+    elif state is None:
+        # Loaded with deferred fields (or never loaded): the old state is unknown
+        recount_open_jobs(instance.company_id)
+        old_company_id, was_open = instance.company_id, now_open
+    else:
+        old_company_id, was_open = state[0], state[1] and not state[2]
+    if (old_company_id, was_open) != (instance.company_id, now_open):
+        if was_open:
+            adjust_open_jobs(old_company_id, -1)
+        if now_open:
+            adjust_open_jobs(instance.company_id, 1)
+    for company_id in {old_company_id, instance.company_id} - {None}:
+        transaction.on_commit(lambda company_id=company_id: company_page_service.invalidate(company_id))
+
+@receiver(post_delete, sender=Job)
+def update_open_jobs_on_delete(sender, instance, **kwargs):
+    if is_open_job(instance):
+        adjust_open_jobs(instance.company_id, -1)
+    transaction.on_commit(lambda: company_page_service.invalidate(instance.company_id))
+
+@receiver([post_save, post_delete], sender=CompanyMember)
+def invalidate_page_on_member_change(sender, instance, **kwargs):
+    transaction.on_commit(lambda: company_page_service.invalidate(instance.company_id))
+
+@receiver(post_save, sender=Company)
+def invalidate_page_on_company_change(sender, instance, **kwargs):
+    transaction.on_commit(lambda: company_page_service.invalidate(instance.pk))
+
+@receiver([bulk_soft_deleted, bulk_restored])
+def recount_after_bulk_soft_delete(sender, affected, **kwargs):
+    company_ids = set(affected.get(Company, []))
+    if Job in affected:
+        company_ids.update(Job.all_objects.filter(pk__in=affected[Job]).values_list('company_id', flat=True).distinct())
+    for company_id in company_ids:
+        recount_open_jobs(company_id)
+        company_page_service.invalidate(company_id)
@@ -0,0 +1,47 @@
+from django.test import TestCase
+from authentication.models import User
+from jobs.models import Job
+from .models import Company
+from .serializers import CompanySerializer
+
+class OpenJobsCountTests(TestCase):
+    def setUp(self):
+        self.recruiter = User.objects.create(username='recruiter', email='recruiter@example.com', role='recruiter')
+        self.company = Company.objects.create(name='Acme', description='', industry='Software', size='1-10', location='Remote')
+    
+    def make_job(self, **extra):
+        return Job.objects.create(
+            title='Engineer', description='', requirements='', company=self.company, posted_by=self.recruiter,
+            location='Remote', job_type='full_time', experience_level='mid', **extra,
+        )
+    
+    def open_jobs(self):
+        self.company.refresh_from_db(fields=['open_jobs_count'])
+        return self.company.open_jobs_count
+    
+    def test_publish_toggles_move_the_counter(self):
+        job = self.make_job()
+        self.assertEqual(self.open_jobs(), 1)
+        job.is_published = False
+        job.save()
+        self.assertEqual(self.open_jobs(), 0)
+        
+        job = Job.objects.get(pk=job.pk)
+        job.is_published = True
+        job.save()
+        job.save()
+        self.assertEqual(self.open_jobs(), 1)
+    
+    def test_deferred_load_recounts(self):
+        job = self.make_job()
+        job = Job.objects.only('id', 'title').get(pk=job.pk)
+        job.title = 'Senior Engineer'
+        job.save()
+        self.assertEqual(self.open_jobs(), 1)
+    
+    def test_serializer_exposes_a_single_count(self):
+        self.make_job()
+        self.company.refresh_from_db()
+        data = CompanySerializer(self.company).data
+        self.assertEqual(data['jobs_count'], 1)
+        self.assertNotIn('open_jobs_count', data)
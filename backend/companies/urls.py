@@ -4,4 +4,5 @@ from . import views
 urlpatterns = [
     path('', views.CompanyListCreateView.as_view(), name='company-list-create'),
     path('<uuid:pk>/', views.CompanyDetailView.as_view(), name='company-detail'),
-]
\ No newline at end of file
+    path('<uuid:pk>/page/', views.company_page, name='company-page'),
+]
@@ -1,14 +1,29 @@
 from rest_framework import generics
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from django.http import Http404
 from .models import Company
+from .page import company_page_service
 from .serializers import CompanySerializer
+from core.conditional import ConditionalGetMixin
 from core.permissions import IsRecruiterOrReadOnly
 
-class CompanyListCreateView(generics.ListCreateAPIView):
+class CompanyListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = Company.objects.filter(is_active=True)
     serializer_class = CompanySerializer
     permission_classes = [IsRecruiterOrReadOnly]
+    etag_dependencies = ['jobs.Job']
 
-class CompanyDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CompanyDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
-    permission_classes = [IsRecruiterOrReadOnly]
\ No newline at end of file
+    permission_classes = [IsRecruiterOrReadOnly]
+    etag_dependencies = ['jobs.Job']
+
+@api_view(['GET'])
+def company_page(request, pk):
+    """Company profile with members, recent jobs and counts."""
+    try:
+        return Response(company_page_service.get_page(pk))
+    except Company.DoesNotExist:
+        raise Http404
@@ -2,4 +2,12 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'core'
\ No newline at end of file
+    name = 'core'
+    
+    def ready(self):
+        from django.conf import settings
+        from .conditional import model_versions
+        from .instrumentation import instrument_serializers
+        model_versions.connect()
+        if getattr(settings, 'INSTRUMENTATION_ENABLED', True):
+            instrument_serializers()
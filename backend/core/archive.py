@@ -0,0 +1,144 @@
+import json
+import logging
+import time
+import uuid
+from datetime import timedelta
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import router, transaction
+from django.db.models.deletion import CASCADE, Collector
+from django.utils import timezone
+from .models import ArchivedRecord
+
+logger = logging.getLogger(__name__)
+
+class ArchiveService:
+    """Moves long-soft-deleted BaseModel rows into ArchivedRecord in small batches.
+    
+    Each chunk runs in its own short transaction: the rows and everything that
+    would cascade with them are copied to the archive table as JSON, then
+    deleted from the live tables. Rows with live (not soft-deleted) dependents
+    are left in place; restore() brings a row back with the dependents that
+    were archived alongside it.
+    """
+    def __init__(self):
+        self.model_labels = getattr(settings, 'ARCHIVE_MODELS', [])
+        self.retention = timedelta(days=getattr(settings, 'ARCHIVE_AFTER_DAYS', 90))
+        self.chunk_size = getattr(settings, 'ARCHIVE_CHUNK_SIZE', 500)
+        self.pause = getattr(settings, 'ARCHIVE_CHUNK_PAUSE', 0.05)
+    
+    def archive_all(self):
+        return {label: self.archive_model(apps.get_model(label)) for label in self.model_labels}
+    
+    def archive_model(self, model, cutoff=None):
+        cutoff = cutoff or timezone.now() - self.retention
+        total, skipped = 0, []
+        while True:
+            ids = list(
+                model.all_objects.filter(is_deleted=True, deleted_at__lt=cutoff)
+                .exclude(pk__in=skipped)
+                .order_by('deleted_at')
+                .values_list('pk', flat=True)[:self.chunk_size]
+            )
+            if not ids:
+                break
+            archived = self._archive_chunk(model, ids)
+            skipped += [pk for pk in ids if pk not in archived]
+            total += len(archived)
+            time.sleep(self.pause)
+        if total:
+            logger.info(f"Archived {total} rows from {model._meta.label}")
+        if skipped:
+            logger.warning(f"Kept {len(skipped)} {model._meta.label} rows that still have live dependents")
+        return total
+    
+    def restore(self, model_label, object_id):
+        """Put an archived row back into its live table (soft-deleted), with the rows archived alongside it."""
+        record = ArchivedRecord.objects.filter(model_label=model_label, object_id=str(object_id)).latest('archived_at')
+        with transaction.atomic():
+            obj = self._restore_record(record)
+            if record.batch is None:
+                return obj
+            pending = [obj]
+            while pending:
+                parent = pending.pop()
+                for rel in self._cascading_relations(type(parent)):
+                    children = ArchivedRecord.objects.filter(
+                        batch=record.batch,
+                        model_label=rel.related_model._meta.label,
+                        **{f'data__{rel.field.attname}': self._json(parent.pk)},
+                    )
+                    pending += [self._restore_record(child) for child in children]
+        return obj
+    
+    def _archive_chunk(self, model, ids):
+        """Archive the rows in ids that have no live dependents; returns the archived pks."""
+        using = router.db_for_write(model)
+        with transaction.atomic(using=using):
+            objs = list(model.all_objects.using(using).filter(pk__in=ids))
+            collector = self._collect(using, objs)
+            if self._has_live_rows(collector):
+                # Rare: fall back to one row at a time so only the blocked rows stay behind
+                objs = [obj for obj in objs if not self._has_live_rows(self._collect(using, [obj]))]
+                collector = self._collect(using, objs)
+            
+            batch = uuid.uuid4()
+            records = []
+            for related_model, instances in collector.data.items():
+                records += [self._record(related_model, obj, batch) for obj in instances]
+            for qs in collector.fast_deletes:
+                records += [self._record(qs.model, obj, batch) for obj in qs.iterator()]
+            ArchivedRecord.objects.using(using).bulk_create(records, batch_size=500)
+            # Collector.delete() clears the instances' pks
+            archived = {obj.pk for obj in objs}
+            if objs:
+                collector.delete()
+        return archived
+    
+    def _collect(self, using, objs):
+        collector = Collector(using=using)
+        collector.collect(objs)
+        return collector
+    
+    def _has_live_rows(self, collector):
+        """True if the collector would delete a soft-delete row that is not deleted."""
+        for related_model, instances in collector.data.items():
+            if any(getattr(obj, 'is_deleted', True) is False for obj in instances):
+                return True
+        return any(
+            qs.filter(is_deleted=False).exists()
+            for qs in collector.fast_deletes
+            if any(f.name == 'is_deleted' for f in qs.model._meta.concrete_fields)
+        )
+    
+    def _cascading_relations(self, model):
+        return [
+            f for f in model._meta.get_fields(include_hidden=True)
+            if f.auto_created and not f.concrete and (f.one_to_many or f.one_to_one) and f.on_delete is CASCADE
+        ]
+    
+    def _restore_record(self, record):
+        model = apps.get_model(record.model_label)
+        obj = model(**{f.attname: record.data.get(f.attname) for f in model._meta.concrete_fields})
+        # bulk_create sends no post_save, so "created" receivers (feed fan-out, inbox
+        # counters, socket pushes) never see a restored row as new
+        model._base_manager.bulk_create([obj])
+        record.delete()
+        return obj
+    
+    def _record(self, model, obj, batch):
+        data = {f.attname: getattr(obj, f.attname) for f in model._meta.concrete_fields}
+        return ArchivedRecord(
+            model_label=model._meta.label,
+            object_id=str(obj.pk),
+            batch=batch,
+            data=self._json(data),
+            deleted_at=getattr(obj, 'deleted_at', None),
+        )
+    
+    def _json(self, value):
+        return json.loads(json.dumps(value, cls=DjangoJSONEncoder))
+
+# Global instance
+archive_service = ArchiveService()
@@ -0,0 +1,235 @@
+import ipaddress
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+BENCH_EMAIL_DOMAIN = 'bench.example'
+BENCH_PASSWORD = 'bench-password'
+# Generated timestamps fall in the years before this fixed date, so reruns produce identical rows
+BENCH_ANCHOR = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+# Row counts at scale=1.0
+SIZES = {
+    'users': 100000,
+    'companies': 2000,
+    'jobs': 50000,
+    'job_views': 1000000,
+    'applications': 500000,
+    'posts': 200000,
+    'conversations': 50000,
+    'messages': 500000,
+}
+
+SKILLS = ['python', 'django', 'react', 'typescript', 'aws', 'docker', 'kubernetes', 'sql', 'go', 'java',
+          'machine learning', 'data analysis', 'figma', 'product management', 'sales', 'marketing']
+TITLES = ['Backend Engineer', 'Frontend Engineer', 'Data Scientist', 'Product Manager', 'Designer',
+          'DevOps Engineer', 'Account Executive', 'Marketing Manager', 'QA Engineer', 'Engineering Manager']
+LOCATIONS = ['Remote', 'Accra', 'Lagos', 'Nairobi', 'London', 'Berlin', 'New York', 'Toronto', 'Singapore']
+INDUSTRIES = ['Software', 'Fintech', 'Healthcare', 'Education', 'Logistics', 'Retail']
+WORDS = ('build ship scale design own lead improve collaborate mentor deliver analyse operate '
+         'customers platform reliable data product team growth quality').split()
+
+class BenchDataGenerator:
+    """Deterministic load data built on the real models with bulk_create.
+    
+    The same seed and scale always produce the same rows (UUIDs included), so
+    benchmark runs on different machines or branches see identical data.
+    Bench users are marked by their @bench.example email.
+    """
+    def __init__(self, seed=42, scale=1.0, batch_size=5000, stdout=None):
+        self.rng = random.Random(seed)
+        self.scale = scale
+        self.batch_size = batch_size
+        self.stdout = stdout
+        self.anchor = BENCH_ANCHOR
+    
+    def size(self, name):
+        return max(1, int(SIZES[name] * self.scale))
+    
+    def generate(self):
+        from companies.counters import reconcile_open_jobs
+        
+        users = self.users()
+        companies = self.companies(users)
+        jobs = self.jobs(companies, users)
+        self.job_views(jobs, users)
+        self.applications(jobs, users)
+        self.posts(users)
+        self.messages(users)
+        reconcile_open_jobs()
+        return {name: self.size(name) for name in SIZES}
+    
+    def flush(self):
+        """Delete every bench user; related rows go with them via CASCADE."""
+        from authentication.models import User
+        from companies.models import Company
+        
+        Company.all_objects.filter(website__endswith=f'.{BENCH_EMAIL_DOMAIN}').delete()
+        return User.objects.filter(email__endswith=f'@{BENCH_EMAIL_DOMAIN}').delete()
+    
+    def users(self):
+        from authentication.models import User
+        from profiles.models import Profile
+        
+        password = make_password(BENCH_PASSWORD, salt='benchsalt')
+        n = self.size('users')
+        recruiters = n // 20
+        users = [
+            User(
+                username=f'bench{i}', email=f'bench{i}@{BENCH_EMAIL_DOMAIN}', password=password,
+                first_name=f'Bench{i}', last_name='User', is_verified=True,
+                role='recruiter' if i < recruiters else 'candidate', date_joined=self._when(365),
+            )
+            for i in range(n)
+        ]
+        self._create(User, users, 'users')
+        # bulk_create only returns integer pks on backends with RETURNING; refetch to be safe
+        users = list(User.objects.filter(email__endswith=f'@{BENCH_EMAIL_DOMAIN}').order_by('username').only('id', 'role'))
+        profiles = [
+            Profile(
+                id=self._uuid(), user_id=user.pk, bio=self._text(30), location=self.rng.choice(LOCATIONS),
+                skills=self.rng.sample(SKILLS, 5), experience_years=self.rng.randint(0, 20),
+                current_position=self.rng.choice(TITLES), is_open_to_work=self.rng.random() < 0.3,
+                created_at=self._when(365),
+            )
+            for user in users
+        ]
+        self._create(Profile, profiles, 'profiles')
+        return users
+    
+    def companies(self, users):
+        from companies.models import Company
+        
+        companies = [
+            Company(
+                id=self._uuid(), name=f'Bench Company {i}', description=self._text(60),
+                website=f'https://c{i}.{BENCH_EMAIL_DOMAIN}', industry=self.rng.choice(INDUSTRIES),
+                size=self.rng.choice(['1-10', '11-50', '51-200', '201-500', '500+']),
+                location=self.rng.choice(LOCATIONS), founded_year=self.rng.randint(1990, 2023),
+                created_at=self._when(730),
+            )
+            for i in range(self.size('companies'))
+        ]
+        self._create(Company, companies, 'companies')
+        return companies
+    
+    def jobs(self, companies, users):
+        from jobs.models import Job
+        
+        recruiters = [user for user in users if user.role == 'recruiter'] or users
+        jobs = []
+        for i in range(self.size('jobs')):
+            salary = self.rng.randrange(30000, 200000, 5000)
+            jobs.append(Job(
+                id=self._uuid(), title=f'{self.rng.choice(TITLES)} {i}', description=self._text(120),
+                requirements=self._text(40), company=self.rng.choice(companies), posted_by_id=self.rng.choice(recruiters).pk,
+                location=self.rng.choice(LOCATIONS),
+                job_type=self.rng.choice(['full_time', 'part_time', 'contract', 'internship', 'remote']),
+                experience_level=self.rng.choice(['entry', 'mid', 'senior', 'executive']),
+                salary_min=Decimal(salary), salary_max=Decimal(salary + 20000),
+                skills_required=self.rng.sample(SKILLS, 4), is_published=self.rng.random() < 0.9,
+                created_at=self._when(180),
+            ))
+        self._create(Job, jobs, 'jobs')
+        return jobs
+    
+    def job_views(self, jobs, users):
+        from jobs.models import JobView
+        
+        # One distinct ip per view keeps (job, user, ip_address) unique
+        views = (
+            JobView(
+                id=self._uuid(), job_id=self.rng.choice(jobs).pk,
+                user_id=self.rng.choice(users).pk if self.rng.random() < 0.7 else None,
+                ip_address=str(ipaddress.IPv4Address(0x0A000000 + i)), created_at=self._when(90),
+            )
+            for i in range(self.size('job_views'))
+        )
+        self._create(JobView, views, 'job views')
+    
+    def applications(self, jobs, users):
+        from applications.models import Application
+        
+        statuses = ['pending'] * 5 + ['reviewing'] * 3 + ['shortlisted', 'interviewed', 'offered', 'hired', 'rejected', 'rejected']
+        n_jobs, n_users = len(jobs), len(users)
+        # Applicant (k + 31j) mod U is distinct per job while k < U, so (job, applicant) stays unique
+        applications = (
+            Application(
+                id=self._uuid(), job_id=jobs[i % n_jobs].pk,
+                applicant_id=users[(i // n_jobs + (i % n_jobs) * 31) % n_users].pk,
+                cover_letter=self._text(40), status=self.rng.choice(statuses), created_at=self._when(120),
+            )
+            for i in range(min(self.size('applications'), n_jobs * n_users))
+        )
+        self._create(Application, applications, 'applications')
+    
+    def posts(self, users):
+        from social.models import Post
+        
+        posts = (
+            Post(
+                id=self._uuid(), author_id=self.rng.choice(users).pk, content=self._text(50),
+                likes_count=int(self.rng.paretovariate(1.5)) - 1, created_at=self._when(60),
+            )
+            for _ in range(self.size('posts'))
+        )
+        self._create(Post, posts, 'posts')
+    
+    def messages(self, users):
+        from messaging.models import Conversation, Message
+        
+        conversations, members = [], []
+        for _ in range(self.size('conversations')):
+            conversation = Conversation(id=self._uuid(), created_at=self._when(90))
+            conversations.append(conversation)
+            members.append([user.pk for user in self.rng.sample(users, min(2, len(users)))])
+        self._create(Conversation, conversations, 'conversations')
+        
+        through = Conversation.participants.through
+        links = (
+            through(conversation_id=conversation.pk, user_id=user_id)
+            for conversation, user_ids in zip(conversations, members) for user_id in user_ids
+        )
+        self._create(through, links, 'conversation participants')
+        
+        def rows():
+            for _ in range(self.size('messages')):
+                index = self.rng.randrange(len(conversations))
+                yield Message(
+                    id=self._uuid(), conversation_id=conversations[index].pk, sender_id=self.rng.choice(members[index]),
+                    content=self._text(15), is_read=self.rng.random() < 0.8, created_at=self._when(90),
+                )
+        self._create(Message, rows(), 'messages')
+    
+    def _create(self, model, rows, label):
+        batch, total = [], 0
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                total += self._flush_batch(model, batch)
+                batch = []
+        if batch:
+            total += self._flush_batch(model, batch)
+        if self.stdout:
+            self.stdout.write(f'  {label}: {total}')
+        return total
+    
+    def _flush_batch(self, model, batch):
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+        return len(batch)
+    
+    def _uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+    
+    def _when(self, days):
+        return self.anchor - timedelta(seconds=self.rng.randrange(days * 86400))
+    
+    def _text(self, words):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
@@ -0,0 +1,166 @@
+import json
+import random
+import threading
+import time
+from contextlib import ExitStack
+from django.db import connections
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from .benchdata import BENCH_EMAIL_DOMAIN
+
+SCENARIOS = ['job_list', 'job_search', 'job_detail', 'application_pipeline', 'my_applications', 'profile_read', 'ai_match']
+
+# Benchmarks measure the endpoints, not the limiter in front of them
+UNLIMITED = override_settings(
+    RATE_LIMIT_BUCKETS={'default': (10 ** 9, 10 ** 9), 'ai': (10 ** 9, 10 ** 9), 'resume': (10 ** 9, 10 ** 9)},
+    RATE_LIMIT_CONCURRENCY={},
+)
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class BenchmarkRunner:
+    """Replays scripted API scenarios through the full middleware stack and reports latency and query counts.
+    
+    Requests go through Django's test client with real bearer tokens, so
+    authentication, renderers and middleware are all on the measured path.
+    Targets are picked from the bench data with a seeded RNG.
+    """
+    def __init__(self, iterations=200, warmup=10, concurrency=1, seed=42):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.concurrency = concurrency
+        self.seed = seed
+    
+    def load_targets(self):
+        from authentication.models import User
+        from companies.models import Company
+        from jobs.models import Job
+        
+        bench_users = User.objects.filter(email__endswith=f'@{BENCH_EMAIL_DOMAIN}').order_by('id')
+        self.candidates = list(bench_users.filter(role='candidate', profile__isnull=False)[:500])
+        self.recruiters = list(bench_users.filter(role='recruiter', posted_jobs__isnull=False).distinct()[:100])
+        self.job_ids = [str(pk) for pk in Job.objects.filter(is_published=True).order_by('id').values_list('id', flat=True)[:1000]]
+        self.company_ids = [str(pk) for pk in Company.objects.order_by('id').values_list('id', flat=True)[:500]]
+        self.job_titles = list(Job.objects.filter(is_published=True).order_by('id').values_list('title', flat=True)[:200])
+        if not (self.candidates and self.recruiters and self.job_ids):
+            raise ValueError('No bench data found; run generate_bench_data first')
+        self.tokens = {user.pk: str(AccessToken.for_user(user)) for user in self.candidates + self.recruiters}
+    
+    def run(self, names=None):
+        self.load_targets()
+        with UNLIMITED:
+            return {name: self.run_scenario(name) for name in names or SCENARIOS}
+    
+    def run_scenario(self, name):
+        scenario = getattr(self, f'scenario_{name}')
+        rng = random.Random(f'{self.seed}:{name}')
+        for _ in range(self.warmup):
+            self._request(APIClient(), *scenario(rng))
+        
+        results, lock = [], threading.Lock()
+        per_worker = max(1, self.iterations // self.concurrency)
+        
+        def worker(worker_id):
+            client, local_rng = APIClient(), random.Random(f'{self.seed}:{name}:{worker_id}')
+            samples = [self._request(client, *scenario(local_rng)) for _ in range(per_worker)]
+            with lock:
+                results.extend(samples)
+            for alias in connections:
+                connections[alias].close()
+        
+        start = time.perf_counter()
+        if self.concurrency == 1:
+            worker(0)
+        else:
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        elapsed = time.perf_counter() - start
+        
+        latencies = sorted(latency for latency, _, _ in results)
+        return {
+            'requests': len(results),
+            'errors': sum(1 for _, status, _ in results if status >= 400),
+            'throughput': len(results) / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'queries': sum(queries for _, _, queries in results) / len(results) if results else 0.0,
+        }
+    
+    def _request(self, client, user, method, path, data=None):
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.tokens[user.pk]}')
+        # A plain counter: CaptureQueriesContext keeps SQL text and stops at 9000 queries
+        queries = [0]
+        
+        def count(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+        
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(count))
+            start = time.perf_counter()
+            if method == 'get':
+                response = client.get(path, data)
+            else:
+                response = getattr(client, method)(path, data, format='json')
+            latency = (time.perf_counter() - start) * 1000
+        return latency, response.status_code, queries[0]
+    
+    def scenario_job_list(self, rng):
+        return rng.choice(self.candidates), 'get', '/api/jobs/', {'company': rng.choice(self.company_ids)}
+    
+    def scenario_job_search(self, rng):
+        return rng.choice(self.candidates), 'get', '/api/jobs/', {'search': rng.choice(self.job_titles)}
+    
+    def scenario_job_detail(self, rng):
+        return rng.choice(self.candidates), 'get', f'/api/jobs/{rng.choice(self.job_ids)}/', None
+    
+    def scenario_application_pipeline(self, rng):
+        return rng.choice(self.recruiters), 'get', '/api/applications/', None
+    
+    def scenario_my_applications(self, rng):
+        return rng.choice(self.candidates), 'get', '/api/applications/', None
+    
+    def scenario_profile_read(self, rng):
+        return rng.choice(self.candidates), 'get', '/api/profiles/', None
+    
+    def scenario_ai_match(self, rng):
+        return rng.choice(self.candidates), 'post', '/api/ai/job-match/', {'job_id': rng.choice(self.job_ids)}
+
+def relative_change(current, previous):
+    """(current - previous) / previous; any growth from zero (e.g. 0 -> 3 queries) is infinite."""
+    if previous:
+        return (current - previous) / previous
+    return float('inf') if current else 0.0
+
+def compare(results, baseline, tolerance=0.10):
+    """Per-scenario deltas against a saved run; a scenario regresses when p95 or queries grow past tolerance."""
+    report = {}
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        deltas = {
+            metric: relative_change(current[metric], previous[metric])
+            for metric in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput', 'queries')
+        }
+        deltas['regressed'] = deltas['p95_ms'] > tolerance or deltas['queries'] > tolerance or deltas['throughput'] < -tolerance
+        report[name] = deltas
+    return report
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+def save_baseline(path, results, meta):
+    with open(path, 'w') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2, sort_keys=True)
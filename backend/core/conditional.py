@@ -0,0 +1,103 @@
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max
+from django.db.models.signals import post_delete, post_save
+from django.utils.cache import patch_vary_headers
+from django.utils.crypto import md5
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from .models import ModelVersion
+from .signals import bulk_restored, bulk_soft_deleted
+
+class ModelVersions:
+    """Change counters for models whose rows show up in other models' payloads.
+    
+    Covers what max(updated_at) cannot see: related rows (e.g. a new
+    Application changing a job's applications_count) and rows changed through
+    queryset.update(). Counters live in the ModelVersion table, so every worker
+    and process sees the same value, and are bumped once the change commits.
+    """
+    def get(self, labels):
+        if not labels:
+            return []
+        versions = dict(ModelVersion.objects.filter(label__in=[label.lower() for label in labels]).values_list('label', 'version'))
+        return [versions.get(label.lower(), 0) for label in labels]
+    
+    def bump(self, label):
+        label = label.lower()
+        transaction.on_commit(lambda: self._increment(label))
+    
+    def _increment(self, label):
+        if not ModelVersion.objects.filter(label=label).update(version=F('version') + 1):
+            ModelVersion.objects.bulk_create([ModelVersion(label=label, version=1)], ignore_conflicts=True)
+    
+    def connect(self):
+        """Bump a model's counter on save/delete for every label in CONDITIONAL_GET_TRACKED_MODELS."""
+        for label in getattr(settings, 'CONDITIONAL_GET_TRACKED_MODELS', []):
+            model = apps.get_model(label)
+            post_save.connect(self._on_change, sender=model, dispatch_uid=f'etag-save-{label}')
+            post_delete.connect(self._on_change, sender=model, dispatch_uid=f'etag-delete-{label}')
+        bulk_soft_deleted.connect(self._on_bulk, dispatch_uid='etag-bulk-delete')
+        bulk_restored.connect(self._on_bulk, dispatch_uid='etag-bulk-restore')
+    
+    def _on_change(self, sender, **kwargs):
+        self.bump(sender._meta.label)
+    
+    def _on_bulk(self, sender, affected, **kwargs):
+        tracked = {label.lower() for label in getattr(settings, 'CONDITIONAL_GET_TRACKED_MODELS', [])}
+        for model in affected:
+            if model._meta.label_lower in tracked:
+                self.bump(model._meta.label)
+
+model_versions = ModelVersions()
+
+class ConditionalGetMixin:
+    """Weak ETags for generic list/detail views, answering If-None-Match before serialization.
+    
+    List validators come from max(updated_at) and the row count of the filtered
+    queryset, detail validators from the object's updated_at; both fold in the
+    ModelVersions counters named in etag_dependencies.
+    """
+    etag_dependencies = []
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        stats = queryset.order_by().aggregate(last=Max('updated_at'), total=Count('pk'))
+        etag = self._etag(request, 'list', stats['last'], stats['total'])
+        if self._not_modified(request, etag):
+            return self._not_modified_response(etag)
+        response = super().list(request, *args, **kwargs)
+        return self._tag(response, etag)
+    
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = self._etag(request, 'detail', instance.pk, instance.updated_at)
+        if self._not_modified(request, etag):
+            return self._not_modified_response(etag)
+        serializer = self.get_serializer(instance)
+        return self._tag(Response(serializer.data), etag)
+    
+    def _etag(self, request, *parts):
+        # The full path carries page, ordering, search and filters
+        parts = (type(self).__name__, request.user.pk, request.get_full_path(), *parts, *model_versions.get(self.etag_dependencies))
+        digest = md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+        return f'W/"{digest}"'
+    
+    def _not_modified(self, request, etag):
+        header = request.META.get('HTTP_IF_NONE_MATCH')
+        if not header:
+            return False
+        # Weak comparison (RFC 9110 13.1.2): ignore the W/ prefix on both sides
+        candidates = {tag.removeprefix('W/') for tag in parse_etags(header)}
+        return '*' in candidates or etag.removeprefix('W/') in candidates
+    
+    def _not_modified_response(self, etag):
+        return self._tag(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+    
+    def _tag(self, response, etag):
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            patch_vary_headers(response, ('Authorization', 'Cookie'))
+        return response
@@ -0,0 +1,31 @@
+import functools
+import logging
+import random
+import time
+from django.db import OperationalError
+
+logger = logging.getLogger(__name__)
+
+def is_lock_error(exc):
+    return 'database is locked' in str(exc) or 'database table is locked' in str(exc)
+
+def retry_on_locked(fn=None, attempts=5, base_delay=0.05, max_delay=1.0):
+    """Retry a write with jittered exponential backoff when SQLite reports a lock.
+    
+    Must wrap the whole transaction (not a statement inside one), since a
+    failed statement leaves the enclosing transaction unusable.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(attempts):
+                try:
+                    return func(*args, **kwargs)
+                except OperationalError as e:
+                    if not is_lock_error(e) or attempt == attempts - 1:
+                        raise
+                    delay = min(max_delay, base_delay * 2 ** attempt) * random.uniform(0.5, 1.5)
+                    logger.warning(f"Database locked in {func.__name__}, retry {attempt + 1} in {delay:.3f}s")
+                    time.sleep(delay)
+        return wrapper
+    return decorator(fn) if fn else decorator
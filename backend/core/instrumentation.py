@@ -0,0 +1,168 @@
+import asyncio
+import contextvars
+import functools
+import time
+from contextlib import contextmanager
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+from .metrics import CACHE_REQUESTS, EMBEDDING_DURATION, LLM_DURATION
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+_in_get_many = contextvars.ContextVar('in_cache_get_many', default=False)
+_MISSING = object()
+
+class RequestMetrics:
+    """Timings collected while one request is being handled."""
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # name -> [calls, seconds] for embedding, llm, serializer
+        self.spans = {}
+        self._serializer_depth = 0
+    
+    def add_span(self, name, seconds):
+        span = self.spans.setdefault(name, [0, 0.0])
+        span[0] += 1
+        span[1] += seconds
+    
+    def span_seconds(self, name):
+        return self.spans.get(name, [0, 0.0])[1]
+
+def current():
+    return _current.get()
+
+@contextmanager
+def collect():
+    """Install a RequestMetrics for the enclosed request; yields it."""
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+@contextmanager
+def wrap_queries(connection, wrapper):
+    """Like connection.execute_wrapper(), but on exit removes this wrapper rather than the last one.
+    
+    execute_wrapper() pops the tail of execute_wrappers, which drops the wrong
+    hook if anything else was appended while the block ran.
+    """
+    wrappers = connection.execute_wrappers
+    wrappers.append(wrapper)
+    try:
+        yield
+    finally:
+        for index in range(len(wrappers) - 1, -1, -1):
+            if wrappers[index] is wrapper:
+                del wrappers[index]
+                break
+
+def record_query(execute, sql, params, many, context):
+    """connection.execute_wrapper hook counting queries and time for the current request."""
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.db_queries += 1
+            metrics.db_seconds += time.perf_counter() - start
+
+HISTOGRAMS = {'embedding': EMBEDDING_DURATION, 'llm': LLM_DURATION}
+
+def _record_span(name, seconds):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.add_span(name, seconds)
+    if name in HISTOGRAMS:
+        HISTOGRAMS[name].observe(seconds)
+
+def timed(name):
+    """Decorator recording a call's latency as span `name` (sync or async functions)."""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    _record_span(name, time.perf_counter() - start)
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record_span(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def _timed_data(prop):
+    @functools.wraps(prop.fget)
+    def data(self):
+        metrics = _current.get()
+        if metrics is None or metrics._serializer_depth:
+            return prop.fget(self)
+        metrics._serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return prop.fget(self)
+        finally:
+            metrics._serializer_depth -= 1
+            metrics.add_span('serializer', time.perf_counter() - start)
+    return property(data)
+
+def instrument_serializers():
+    """Time top-level Serializer/ListSerializer .data evaluation (nested calls count once)."""
+    from rest_framework import serializers
+    
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        if not getattr(cls.data.fget, '_instrumented', False):
+            cls.data = _timed_data(cls.data)
+            cls.data.fget._instrumented = True
+
+def _count_cache(hits, misses):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.cache_hits += hits
+        metrics.cache_misses += misses
+    if hits:
+        CACHE_REQUESTS.inc(hits, result='hit')
+    if misses:
+        CACHE_REQUESTS.inc(misses, result='miss')
+
+class InstrumentedCacheMixin:
+    """Counts hits and misses of get/get_many on a Django cache backend."""
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if _in_get_many.get():
+            # BaseCache.get_many loops over get(); get_many counts the batch itself
+            return default if value is _MISSING else value
+        if value is _MISSING:
+            _count_cache(0, 1)
+            return default
+        _count_cache(1, 0)
+        return value
+    
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        token = _in_get_many.set(True)
+        try:
+            found = super().get_many(keys, version)
+        finally:
+            _in_get_many.reset(token)
+        _count_cache(len(found), len(keys) - len(found))
+        return found
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    pass
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    pass
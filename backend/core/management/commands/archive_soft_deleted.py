@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from core.archive import archive_service
+
+class Command(BaseCommand):
+    help = 'Move rows soft-deleted longer than ARCHIVE_AFTER_DAYS into the archive table.'
+    
+    def handle(self, *args, **options):
+        for label, count in archive_service.archive_all().items():
+            self.stdout.write(f'{label}: {count} archived')
+        self.stdout.write(self.style.SUCCESS('Archive run complete'))
@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from applications.models import Application
+from applications.serializers import ApplicationSerializer
+from core.renderers import ORJSONRenderer
+from jobs.models import Job
+from jobs.serializers import JobSerializer
+
+class Command(BaseCommand):
+    help = 'Compare render time and size of stdlib vs orjson renderers on real serializer output (run generate_bench_data first).'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+    
+    def handle(self, *args, **options):
+        jobs = Job.objects.select_related('company', 'posted_by')[:20]
+        applications = Application.objects.select_related('job__company', 'job__posted_by', 'applicant')[:50]
+        if len(jobs) < 20 or len(applications) < 50:
+            raise CommandError('Not enough jobs or applications; run generate_bench_data first')
+        
+        # Serialize once up front: only rendering is timed
+        payloads = {
+            'job list (20, nested company)': JobSerializer(jobs, many=True).data,
+            'application list (50)': ApplicationSerializer(applications, many=True).data,
+        }
+        resume = self._parsed_resume()
+        if 'error' in resume:
+            self.stderr.write(f"Skipping parse_resume: {resume['error'][:200]}")
+        else:
+            payloads['parse_resume (raw_text)'] = resume
+        renderers = {'stdlib': JSONRenderer(), 'orjson': ORJSONRenderer()}
+        for name, payload in payloads.items():
+            bodies = {label: renderer.render(payload) for label, renderer in renderers.items()}
+            same = len({json.dumps(json.loads(body), sort_keys=True) for body in bodies.values()}) == 1
+            self.stdout.write(f"{name}{'' if same else '  (OUTPUT DIFFERS)'}")
+            baseline = None
+            for label, renderer in renderers.items():
+                start = time.perf_counter()
+                for _ in range(options['iterations']):
+                    renderer.render(payload)
+                elapsed = (time.perf_counter() - start) / options['iterations'] * 1000
+                baseline = baseline or elapsed
+                self.stdout.write(f'  {label:<7} {elapsed:8.3f} ms  {len(bodies[label]):>8} bytes  {baseline / elapsed:5.1f}x')
+    
+    def _parsed_resume(self):
+        """ResumeParser output for a generated multi-page DOCX."""
+        import docx
+        from ai_services.resume_parser import resume_parser
+        
+        document = docx.Document()
+        document.add_paragraph('Ada Lovelace\nada@example.com\n(555) 123-4567')
+        document.add_paragraph('Summary\n' + 'Backend engineer with a decade of Python and Django work. ' * 10)
+        document.add_paragraph('Experience\n' + 'Senior Engineer at Acme 2015 - present. Built APIs on AWS and Docker. ' * 200)
+        document.add_paragraph('Education\nBSc Computer Science, MIT')
+        document.add_paragraph('Skills\nPython, Django, AWS, Docker, React, SQL')
+        with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as f:
+            path = f.name
+        try:
+            document.save(path)
+            return resume_parser.parse_resume(path)
+        finally:
+            os.unlink(path)
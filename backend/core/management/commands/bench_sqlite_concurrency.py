@@ -0,0 +1,106 @@
+import multiprocessing
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from core.db import retry_on_locked
+
+TABLE = 'bench_sqlite_scratch'
+
+def reader(start, seconds, rows, results):
+    start.wait()
+    deadline, n = time.monotonic() + seconds, 0
+    with connections['default'].cursor() as cursor:
+        while time.monotonic() < deadline:
+            cursor.execute(f'SELECT counter FROM {TABLE} WHERE id = %s', [n % rows])
+            cursor.fetchone()
+            n += 1
+    connections['default'].close()
+    results.put(('reads', n, 0))
+
+@retry_on_locked
+def write_once(key):
+    with transaction.atomic():
+        with connections['default'].cursor() as cursor:
+            cursor.execute(f'UPDATE {TABLE} SET counter = counter + 1 WHERE id = %s', [key])
+
+def writer(start, seconds, rows, pause, results):
+    start.wait()
+    deadline, n, errors = time.monotonic() + seconds, 0, 0
+    while time.monotonic() < deadline:
+        try:
+            write_once(n % rows)
+            n += 1
+        except Exception:
+            errors += 1
+        if pause:
+            time.sleep(pause)
+    connections['default'].close()
+    results.put(('writes', n, errors))
+
+class Command(BaseCommand):
+    help = 'Measure read throughput with and without concurrent writers on the default database.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--seconds', type=float, default=5.0)
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--write-pause', type=float, default=0.0, help='Seconds each writer sleeps between transactions')
+        parser.add_argument('--engine', help='Backend to benchmark instead of the configured one, e.g. django.db.backends.sqlite3')
+    
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('The default database is not SQLite')
+        if options['engine']:
+            # Before the first query, so the table and the file's journal mode come from this backend too
+            connections.settings['default'] = dict(connections.settings['default'], ENGINE=options['engine'])
+            del connections['default']
+        self._setup(options['rows'])
+        try:
+            baseline = self._run(options, writers=0)
+            contended = self._run(options, writers=options['writers'])
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE IF EXISTS {TABLE}')
+        
+        seconds = options['seconds']
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal = cursor.fetchone()[0]
+        self.stdout.write(f"engine: {connections['default'].settings_dict['ENGINE']} (journal_mode={journal})")
+        self.stdout.write(f"readers only:        {baseline['reads'] / seconds:>10.0f} reads/s")
+        self.stdout.write(
+            f"with {options['writers']} writers:      {contended['reads'] / seconds:>10.0f} reads/s, "
+            f"{contended['writes'] / seconds:.0f} writes/s, {contended['errors']} write errors"
+        )
+        ratio = contended['reads'] / baseline['reads'] if baseline['reads'] else 0
+        self.stdout.write(self.style.SUCCESS(f'read throughput under write load: {ratio:.0%} of baseline'))
+    
+    def _setup(self, rows):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {TABLE}')
+            cursor.execute(f'CREATE TABLE {TABLE} (id INTEGER PRIMARY KEY, counter INTEGER NOT NULL)')
+            cursor.executemany(f'INSERT INTO {TABLE} (id, counter) VALUES (%s, 0)', [(i,) for i in range(rows)])
+    
+    def _run(self, options, writers):
+        """One process per reader and writer, like separate gunicorn workers; returns summed counts."""
+        context = multiprocessing.get_context('fork')
+        start, results = context.Event(), context.Queue()
+        common = (start, options['seconds'], options['rows'])
+        # Forked children must not share the parent's SQLite handle
+        connections.close_all()
+        processes = [context.Process(target=reader, args=(*common, results)) for _ in range(options['readers'])]
+        processes += [
+            context.Process(target=writer, args=(*common, options['write_pause'], results)) for _ in range(writers)
+        ]
+        for process in processes:
+            process.start()
+        start.set()
+        stats = {'reads': 0, 'writes': 0, 'errors': 0}
+        for _ in processes:
+            kind, count, errors = results.get()
+            stats[kind] += count
+            stats['errors'] += errors
+        for process in processes:
+            process.join()
+        return stats
@@ -0,0 +1,25 @@
+import time
+from django.core.management.base import BaseCommand
+from core.benchdata import BenchDataGenerator, SIZES
+
+class Command(BaseCommand):
+    help = 'Generate deterministic benchmark data (100k users, 50k jobs, 1M job views, ... at --scale 1).'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=0.01, help='Fraction of the full data set to build')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--flush', action='store_true', help='Delete existing bench data first')
+    
+    def handle(self, *args, **options):
+        generator = BenchDataGenerator(seed=options['seed'], scale=options['scale'],
+                                       batch_size=options['batch_size'], stdout=self.stdout)
+        if options['flush']:
+            deleted, _ = generator.flush()
+            self.stdout.write(f'Deleted {deleted} existing bench rows')
+        
+        planned = ', '.join(f'{name}={generator.size(name)}' for name in SIZES)
+        self.stdout.write(f'Generating (seed={options["seed"]}, scale={options["scale"]}): {planned}')
+        start = time.monotonic()
+        generator.generate()
+        self.stdout.write(self.style.SUCCESS(f'Bench data ready in {time.monotonic() - start:.1f}s'))
@@ -0,0 +1,49 @@
+import json
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core.profiling import profiler, read_collapsed, self_time, to_speedscope
+
+class Command(BaseCommand):
+    help = 'Summarize sampled profiles per endpoint, or export one endpoint as collapsed stacks or speedscope JSON.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', help='Profile directory name (see the listing), e.g. api_ai_job_match')
+        parser.add_argument('--format', choices=['top', 'collapsed', 'speedscope'], default='top')
+        parser.add_argument('--output', help='File to write collapsed/speedscope output to (default stdout)')
+        parser.add_argument('--limit', type=int, default=25)
+    
+    def handle(self, *args, **options):
+        root = profiler.directory
+        if not root.exists():
+            raise CommandError(f'No profiles under {root}')
+        
+        if not options['endpoint']:
+            for directory in sorted(p for p in root.iterdir() if p.is_dir()):
+                requests = len([p for p in directory.glob('*.collapsed') if not p.name.startswith('aggregate.')])
+                samples = sum(read_collapsed(directory.glob('aggregate.*.collapsed')).values())
+                self.stdout.write(f'{directory.name:<50} {requests:>6} requests {samples:>9} samples')
+            return
+        
+        directory = root / options['endpoint']
+        stacks = read_collapsed(directory.glob('aggregate.*.collapsed'))
+        if not stacks:
+            raise CommandError(f'No samples for {options["endpoint"]}')
+        interval = getattr(settings, 'PROFILER_INTERVAL', 0.005)
+        
+        if options['format'] == 'top':
+            total = sum(stacks.values())
+            self.stdout.write(f'{total} samples (~{total * interval:.2f}s wall time), top frames by self time:')
+            for frame, count in self_time(stacks).most_common(options['limit']):
+                self.stdout.write(f'{count / total:>7.1%}  {frame}')
+            return
+        
+        if options['format'] == 'speedscope':
+            output = json.dumps(to_speedscope(stacks, options['endpoint'], interval))
+        else:
+            output = ''.join(f'{stack} {count}\n' for stack, count in stacks.most_common())
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output)
+            self.stdout.write(f"Wrote {options['output']}")
+        else:
+            self.stdout.write(output)
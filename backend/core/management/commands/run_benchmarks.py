@@ -0,0 +1,61 @@
+import platform
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from core.benchmarks import SCENARIOS, BenchmarkRunner, compare, load_baseline, save_baseline
+
+class Command(BaseCommand):
+    help = 'Run endpoint benchmark scenarios against bench data and report p50/p95/p99, throughput and queries.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', action='append', choices=SCENARIOS, help='Repeatable; defaults to all')
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--concurrency', type=int, default=1)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--save-baseline', metavar='PATH')
+        parser.add_argument('--compare', metavar='PATH', help='Baseline JSON written by --save-baseline')
+        parser.add_argument('--tolerance', type=float, default=0.10)
+        parser.add_argument('--fail-on-regression', action='store_true')
+    
+    def handle(self, *args, **options):
+        runner = BenchmarkRunner(iterations=options['iterations'], warmup=options['warmup'],
+                                 concurrency=options['concurrency'], seed=options['seed'])
+        try:
+            results = runner.run(options['scenario'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        
+        self.stdout.write(f"{'scenario':<22}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'queries':>9}{'errors':>8}")
+        for name, stats in results.items():
+            self.stdout.write(
+                f"{name:<22}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}"
+                f"{stats['throughput']:>9.1f}{stats['queries']:>9.1f}{stats['errors']:>8}"
+            )
+        
+        if options['save_baseline']:
+            meta = {
+                'created_at': timezone.now().isoformat(),
+                'iterations': options['iterations'],
+                'concurrency': options['concurrency'],
+                'seed': options['seed'],
+                'database': settings.DATABASES['default']['ENGINE'],
+                'python': platform.python_version(),
+            }
+            save_baseline(options['save_baseline'], results, meta)
+            self.stdout.write(f"Baseline saved to {options['save_baseline']}")
+        
+        if options['compare']:
+            report = compare(results, load_baseline(options['compare']), options['tolerance'])
+            regressed = []
+            self.stdout.write(f"\nvs {options['compare']}")
+            for name, deltas in report.items():
+                line = f"{name:<22}p50 {deltas['p50_ms']:+.0%}  p95 {deltas['p95_ms']:+.0%}  p99 {deltas['p99_ms']:+.0%}  " \
+                       f"req/s {deltas['throughput']:+.0%}  queries {deltas['queries']:+.0%}"
+                if deltas['regressed']:
+                    regressed.append(name)
+                    self.stdout.write(self.style.ERROR(f'{line}  REGRESSED'))
+                else:
+                    self.stdout.write(line)
+            if regressed and options['fail_on_regression']:
+                raise CommandError(f"Regressions beyond {options['tolerance']:.0%}: {', '.join(regressed)}")
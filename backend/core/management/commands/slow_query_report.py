@@ -0,0 +1,66 @@
+import json
+from collections import Counter
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+class Command(BaseCommand):
+    help = 'Aggregate the slow-query log by fingerprint and report full scans, temp B-trees and index hints.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--since-hours', type=float, help='Only entries newer than this')
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--problems-only', action='store_true', help='Only queries with a full scan or temp B-tree')
+        parser.add_argument('--show-plan', action='store_true')
+    
+    def handle(self, *args, **options):
+        path = getattr(settings, 'SLOW_QUERY_LOG', None)
+        if not path:
+            raise CommandError('SLOW_QUERY_LOG is not set')
+        try:
+            with open(path) as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            raise CommandError(f'No slow queries logged yet ({path})')
+        
+        if options['since_hours']:
+            cutoff = timezone.now() - timedelta(hours=options['since_hours'])
+            entries = [e for e in entries if parse_datetime(e['at']) >= cutoff]
+        
+        groups = {}
+        for entry in entries:
+            group = groups.setdefault(entry['fingerprint'], {'sql': entry['sql'], 'times': [], 'callers': Counter(), 'plan': []})
+            group['times'].append(entry['ms'])
+            group['callers'][entry.get('caller') or 'unknown'] += 1
+            if entry.get('plan') and not group['plan']:
+                group.update(plan=entry['plan'], full_scans=entry.get('full_scans', []),
+                             temp_btree=entry.get('temp_btree', False), hints=entry.get('hints', {}))
+        
+        rows = sorted(groups.items(), key=lambda item: -sum(item[1]['times']))
+        if options['problems_only']:
+            rows = [(key, g) for key, g in rows if g.get('full_scans') or g.get('temp_btree')]
+        
+        self.stdout.write(f'{len(entries)} slow executions, {len(groups)} fingerprints\n')
+        for key, group in rows[:options['limit']]:
+            times = sorted(group['times'])
+            flags = []
+            if group.get('full_scans'):
+                flags.append(f"FULL SCAN {', '.join(group['full_scans'])}")
+            if group.get('temp_btree'):
+                flags.append('TEMP B-TREE')
+            self.stdout.write(self.style.WARNING(
+                f"{key}  calls={len(times)} total={sum(times):.0f}ms mean={sum(times) / len(times):.1f}ms "
+                f"max={times[-1]:.1f}ms  {' | '.join(flags)}"
+            ))
+            self.stdout.write(f"  {group['sql'][:300]}")
+            for caller, count in group['callers'].most_common(3):
+                self.stdout.write(f'  from {caller} ({count}x)')
+            for table, columns in group.get('hints', {}).items():
+                self.stdout.write(self.style.NOTICE(f"  hint: {table} is scanned while filtering on {', '.join(columns)}; "
+                                                    f"consider models.Index(fields={columns!r})"))
+            if options['show_plan']:
+                for line in group['plan']:
+                    self.stdout.write(f'    {line}')
+            self.stdout.write('')
@@ -0,0 +1,228 @@
+import gzip
+import json
+import logging
+import random
+import time
+import zlib
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.urls import Resolver404, resolve
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+from . import instrumentation
+from .profiling import profiler
+from .slowqueries import slow_query_recorder
+from .metrics import DB_DURATION, DB_QUERIES, REQUEST_DURATION, SERIALIZER_DURATION
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript', 'application/xml')
+re_accepts_br = _lazy_re_compile(r'\bbr\b')
+re_accepts_gzip = _lazy_re_compile(r'\bgzip\b')
+
+class _Compressor:
+    """Incremental gzip/brotli encoder; flushes after every chunk so streams stay live."""
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._obj = brotli.Compressor(quality=getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 4))
+        else:
+            self._obj = zlib.compressobj(getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6), zlib.DEFLATED, 31)
+    
+    def compress(self, data):
+        if self.encoding == 'br':
+            return self._obj.process(data) + self._obj.flush()
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self):
+        if self.encoding == 'br':
+            return self._obj.finish()
+        return self._obj.flush(zlib.Z_FINISH)
+
+class CompressionMiddleware:
+    """Brotli/gzip for API responses above COMPRESSION_MIN_SIZE, including streaming ones.
+    
+    Sits after WhiteNoise, which serves its own precompressed static files.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+    
+    def __call__(self, request):
+        response = self.get_response(request)
+        encoding = self._negotiate(request, response)
+        if encoding is None:
+            return response
+        
+        if response.streaming:
+            compressor = _Compressor(encoding)
+            if response.is_async:
+                original = response.streaming_content
+                async def stream():
+                    async for chunk in original:
+                        yield compressor.compress(chunk)
+                    yield compressor.finish()
+                response.streaming_content = stream()
+            else:
+                response.streaming_content = self._stream(compressor, response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            if len(response.content) < self.min_size:
+                return response
+            if encoding == 'br':
+                compressed = brotli.compress(response.content, quality=getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 4))
+            else:
+                compressed = gzip.compress(response.content, compresslevel=getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6), mtime=0)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        
+        # The representation changed, so a strong validator no longer holds
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+    
+    def _negotiate(self, request, response):
+        if response.status_code != 200 or response.has_header('Content-Encoding'):
+            return None
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return None
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return None
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accept = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is not None and re_accepts_br.search(accept):
+            return 'br'
+        if re_accepts_gzip.search(accept):
+            return 'gzip'
+        return None
+    
+    @staticmethod
+    def _stream(compressor, chunks):
+        for chunk in chunks:
+            yield compressor.compress(chunk)
+        yield compressor.finish()
+
+class InstrumentationMiddleware:
+    """Per-request SQL, cache, AI and serializer timings.
+    
+    Feeds the metrics registry, logs a JSON line for requests slower than
+    INSTRUMENTATION_LOG_MIN_MS (the rest at DEBUG) and adds a Server-Timing
+    header for admins (or everyone when DEBUG is on). Also runs the slow-query
+    recorder, so both hooks leave execute_wrappers as they found it.
+    """
+    def __init__(self, get_response):
+        if not getattr(settings, 'INSTRUMENTATION_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.log_min_ms = getattr(settings, 'INSTRUMENTATION_LOG_MIN_MS', 500)
+        # The slow-query recorder goes first (outermost) so its timing covers the query alone
+        self.query_wrappers = [instrumentation.record_query]
+        if getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', None) is not None:
+            self.query_wrappers.insert(0, slow_query_recorder)
+    
+    def __call__(self, request):
+        with instrumentation.collect() as metrics, ExitStack() as stack:
+            for alias in connections:
+                for wrapper in self.query_wrappers:
+                    stack.enter_context(instrumentation.wrap_queries(connections[alias], wrapper))
+            response = self.get_response(request)
+        
+        duration = time.perf_counter() - metrics.started
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match else 'unmatched'
+        serializer_seconds = metrics.span_seconds('serializer')
+        REQUEST_DURATION.observe(duration, route=route, method=request.method, status=response.status_code)
+        DB_DURATION.observe(metrics.db_seconds, route=route)
+        DB_QUERIES.observe(metrics.db_queries, route=route)
+        if serializer_seconds:
+            SERIALIZER_DURATION.observe(serializer_seconds, route=route)
+        
+        level = logging.INFO if duration * 1000 >= self.log_min_ms else logging.DEBUG
+        if logger.isEnabledFor(level):
+            record = {
+                'method': request.method,
+                'route': route,
+                'status': response.status_code,
+                'duration_ms': round(duration * 1000, 2),
+                'db_queries': metrics.db_queries,
+                'db_ms': round(metrics.db_seconds * 1000, 2),
+                'cache_hits': metrics.cache_hits,
+                'cache_misses': metrics.cache_misses,
+                **{f'{name}_ms': round(seconds * 1000, 2) for name, (_, seconds) in metrics.spans.items()},
+            }
+            logger.log(level, json.dumps(record, separators=(',', ':')))
+        
+        if settings.DEBUG or self._is_admin(request):
+            response['Server-Timing'] = self._server_timing(metrics, duration)
+        return response
+    
+    @staticmethod
+    def _is_admin(request):
+        user = getattr(request, 'user', None)
+        return bool(user and user.is_authenticated and (user.is_staff or getattr(user, 'role', None) == 'admin'))
+    
+    @staticmethod
+    def _server_timing(metrics, duration):
+        entries = [
+            f'db;dur={metrics.db_seconds * 1000:.1f};desc="{metrics.db_queries} queries"',
+            f'cache;desc="{metrics.cache_hits} hit {metrics.cache_misses} miss"',
+        ]
+        for name, (calls, seconds) in metrics.spans.items():
+            entries.append(f'{name};dur={seconds * 1000:.1f};desc="{calls} calls"')
+        entries.append(f'total;dur={duration * 1000:.1f}')
+        return ', '.join(entries)
+
+class ProfilingMiddleware:
+    """Samples the stack of selected requests with core.profiling.profiler.
+    
+    A request is profiled when an admin sends the PROFILER_HEADER header, or at
+    random for PROFILER_SAMPLE_RATE of traffic. Explicit requests get the
+    profile file name back in the same header.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.header = getattr(settings, 'PROFILER_HEADER', 'X-Profile')
+        self.meta_key = 'HTTP_' + self.header.upper().replace('-', '_')
+    
+    def __call__(self, request):
+        explicit = bool(request.META.get(self.meta_key)) and self._is_admin(request)
+        if not explicit and random.random() >= getattr(settings, 'PROFILER_SAMPLE_RATE', 0.0):
+            return self.get_response(request)
+        
+        try:
+            route = resolve(request.path_info).route
+        except Resolver404:
+            route = 'unmatched'
+        session = profiler.start(route)
+        try:
+            response = self.get_response(request)
+        finally:
+            path = profiler.stop(session)
+        if explicit and path:
+            response[self.header] = path.name
+        return response
+    
+    @staticmethod
+    def _is_admin(request):
+        """Session or bearer-token admin; runs before DRF, so tokens are checked here."""
+        from rest_framework.exceptions import AuthenticationFailed
+        from authentication.backends import CachedJWTAuthentication
+        
+        user = getattr(request, 'user', None)
+        if not (user and user.is_authenticated):
+            try:
+                authenticated = CachedJWTAuthentication().authenticate(request)
+            except AuthenticationFailed:
+                return False
+            user = authenticated[0] if authenticated else None
+        return bool(user and user.is_authenticated and (user.is_staff or user.role == 'admin'))
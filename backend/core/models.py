@@ -1,8 +1,77 @@
-from django.db import models
+from functools import partial
+from django.db import models, transaction
 from django.utils import timezone
 import uuid
+from .signals import bulk_soft_deleted, bulk_restored
 
-class ActiveObjectsManager(models.Manager):
+# Condition for partial indexes that only cover rows ActiveObjectsManager can return
+LIVE_ROWS = models.Q(is_deleted=False)
+# Condition for partial indexes over the rows core.archive scans by deleted_at
+DELETED_ROWS = models.Q(is_deleted=True)
+
+class SoftDeleteQuerySet(models.QuerySet):
+    """Bulk soft-delete/restore in chunked UPDATEs, cascading via Model.soft_delete_cascade.
+    
+    Each chunk of rows (with its cascade) commits in its own transaction, and
+    bulk_soft_deleted/bulk_restored are sent once per committed chunk.
+    """
+    CHUNK_SIZE = 1000
+    
+    def soft_delete(self, chunk_size=None):
+        """Soft delete every row in the queryset and its configured children; returns {model: count}."""
+        pks = list(self.filter(is_deleted=False).values_list('pk', flat=True))
+        values = {'is_deleted': True, 'deleted_at': timezone.now()}
+        return self._in_chunks(pks, values, bulk_soft_deleted, chunk_size or self.CHUNK_SIZE)
+    
+    def restore(self, chunk_size=None):
+        """Restore rows and the children that were soft-deleted together with them.
+        
+        Only available on Model.all_objects: Model.objects never returns
+        deleted rows, so there would be nothing to restore.
+        """
+        deleted_at = dict(self.filter(is_deleted=True).values_list('pk', 'deleted_at'))
+        values = {'is_deleted': False, 'deleted_at': None}
+        return self._in_chunks(list(deleted_at), values, bulk_restored, chunk_size or self.CHUNK_SIZE, deleted_at)
+    
+    def _in_chunks(self, pks, values, signal, chunk_size, deleted_at=None):
+        counts = {}
+        for start in range(0, len(pks), chunk_size):
+            chunk, affected = pks[start:start + chunk_size], {}
+            # Children are matched on the deleted_at of the parents they were deleted with
+            chunk_deleted_at = {deleted_at[pk] for pk in chunk} - {None} if deleted_at is not None else None
+            with transaction.atomic(using=self.db):
+                self._cascade(self.model, chunk, values, affected, chunk_size, chunk_deleted_at)
+                transaction.on_commit(partial(signal.send, sender=self.model, affected=affected), using=self.db)
+            for model, ids in affected.items():
+                counts[model] = counts.get(model, 0) + len(ids)
+        return counts
+    
+    def _cascade(self, model, pks, values, affected, chunk_size, deleted_at=None):
+        if not pks:
+            return
+        affected.setdefault(model, []).extend(pks)
+        manager = model._base_manager.db_manager(self.db)
+        for start in range(0, len(pks), chunk_size):
+            manager.filter(pk__in=pks[start:start + chunk_size]).update(**values)
+        
+        restoring = not values['is_deleted']
+        for accessor in getattr(model, 'soft_delete_cascade', []):
+            relation = model._meta.get_field(accessor)
+            child_model, fk_name = relation.related_model, relation.field.name
+            children = child_model._base_manager.db_manager(self.db).filter(is_deleted=restoring)
+            if restoring:
+                # Children deleted separately before their parent stay deleted
+                children = children.filter(deleted_at__in=deleted_at or [])
+            child_pks = []
+            for start in range(0, len(pks), chunk_size):
+                child_pks += children.filter(**{f'{fk_name}__in': pks[start:start + chunk_size]}).values_list('pk', flat=True)
+            self._cascade(child_model, child_pks, values, affected, chunk_size, deleted_at)
+
+class ActiveQuerySet(SoftDeleteQuerySet):
+    def restore(self, chunk_size=None):
+        raise TypeError(f"{self.model.__name__}.objects excludes deleted rows; use {self.model.__name__}.all_objects to restore")
+
+class ActiveObjectsManager(models.Manager.from_queryset(ActiveQuerySet)):
     """Manager to filter out soft-deleted objects."""
     def get_queryset(self):
         return super().get_queryset().filter(is_deleted=False)
@@ -12,12 +81,17 @@ class BaseModel(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     created_at = models.DateTimeField(default=timezone.now, db_index=True)
     updated_at = models.DateTimeField(auto_now=True, db_index=True)
-    is_active = models.BooleanField(default=True, db_index=True)
-    is_deleted = models.BooleanField(default=False, db_index=True)
+    # Low-selectivity flags: hot queries use partial indexes with
+    # condition=LIVE_ROWS on the concrete models instead of standalone indexes
+    is_active = models.BooleanField(default=True)
+    is_deleted = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
     
     objects = ActiveObjectsManager()
-    all_objects = models.Manager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+    
+    # Reverse accessors whose rows are bulk soft-deleted/restored with this model
+    soft_delete_cascade = []
     
     class Meta:
         abstract = True
@@ -27,13 +101,39 @@ class BaseModel(models.Model):
         ]
     
     def soft_delete(self):
-        """Soft delete the object."""
+        """Soft delete the object; a no-op if it is already deleted."""
+        if self.is_deleted:
+            return
         self.is_deleted = True
         self.deleted_at = timezone.now()
         self.save(update_fields=['is_deleted', 'deleted_at'])
     
     def restore(self):
-        """Restore soft deleted object."""
+        """Restore soft deleted object; a no-op if it is not deleted."""
+        if not self.is_deleted:
+            return
         self.is_deleted = False
         self.deleted_at = None
-        self.save(update_fields=['is_deleted', 'deleted_at'])
\ No newline at end of file
+        self.save(update_fields=['is_deleted', 'deleted_at'])
+
+class ArchivedRecord(models.Model):
+    """Row moved out of a live table after a long soft-delete (see core.archive)."""
+    model_label = models.CharField(max_length=100)
+    object_id = models.CharField(max_length=64)
+    # Rows archived in the same chunk share a batch, so restore() can find a row's dependents
+    batch = models.UUIDField(null=True, blank=True)
+    data = models.JSONField()
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['model_label', 'object_id']),
+            models.Index(fields=['batch', 'model_label']),
+            models.Index(fields=['archived_at']),
+        ]
+
+class ModelVersion(models.Model):
+    """Change counter per model label, folded into conditional GET validators (see core.conditional)."""
+    label = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField(default=0)
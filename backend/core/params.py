@@ -0,0 +1,17 @@
+import uuid
+
+def int_param(request, name, default, minimum=1, maximum=None):
+    """Integer query parameter clamped to [minimum, maximum]; missing or malformed values use default."""
+    try:
+        value = int(request.GET.get(name, default))
+    except (TypeError, ValueError):
+        value = default
+    value = max(value, minimum)
+    return value if maximum is None else min(value, maximum)
+
+def uuid_param(value):
+    """value as a UUID, or None when it is missing or malformed."""
+    try:
+        return uuid.UUID(str(value)) if value else None
+    except ValueError:
+        return None
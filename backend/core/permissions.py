@@ -19,4 +19,9 @@ class IsAdminOrReadOnly(permissions.BasePermission):
     def has_permission(self, request, view):
         if request.method in permissions.SAFE_METHODS:
             return True
-        return request.user.is_authenticated and request.user.role == 'admin'
\ No newline at end of file
+        return request.user.is_authenticated and request.user.role == 'admin'
+
+class IsAdmin(permissions.BasePermission):
+    """Staff users or users with the admin role."""
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and (request.user.is_staff or request.user.role == 'admin')
\ No newline at end of file
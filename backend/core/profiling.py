@@ -0,0 +1,221 @@
+import collections
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+def route_slug(route):
+    return re.sub(r'[^A-Za-z0-9]+', '_', route).strip('_') or 'root'
+
+def frame_label(code, roots):
+    filename = code.co_filename
+    for root in roots:
+        if filename.startswith(root):
+            filename = filename[len(root):].lstrip(os.sep)
+            break
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'.replace(';', ':')
+
+class ProfileSession:
+    """Stacks (tuples of code objects) sampled from one thread while it handles one request."""
+    def __init__(self, thread_id, route):
+        self.thread_id = thread_id
+        self.route = route
+        self.id = uuid.uuid4().hex[:12]
+        self.started = time.time()
+        self.stacks = collections.Counter()
+
+class SamplingProfiler:
+    """Statistical profiler for selected requests, one sampler thread per process.
+    
+    Every PROFILER_INTERVAL seconds the sampler reads the current frame of each
+    thread that is handling a profiled request and counts its stack, so the cost
+    scales with the sampling rate rather than with call volume. Finished sessions
+    are handed back to the sampler thread, which writes them as collapsed-stack
+    files (keeping the newest PROFILER_MAX_FILES per endpoint) and flushes a
+    per-endpoint aggregate for this process every PROFILER_FLUSH_SECONDS (see
+    the profile_report command). Request threads never touch the disk.
+    """
+    def __init__(self):
+        self._sessions = {}
+        self._finished = collections.deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._aggregates = collections.defaultdict(collections.Counter)
+        self._dirty = set()
+        self._flushed = time.monotonic()
+        self._labels = {}
+        # Longest prefix first so site-packages paths beat their parent directories
+        self._roots = sorted({p for p in sys.path if p} | {str(settings.BASE_DIR)}, key=len, reverse=True)
+    
+    @property
+    def directory(self):
+        return Path(getattr(settings, 'PROFILER_DIR', settings.BASE_DIR / 'logs' / 'profiles'))
+    
+    def start(self, route):
+        session = ProfileSession(threading.get_ident(), route)
+        with self._lock:
+            self._sessions[session.thread_id] = session
+            self._ensure_thread()
+        self._wake.set()
+        return session
+    
+    def stop(self, session):
+        """Stop sampling and queue the session's stacks for writing; returns the file's path or None."""
+        with self._lock:
+            self._sessions.pop(session.thread_id, None)
+            if not session.stacks:
+                return None
+            self._finished.append(session)
+            self._ensure_thread()
+        self._wake.set()
+        return self._path(session)
+    
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        me = threading.get_ident()
+        while True:
+            self._wake.clear()
+            self._drain()
+            if not self._sessions:
+                self._wake.wait(self._flush_seconds if self._dirty else 60)
+                continue
+            time.sleep(getattr(settings, 'PROFILER_INTERVAL', 0.005))
+            frames = sys._current_frames()
+            # Held while recording so stop() never sees a session mid-update
+            with self._lock:
+                for session in self._sessions.values():
+                    frame = frames.get(session.thread_id)
+                    if frame is None or session.thread_id == me:
+                        continue
+                    # Code objects are hashable and cheap to collect; labels are built at write time
+                    stack = []
+                    while frame is not None:
+                        stack.append(frame.f_code)
+                        frame = frame.f_back
+                    session.stacks[tuple(stack)] += 1
+            del frames
+    
+    @property
+    def _flush_seconds(self):
+        return getattr(settings, 'PROFILER_FLUSH_SECONDS', 10)
+    
+    def _drain(self):
+        """Write finished sessions and, when due, the aggregates they changed (sampler thread only)."""
+        while self._finished:
+            session = self._finished.popleft()
+            try:
+                self._write(session)
+            except OSError as e:
+                logger.warning(f"Failed to write profile for {session.route}: {e}")
+        if self._dirty and time.monotonic() - self._flushed >= self._flush_seconds:
+            self.flush()
+    
+    def flush(self):
+        """Write the aggregate of every endpoint profiled since the last flush."""
+        self._flushed = time.monotonic()
+        routes, self._dirty = self._dirty, set()
+        for route in routes:
+            lines = ''.join(f'{stack} {count}\n' for stack, count in self._aggregates[route].items())
+            # One aggregate per process so concurrent workers never clobber each other
+            target = self.directory / route_slug(route) / f'aggregate.{os.getpid()}.collapsed'
+            tmp = target.with_suffix('.tmp')
+            try:
+                tmp.write_text(lines)
+                os.replace(tmp, target)
+            except OSError as e:
+                logger.warning(f"Failed to write profile aggregate for {route}: {e}")
+    
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = frame_label(code, self._roots)
+        return label
+    
+    def _path(self, session):
+        stamp = time.strftime('%Y%m%dT%H%M%S', time.gmtime(session.started)) + f'.{int(session.started * 1e6) % 1000000:06d}'
+        return self.directory / route_slug(session.route) / f'{stamp}-{session.id}.collapsed'
+    
+    def _write(self, session):
+        path = self._path(session)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        stacks = collections.Counter()
+        for codes, count in session.stacks.items():
+            stacks[';'.join(self._label(code) for code in reversed(codes))] += count
+        path.write_text(''.join(f'{stack} {count}\n' for stack, count in stacks.items()))
+        self._prune(path.parent)
+        
+        aggregate = self._aggregates[session.route]
+        aggregate.update(stacks)
+        limit = getattr(settings, 'PROFILER_MAX_STACKS', 10000)
+        if len(aggregate) > limit:
+            # Rare stacks go first; they barely move a flame graph
+            self._aggregates[session.route] = collections.Counter(dict(aggregate.most_common(limit)))
+        self._dirty.add(session.route)
+        return path
+    
+    def _prune(self, directory):
+        """Delete the oldest per-request files beyond PROFILER_MAX_FILES."""
+        keep = getattr(settings, 'PROFILER_MAX_FILES', 500)
+        # Names start with a UTC timestamp, so they sort oldest first
+        files = sorted(p for p in directory.glob('*.collapsed') if not p.name.startswith('aggregate.'))
+        for path in files[:max(0, len(files) - keep)]:
+            path.unlink(missing_ok=True)
+
+profiler = SamplingProfiler()
+
+def read_collapsed(paths):
+    stacks = collections.Counter()
+    for path in paths:
+        for line in Path(path).read_text().splitlines():
+            stack, _, count = line.rpartition(' ')
+            if stack and count.isdigit():
+                stacks[stack] += int(count)
+    return stacks
+
+def to_speedscope(stacks, name, interval):
+    """Speedscope 'sampled' profile; weights are milliseconds at the sampling interval."""
+    frames, index = [], {}
+    samples, weights = [], []
+    for stack, count in stacks.items():
+        sample = []
+        for label in stack.split(';'):
+            if label not in index:
+                index[label] = len(frames)
+                frames.append({'name': label})
+            sample.append(index[label])
+        samples.append(sample)
+        weights.append(count * interval * 1000)
+    return {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'name': name,
+        'exporter': 'careeropen profile_report',
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'sampled',
+            'name': name,
+            'unit': 'milliseconds',
+            'startValue': 0,
+            'endValue': sum(weights),
+            'samples': samples,
+            'weights': weights,
+        }],
+    }
+
+def self_time(stacks):
+    """Leaf-frame sample counts, i.e. where the time is actually spent."""
+    leaves = collections.Counter()
+    for stack, count in stacks.items():
+        leaves[stack.rsplit(';', 1)[-1]] += count
+    return leaves
@@ -0,0 +1,247 @@
+import contextvars
+import functools
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from django.conf import settings
+from rest_framework import status
+from rest_framework.response import Response
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# (concurrency name, lease id) held by the current request, for extend_lease()
+_lease = contextvars.ContextVar('rate_limit_lease', default=None)
+
+# KEYS[1]=bucket; ARGV: capacity, refill/s, cost, now. Returns {allowed, tokens*1000}
+TOKEN_BUCKET_LUA = """
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local capacity, rate, cost, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, math.floor(tokens * 1000)}
+"""
+
+# KEYS[1]=lease set; ARGV: limit, lease id, now, ttl
+ACQUIRE_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[3])
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], tonumber(ARGV[3]) + tonumber(ARGV[4]), ARGV[2])
+return 1
+"""
+
+class RedisBucketStore:
+    """Token buckets and concurrency leases in Redis; every check is one atomic script call."""
+    def __init__(self, url):
+        self.client = redis.Redis.from_url(url)
+        self._consume = self.client.register_script(TOKEN_BUCKET_LUA)
+        self._acquire = self.client.register_script(ACQUIRE_LUA)
+    
+    def consume(self, key, capacity, rate, cost, now):
+        allowed, tokens = self._consume(keys=[f'rl:bucket:{key}'], args=[capacity, rate, cost, now])
+        return bool(allowed), tokens / 1000
+    
+    def acquire(self, name, limit, lease_id, now, ttl):
+        return bool(self._acquire(keys=[f'rl:leases:{name}'], args=[limit, lease_id, now, ttl]))
+    
+    def release(self, name, lease_id):
+        self.client.zrem(f'rl:leases:{name}', lease_id)
+    
+    def extend(self, name, lease_id, expires):
+        self.client.zadd(f'rl:leases:{name}', {lease_id: expires}, xx=True)
+
+class SQLiteBucketStore:
+    """Token buckets and leases in a SQLite file shared by all workers on the host.
+    
+    Kept out of the main database so limiter writes never queue behind app
+    transactions. Each check is a single UPSERT, atomic under SQLite's write lock.
+    """
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+    
+    @property
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, ts REAL NOT NULL)')
+            conn.execute('CREATE TABLE IF NOT EXISTS leases (id TEXT PRIMARY KEY, name TEXT NOT NULL, expires REAL NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS leases_name ON leases (name, expires)')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+    
+    def consume(self, key, capacity, rate, cost, now):
+        conn = self.connection
+        if cost > capacity:
+            return False, 0.0
+        refilled = 'min(:capacity, tokens + max(0, :now - ts) * :rate)'
+        cursor = conn.execute(
+            f'INSERT INTO buckets (key, tokens, ts) VALUES (:key, :capacity - :cost, :now) '
+            f'ON CONFLICT(key) DO UPDATE SET tokens = {refilled} - :cost, ts = :now '
+            f'WHERE {refilled} >= :cost',
+            {'key': key, 'capacity': capacity, 'rate': rate, 'cost': cost, 'now': now},
+        )
+        if cursor.rowcount:
+            return True, None
+        row = conn.execute(
+            f'SELECT {refilled} FROM buckets WHERE key = :key',
+            {'key': key, 'capacity': capacity, 'rate': rate, 'now': now},
+        ).fetchone()
+        return False, row[0] if row else 0.0
+    
+    def acquire(self, name, limit, lease_id, now, ttl):
+        conn = self.connection
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM leases WHERE name = ? AND expires < ?', (name, now))
+            active = conn.execute('SELECT COUNT(*) FROM leases WHERE name = ?', (name,)).fetchone()[0]
+            acquired = active < limit
+            if acquired:
+                conn.execute('INSERT INTO leases (id, name, expires) VALUES (?, ?, ?)', (lease_id, name, now + ttl))
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return acquired
+    
+    def release(self, name, lease_id):
+        self.connection.execute('DELETE FROM leases WHERE id = ?', (lease_id,))
+    
+    def extend(self, name, lease_id, expires):
+        self.connection.execute('UPDATE leases SET expires = ? WHERE id = ?', (expires, lease_id))
+
+class RateLimiter:
+    """Weighted token buckets per client and scope, plus global concurrency caps.
+    
+    Buckets are configured in RATE_LIMIT_BUCKETS as scope -> (capacity, tokens/second)
+    and caps in RATE_LIMIT_CONCURRENCY as name -> max in-flight requests. State
+    lives in Redis when REDIS_URL is set, otherwise in RATE_LIMIT_SQLITE_PATH.
+    Store failures are logged and fail open.
+    """
+    def __init__(self):
+        self._store = None
+        self._lock = threading.Lock()
+    
+    @property
+    def store(self):
+        if self._store is None:
+            with self._lock:
+                if self._store is None:
+                    url = os.environ.get('REDIS_URL')
+                    if url and redis is not None:
+                        self._store = RedisBucketStore(url)
+                    else:
+                        self._store = SQLiteBucketStore(getattr(settings, 'RATE_LIMIT_SQLITE_PATH', 'ratelimit.sqlite3'))
+        return self._store
+    
+    def consume(self, scope, client, cost=1):
+        """Take cost tokens from the client's bucket; returns (allowed, retry_after_seconds)."""
+        capacity, rate = getattr(settings, 'RATE_LIMIT_BUCKETS', {}).get(scope, (60, 1.0))
+        try:
+            allowed, tokens = self.store.consume(f'{scope}:{client}', capacity, rate, cost, time.time())
+        except Exception as e:
+            logger.warning(f"Rate limit store unavailable, allowing request: {e}")
+            return True, 0
+        if allowed:
+            return True, 0
+        return False, max(1, int((cost - (tokens or 0)) / rate) + 1) if cost <= capacity else None
+    
+    @contextmanager
+    def concurrency(self, name):
+        """Hold one of RATE_LIMIT_CONCURRENCY[name] slots; yields False when all are taken.
+        
+        The lease expires RATE_LIMIT_LEASE_SECONDS after it is taken or last
+        extended, so a crashed worker cannot hold a slot forever.
+        """
+        limit = getattr(settings, 'RATE_LIMIT_CONCURRENCY', {}).get(name)
+        if not limit:
+            yield True
+            return
+        lease_id = uuid.uuid4().hex
+        ttl = self.lease_seconds
+        try:
+            acquired = self.store.acquire(name, limit, lease_id, time.time(), ttl)
+        except Exception as e:
+            logger.warning(f"Concurrency store unavailable, allowing request: {e}")
+            yield True
+            return
+        token = _lease.set((name, lease_id) if acquired else None)
+        try:
+            yield acquired
+        finally:
+            _lease.reset(token)
+            if acquired:
+                try:
+                    self.store.release(name, lease_id)
+                except Exception as e:
+                    logger.warning(f"Failed to release {name} lease, expires in {ttl}s: {e}")
+    
+    @property
+    def lease_seconds(self):
+        return getattr(settings, 'RATE_LIMIT_LEASE_SECONDS', 120)
+    
+    def extend_lease(self):
+        """Restart the TTL of the slot held by the current request; call before each slow upstream call."""
+        lease = _lease.get()
+        if lease is None:
+            return
+        try:
+            self.store.extend(*lease, time.time() + self.lease_seconds)
+        except Exception as e:
+            logger.warning(f"Failed to extend {lease[0]} lease: {e}")
+
+rate_limiter = RateLimiter()
+
+def client_key(request):
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return f"ip:{request.META.get('REMOTE_ADDR', '')}"
+
+def rate_limit(scope='default', cost=1, concurrency=None):
+    """Rate limit a DRF function view: 429 when the bucket is empty, 503 when the concurrency cap is full.
+    
+    The concurrency slot is taken before tokens are charged, so a request
+    turned away with 503 costs the client nothing.
+    """
+    def decorator(view):
+        def limited(request, *args, **kwargs):
+            allowed, retry_after = rate_limiter.consume(scope, client_key(request), cost)
+            if not allowed:
+                response = Response({'error': 'Rate limit exceeded'}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+                if retry_after:
+                    response['Retry-After'] = str(retry_after)
+                return response
+            return view(request, *args, **kwargs)
+        
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if concurrency is None:
+                return limited(request, *args, **kwargs)
+            with rate_limiter.concurrency(concurrency) as acquired:
+                if not acquired:
+                    response = Response({'error': 'AI service busy, try again shortly'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+                    response['Retry-After'] = '1'
+                    return response
+                return limited(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,65 @@
+import datetime
+import decimal
+import uuid
+from django.utils.functional import Promise
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_drf_encoder = JSONEncoder()
+
+def _default(obj):
+    """Types orjson does not serialize natively, plus datetimes passed through to match DRF."""
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        # orjson writes UTC as +00:00; DRF's encoder writes Z
+        return _drf_encoder.default(obj)
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, Promise):
+        return str(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if hasattr(obj, 'tolist'):  # numpy arrays/scalars from ai_services
+        return obj.tolist()
+    if hasattr(obj, '__iter__'):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+class ORJSONRenderer(BaseRenderer):
+    """JSON renderer backed by orjson; falls back to DRF's JSONRenderer if orjson is missing.
+    
+    UUIDs are serialized natively, Decimals as strings (matching DRF's
+    COERCE_DECIMAL_TO_STRING default) and datetimes the way DRF's encoder
+    writes them, so switching renderers does not change any response body.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None:
+            return JSONRenderer().render(data, accepted_media_type, renderer_context)
+        
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+        if accepted_media_type and 'indent' in accepted_media_type:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_default, option=option)
+
+class ORJSONParser(BaseParser):
+    media_type = 'application/json'
+    
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            from rest_framework.parsers import JSONParser
+            return JSONParser().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as e:
+            raise ParseError(f'JSON parse error - {e}')
@@ -0,0 +1,68 @@
+import contextvars
+import random
+import time
+from django.conf import settings
+
+# Set when the current request/task must read from the primary
+_pinned = contextvars.ContextVar('db_pinned', default=False)
+_wrote = contextvars.ContextVar('db_wrote', default=False)
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith('replica')]
+
+def pin_to_primary():
+    _pinned.set(True)
+
+class PrimaryReplicaRouter:
+    """Routes reads of REPLICA_READ_APPS to a random replica, everything else to default.
+    
+    After a request writes, its remaining reads and the same client's reads
+    for REPLICA_PIN_SECONDS (see ReplicaPinningMiddleware) stay on the
+    primary so users always see their own writes.
+    """
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if not replicas or _pinned.get():
+            return 'default'
+        if model._meta.app_label not in getattr(settings, 'REPLICA_READ_APPS', ()):
+            return 'default'
+        return random.choice(replicas)
+    
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        _pinned.set(True)
+        return 'default'
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas mirror the primary, so cross-alias relations are the same rows
+        return True
+    
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+class ReplicaPinningMiddleware:
+    """Keeps a client on the primary for a short window after it writes."""
+    COOKIE = 'db_pin'
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+    
+    def __call__(self, request):
+        pinned_token = _pinned.set(self.pinned_until(request) > time.time() or request.method not in ('GET', 'HEAD', 'OPTIONS'))
+        wrote_token = _wrote.set(False)
+        try:
+            response = self.get_response(request)
+            if _wrote.get():
+                response.set_cookie(self.COOKIE, str(time.time() + self.pin_seconds), max_age=self.pin_seconds, httponly=True, samesite='Lax')
+            return response
+        finally:
+            _pinned.reset(pinned_token)
+            _wrote.reset(wrote_token)
+    
+    def pinned_until(self, request):
+        # A malformed cookie counts as unpinned rather than failing the request
+        try:
+            return float(request.COOKIES.get(self.COOKIE) or 0)
+        except (TypeError, ValueError):
+            return 0
@@ -0,0 +1,7 @@
+from django.dispatch import Signal
+
+# Sent once per committed chunk of a bulk soft-delete/restore with
+# affected={model: [pk, ...]}, covering the queryset's model and every model
+# it cascaded to
+bulk_soft_deleted = Signal()
+bulk_restored = Signal()
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_explaining = ContextVar('explaining_slow_query', default=False)
+
+RE_STRING = re.compile(r"'(?:[^']|'')*'")
+RE_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+RE_PLACEHOLDER_LIST = re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)')
+RE_SPACE = re.compile(r'\s+')
+RE_FILTER_COLUMN = re.compile(r'"(\w+)"\."(\w+)"\s*(?:=|IN\b|>=?|<=?|LIKE\b|IS\b|BETWEEN\b)', re.IGNORECASE)
+RE_SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)', re.IGNORECASE)
+RE_PG_SEQ_SCAN = re.compile(r'Seq Scan on (\w+)')
+# Statements worth a plan; BEGIN IMMEDIATE, COMMIT, SAVEPOINT and PRAGMA are lock or
+# fsync waits, not slow queries
+QUERY_VERBS = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+# Hook modules between the recorder and the code that issued the query
+WRAPPER_MODULES = ('slowqueries.py', 'instrumentation.py')
+
+def normalize(sql):
+    """Replace literals and placeholder lists so queries differing only in values share a fingerprint."""
+    sql = RE_STRING.sub('?', sql)
+    sql = RE_NUMBER.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = RE_PLACEHOLDER_LIST.sub('(...)', sql)
+    return RE_SPACE.sub(' ', sql).strip()
+
+def fingerprint(sql):
+    return hashlib.md5(normalize(sql).encode(), usedforsecurity=False).hexdigest()[:16]
+
+def analyze_plan(vendor, plan):
+    """Tables read by full scans and whether a temp B-tree / sort was needed."""
+    scans, temp_btree = set(), False
+    for line in plan:
+        if vendor == 'sqlite':
+            # "SCAN t USING [COVERING] INDEX i" walks an index, not the table
+            match = RE_SQLITE_SCAN.match(line.strip())
+            if match and ' USING ' not in line.upper():
+                scans.add(match.group(1))
+            temp_btree = temp_btree or 'TEMP B-TREE' in line.upper()
+        else:
+            scans.update(RE_PG_SEQ_SCAN.findall(line))
+            temp_btree = temp_btree or line.strip().startswith(('Sort', '->  Sort'))
+    return sorted(scans), temp_btree
+
+def index_hints(sql, scanned_tables):
+    """Columns filtered on each fully scanned table, as candidate Meta.indexes fields."""
+    hints = {}
+    for table, column in RE_FILTER_COLUMN.findall(sql.split(' WHERE ', 1)[-1] if ' WHERE ' in sql else ''):
+        if table in scanned_tables and column not in hints.setdefault(table, []):
+            hints[table].append(column)
+    return hints
+
+def caller():
+    """First project frame (outside Django/DRF and this module) that issued the query."""
+    base = str(settings.BASE_DIR)
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(base) and 'site-packages' not in filename and not filename.endswith(WRAPPER_MODULES):
+            return f'{os.path.relpath(filename, base)}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+    return ''
+
+class SlowQueryRecorder:
+    """execute_wrapper that logs queries slower than SLOW_QUERY_THRESHOLD_MS with their plan.
+    
+    Installed per request by InstrumentationMiddleware; transaction control is
+    skipped. Plans are cached per fingerprint and every slow execution is
+    appended to SLOW_QUERY_LOG, which slow_query_report aggregates.
+    """
+    MAX_PLANS = 1000
+    
+    def __init__(self):
+        self._plans = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def threshold(self):
+        return getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 100) / 1000
+    
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        elapsed = time.perf_counter() - start
+        if elapsed >= self.threshold and not _explaining.get() and sql.lstrip()[:7].upper().startswith(QUERY_VERBS):
+            try:
+                self.record(sql, params, many, elapsed, context['connection'])
+            except Exception as e:
+                logger.warning(f"Slow query recording failed: {e}")
+        return result
+    
+    def record(self, sql, params, many, elapsed, connection):
+        key = fingerprint(sql)
+        with self._lock:
+            known = self._plans.get(key)
+        if known is None and not many and getattr(settings, 'SLOW_QUERY_EXPLAIN', True):
+            plan = self.explain(connection, sql, params)
+            scans, temp_btree = analyze_plan(connection.vendor, plan)
+            known = {'plan': plan, 'full_scans': scans, 'temp_btree': temp_btree, 'hints': index_hints(sql, scans)}
+            with self._lock:
+                if len(self._plans) < self.MAX_PLANS:
+                    self._plans[key] = known
+        
+        entry = {
+            'at': timezone.now().isoformat(),
+            'fingerprint': key,
+            'ms': round(elapsed * 1000, 2),
+            'alias': connection.alias,
+            'vendor': connection.vendor,
+            'caller': caller(),
+            'sql': normalize(sql),
+            **(known or {}),
+        }
+        with self._lock:
+            stats = self._stats.setdefault(key, {'sql': entry['sql'], 'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            stats['calls'] += 1
+            stats['total_ms'] += entry['ms']
+            stats['max_ms'] = max(stats['max_ms'], entry['ms'])
+            if known:
+                stats.update(known)
+            path = getattr(settings, 'SLOW_QUERY_LOG', None)
+            if path:
+                with open(path, 'a') as f:
+                    f.write(json.dumps(entry) + '\n')
+        scans = ', '.join(entry.get('full_scans', [])) or 'none'
+        logger.warning(f"Slow query {key} took {entry['ms']}ms (full scans: {scans}) from {entry['caller'] or 'unknown'}")
+    
+    def explain(self, connection, sql, params):
+        if not sql.lstrip().upper().startswith(('SELECT', 'WITH', 'UPDATE', 'DELETE')):
+            return []
+        prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+        token = _explaining.set(True)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(prefix + sql, params)
+                rows = cursor.fetchall()
+        except Exception as e:
+            logger.warning(f"EXPLAIN failed: {e}")
+            return []
+        finally:
+            _explaining.reset(token)
+        # SQLite rows are (id, parent, notused, detail); Postgres returns one text column
+        return [row[-1] for row in rows]
+    
+    def snapshot(self):
+        """This process's slow queries by fingerprint, slowest total first."""
+        with self._lock:
+            stats = {key: dict(value) for key, value in self._stats.items()}
+        return sorted(({'fingerprint': key, **value} for key, value in stats.items()), key=lambda s: -s['total_ms'])
+
+slow_query_recorder = SlowQueryRecorder()
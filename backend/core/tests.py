@@ -0,0 +1,411 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import warnings
+from datetime import timedelta
+from unittest import mock
+from django.conf import settings
+from django.db import connection, connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from authentication.models import User
+from companies.models import Company
+from jobs.models import Job, JobView
+from messaging.inbox import inbox_service
+from messaging.models import Conversation, InboxEntry, Message
+from social.graph import connection_graph
+from social.models import Comment, Connection, FeedEntry, Post
+from .archive import archive_service
+from .benchmarks import compare
+from .instrumentation import record_query, wrap_queries
+from .metrics import CACHE_REQUESTS, registry
+from .profiling import SamplingProfiler
+from .models import ArchivedRecord, ModelVersion
+from .ratelimit import SQLiteBucketStore, rate_limit, rate_limiter
+from .renderers import ORJSONRenderer
+from .signals import bulk_soft_deleted
+from .slowqueries import slow_query_recorder
+
+def make_user(name, **extra):
+    return User.objects.create(username=name, email=f'{name}@example.com', **extra)
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.author = make_user('author')
+        self.post = Post.objects.create(author=self.author, content='hello')
+        self.comments = [Comment.objects.create(post=self.post, author=self.author, content=str(i)) for i in range(3)]
+        Post.all_objects.filter(pk=self.post.pk).soft_delete()
+    
+    def archive(self):
+        return archive_service.archive_model(Post, cutoff=timezone.now() + timedelta(seconds=1))
+    
+    def test_rows_with_live_dependents_are_kept(self):
+        Comment.all_objects.get(pk=self.comments[0].pk).restore()
+        self.assertEqual(self.archive(), 0)
+        self.assertTrue(Post.all_objects.filter(pk=self.post.pk).exists())
+        self.assertTrue(Comment.objects.filter(pk=self.comments[0].pk).exists())
+        self.assertFalse(ArchivedRecord.objects.exists())
+    
+    def test_restore_brings_back_rows_archived_alongside(self):
+        self.assertEqual(self.archive(), 1)
+        self.assertFalse(Comment.all_objects.filter(post_id=self.post.pk).exists())
+        
+        archive_service.restore('social.Post', self.post.pk)
+        self.assertEqual(Comment.all_objects.filter(post_id=self.post.pk, is_deleted=True).count(), 3)
+        self.assertTrue(Post.all_objects.filter(pk=self.post.pk, is_deleted=True).exists())
+        self.assertFalse(ArchivedRecord.objects.exists())
+    
+    def test_restored_post_is_not_fanned_out(self):
+        reader = make_user('reader')
+        with self.captureOnCommitCallbacks(execute=True):
+            Connection.objects.create(from_user=self.author, to_user=reader, status='accepted')
+        self.archive()
+        with self.captureOnCommitCallbacks(execute=True):
+            archive_service.restore('social.Post', self.post.pk)
+        self.assertFalse(FeedEntry.objects.filter(post_id=self.post.pk).exists())
+        self.assertTrue(Post.all_objects.get(pk=self.post.pk).is_deleted)
+    
+    def test_restored_message_is_not_delivered_again(self):
+        reader = make_user('reader')
+        conversation = Conversation.objects.create()
+        conversation.participants.add(self.author, reader)
+        with self.captureOnCommitCallbacks(execute=True):
+            message = Message.objects.create(conversation=conversation, sender=self.author, content='hi')
+        message.soft_delete()
+        unread = InboxEntry.objects.get(user=reader, conversation=conversation).unread_count
+        archive_service.archive_model(Message, cutoff=timezone.now() + timedelta(seconds=1))
+        with mock.patch('messaging.signals.push_to_users') as push, self.captureOnCommitCallbacks(execute=True):
+            archive_service.restore('messaging.Message', message.pk)
+        push.assert_not_called()
+        self.assertTrue(Message.all_objects.filter(pk=message.pk, is_deleted=True).exists())
+        self.assertEqual(InboxEntry.objects.get(user=reader, conversation=conversation).unread_count, unread)
+
+class BulkSoftDeleteTests(TestCase):
+    def setUp(self):
+        self.alice, self.bob = make_user('alice'), make_user('bob')
+    
+    def test_restore_requires_all_objects(self):
+        Post.objects.create(author=self.alice, content='hello').soft_delete()
+        with self.assertRaises(TypeError):
+            Post.objects.filter(author=self.alice).restore()
+        self.assertEqual(Post.all_objects.filter(author=self.alice).restore(), {Post: 1})
+    
+    def test_each_chunk_commits_and_signals(self):
+        Post.objects.bulk_create([Post(author=self.alice, content=str(i)) for i in range(5)])
+        chunks = []
+        def receiver(sender, affected, **kwargs):
+            chunks.append(len(affected[Post]))
+        bulk_soft_deleted.connect(receiver)
+        try:
+            with self.captureOnCommitCallbacks(execute=True):
+                counts = Post.all_objects.filter(author=self.alice).soft_delete(chunk_size=2)
+        finally:
+            bulk_soft_deleted.disconnect(receiver)
+        self.assertEqual(counts[Post], 5)
+        self.assertEqual(chunks, [2, 2, 1])
+    
+    def test_connection_bulk_delete_updates_the_graph(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            connection = Connection.objects.create(from_user=self.alice, to_user=self.bob, status='accepted')
+        self.assertEqual(list(connection_graph.neighbors(self.alice.pk)), [self.bob.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            Connection.all_objects.filter(pk=connection.pk).soft_delete()
+        self.assertEqual(list(connection_graph.neighbors(self.alice.pk)), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            Connection.all_objects.filter(pk=connection.pk).restore()
+        self.assertEqual(list(connection_graph.neighbors(self.alice.pk)), [self.bob.pk])
+    
+    def test_conversation_bulk_delete_updates_the_inbox(self):
+        conversation = Conversation.objects.create()
+        conversation.participants.add(self.alice, self.bob)
+        with self.captureOnCommitCallbacks(execute=True):
+            Message.objects.create(conversation=conversation, sender=self.alice, content='hi')
+        self.assertEqual(inbox_service.get_unread_total(self.bob), 1)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Conversation.all_objects.filter(pk=conversation.pk).soft_delete()
+        self.assertEqual(inbox_service.get_unread_total(self.bob), 0)
+        self.assertEqual(inbox_service.get_inbox(self.bob), [])
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Conversation.all_objects.filter(pk=conversation.pk).restore()
+        self.assertEqual(inbox_service.get_unread_total(self.bob), 1)
+        self.assertEqual(len(inbox_service.get_inbox(self.bob)), 1)
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """Primary and replica are two SQLite files; the replica is a snapshot missing later writes."""
+    def setUp(self):
+        Company.objects.create(name='Replicated', description='', industry='Software', size='1-10', location='Remote')
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        replica_path = os.path.join(directory, 'replica.sqlite3')
+        connection.ensure_connection()
+        with sqlite3.connect(replica_path) as replica:
+            connection.connection.backup(replica)
+        replica.close()
+        Company.objects.create(name='Primary only', description='', industry='Software', size='1-10', location='Remote')
+        
+        connections.settings['replica_0'] = dict(connections.settings['default'], NAME=replica_path)
+        self.addCleanup(self.drop_replica)
+        databases = override_settings(DATABASES={**connections.settings})
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            databases.enable()
+        self.addCleanup(databases.disable)
+        
+        self.recruiter = make_user('recruiter', role='recruiter')
+        self.client = APIClient()
+    
+    def drop_replica(self):
+        connections['replica_0'].close()
+        del connections['replica_0']
+        del connections.settings['replica_0']
+    
+    def get(self, path, **cookies):
+        for name, value in cookies.items():
+            self.client.cookies[name] = value
+        return self.client.get(path)
+    
+    def test_reads_go_to_the_replica_until_the_client_writes(self):
+        self.client.force_authenticate(self.recruiter)
+        response = self.client.post('/api/companies/', {
+            'name': 'Fresh', 'description': 'Hiring', 'industry': 'Software', 'size': '1-10', 'location': 'Remote',
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('db_pin', response.cookies)
+        fresh = f"/api/companies/{response.data['id']}/"
+        self.assertEqual(self.get(fresh).status_code, 200)
+        self.assertEqual(self.get(fresh, db_pin='0').status_code, 404)
+    
+    def test_malformed_pin_cookie_reads_the_replica(self):
+        response = self.get('/api/companies/', db_pin='garbage')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([company['name'] for company in response.data], ['Replicated'])
+
+class RendererTests(SimpleTestCase):
+    def test_orjson_matches_drf_datetimes(self):
+        now = timezone.now()
+        payload = {'at': now, 'on': now.date(), 'nested': [{'at': now.replace(microsecond=0)}]}
+        self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+        self.assertTrue(ORJSONRenderer().render({'at': now}).endswith(b'Z"}'))
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_user('recruiter', role='recruiter')
+        self.company = Company.objects.create(name='Acme', description='', industry='Software', size='1-10', location='Remote')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job = Job.objects.create(
+                title='Engineer', description='', requirements='', company=self.company, posted_by=self.recruiter,
+                location='Remote', job_type='full_time', experience_level='mid',
+            )
+        self.client = APIClient()
+    
+    def etag(self, path='/api/jobs/', **params):
+        return self.client.get(path, params)['ETag']
+    
+    def test_query_string_is_part_of_the_etag(self):
+        self.assertNotEqual(self.etag(), self.etag(ordering='salary_min'))
+        self.assertNotEqual(self.etag(search='engineer'), self.etag(search='designer'))
+    
+    def test_new_viewer_changes_the_etag_and_views_count(self):
+        before = self.etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            detail = self.client.get(f'/api/jobs/{self.job.pk}/')
+        self.assertEqual(detail.data['views_count'], 1)
+        # The same viewer again reuses their JobView row, so the detail stays cacheable
+        etag = self.etag(f'/api/jobs/{self.job.pk}/')
+        repeat = self.client.get(f'/api/jobs/{self.job.pk}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(repeat.status_code, 304)
+        
+        listing = self.client.get('/api/jobs/', HTTP_IF_NONE_MATCH=before)
+        self.assertEqual(listing.status_code, 200)
+        self.assertEqual(listing.data[0]['views_count'], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            JobView.objects.create(job=self.job, ip_address='10.0.0.2')
+        self.assertEqual(self.client.get('/api/jobs/', HTTP_IF_NONE_MATCH=listing['ETag']).status_code, 200)
+    
+    def test_job_list_counts_are_annotated(self):
+        for i in range(3):
+            Job.objects.create(
+                title=f'Engineer {i}', description='', requirements='', company=self.company, posted_by=self.recruiter,
+                location='Remote', job_type='full_time', experience_level='mid',
+            )
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/jobs/')
+        self.assertEqual([job['applications_count'] for job in response.data], [0] * 4)
+    
+    def test_dependency_changes_are_shared_through_the_database(self):
+        before = self.etag(f'/api/companies/{self.company.pk}/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.title = 'Senior Engineer'
+            self.job.save()
+        self.assertEqual(ModelVersion.objects.get(label='jobs.job').version, 2)
+        self.assertNotEqual(self.etag(f'/api/companies/{self.company.pk}/'), before)
+
+@override_settings(RATE_LIMIT_CONCURRENCY={'ai': 1})
+class RateLimitTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.store = SQLiteBucketStore(os.path.join(directory, 'ratelimit.sqlite3'))
+        patcher = mock.patch.object(rate_limiter, '_store', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.view = rate_limit('ai', cost=6, concurrency='ai')(lambda request: 'ok')
+        self.request = RequestFactory().get('/')
+        self.request.user = mock.Mock(is_authenticated=False)
+    
+    def lease_expiry(self):
+        return self.store.connection.execute('SELECT expires FROM leases').fetchone()[0]
+    
+    def test_busy_response_spends_no_tokens(self):
+        with rate_limiter.concurrency('ai'):
+            response = self.view(self.request)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.store.connection.execute('SELECT COUNT(*) FROM buckets').fetchone()[0], 0)
+        self.assertEqual(self.view(self.request), 'ok')
+    
+    def test_lease_outlives_a_client_timeout_and_is_extended(self):
+        self.assertGreater(settings.RATE_LIMIT_LEASE_SECONDS, settings.OPENAI_REQUEST_TIMEOUT)
+        with rate_limiter.concurrency('ai'):
+            first = self.lease_expiry()
+            with mock.patch('core.ratelimit.time.time', return_value=first):
+                rate_limiter.extend_lease()
+            self.assertEqual(self.lease_expiry(), first + rate_limiter.lease_seconds)
+        rate_limiter.extend_lease()
+
+class BenchmarkCompareTests(SimpleTestCase):
+    def test_growth_from_zero_regresses(self):
+        run = {'p50_ms': 1.0, 'p95_ms': 2.0, 'p99_ms': 3.0, 'throughput': 100.0, 'queries': 0.0}
+        report = compare({'job_list': dict(run, queries=3.0)}, {'job_list': run})
+        self.assertEqual(report['job_list']['queries'], float('inf'))
+        self.assertTrue(report['job_list']['regressed'])
+        self.assertFalse(compare({'job_list': run}, {'job_list': run})['job_list']['regressed'])
+
+class InstrumentationTests(SimpleTestCase):
+    def test_type_lines_name_the_counter_samples(self):
+        CACHE_REQUESTS.inc(result='hit')
+        lines = registry.render().splitlines()
+        self.assertIn('# TYPE careeropen_cache_requests_total counter', lines)
+        self.assertIn('careeropen_cache_requests_total{result="hit"}', [line.rsplit(' ', 1)[0] for line in lines])
+    
+    def test_wrap_queries_removes_its_own_wrapper(self):
+        other = lambda execute, sql, params, many, context: execute(sql, params, many, context)
+        before = list(connection.execute_wrappers)
+        with wrap_queries(connection, record_query):
+            connection.execute_wrappers.append(other)
+        self.assertEqual(connection.execute_wrappers, before + [other])
+        connection.execute_wrappers.remove(other)
+
+class InstrumentationLogTests(TestCase):
+    def setUp(self):
+        self.user = make_user('reader')
+    
+    def get_companies(self):
+        # A fresh client builds its middleware under the current settings
+        client = APIClient()
+        client.force_authenticate(self.user)
+        return client.get('/api/companies/')
+    
+    @override_settings(INSTRUMENTATION_LOG_MIN_MS=0)
+    def test_slow_request_logs_a_json_line(self):
+        with self.assertLogs('core.middleware', 'INFO') as logs:
+            self.assertEqual(self.get_companies().status_code, 200)
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(logs.records[-1].levelname, 'INFO')
+        self.assertEqual((record['method'], record['route'], record['status']), ('GET', 'api/companies/', 200))
+        self.assertGreater(record['db_queries'], 0)
+        self.assertGreaterEqual(record['duration_ms'], record['db_ms'])
+        self.assertTrue({'cache_hits', 'cache_misses'} <= set(record))
+    
+    @override_settings(INSTRUMENTATION_LOG_MIN_MS=60000)
+    def test_fast_request_is_not_logged_at_info(self):
+        with self.assertNoLogs('core.middleware', 'INFO'):
+            self.assertEqual(self.get_companies().status_code, 200)
+
+class ProfilerTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        overrides = override_settings(
+            PROFILER_DIR=self.directory, PROFILER_INTERVAL=0.001,
+            PROFILER_MAX_FILES=2, PROFILER_MAX_STACKS=3, PROFILER_FLUSH_SECONDS=0,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.profiler = SamplingProfiler()
+    
+    def profile_request(self):
+        session = self.profiler.start('api/jobs/')
+        deadline = time.perf_counter() + 0.03
+        while time.perf_counter() < deadline:
+            pass
+        return self.profiler.stop(session)
+    
+    def wait_for(self, path):
+        deadline = time.monotonic() + 5
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return path.exists()
+    
+    def test_files_are_written_off_the_request_thread_and_capped(self):
+        writers = []
+        write = self.profiler._write
+        self.profiler._write = lambda session: writers.append(threading.get_ident()) or write(session)
+        paths = [self.profile_request() for _ in range(4)]
+        self.assertTrue(self.wait_for(paths[-1]))
+        aggregate = paths[-1].parent / f'aggregate.{os.getpid()}.collapsed'
+        self.assertTrue(self.wait_for(aggregate))
+        self.assertNotIn(threading.get_ident(), writers)
+        self.assertEqual(sorted(paths[-1].parent.glob('*-*.collapsed')), sorted(paths[-2:]))
+        self.assertLessEqual(len(self.profiler._aggregates['api/jobs/']), 3)
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_LOG=None)
+class SlowQueryTests(TransactionTestCase):
+    def test_reconnects_do_not_grow_execute_wrappers(self):
+        user = make_user('reader')
+        client = APIClient()
+        client.force_authenticate(user)
+        before = list(connection.execute_wrappers)
+        with mock.patch.object(slow_query_recorder, 'record') as record:
+            for _ in range(5):
+                self.assertEqual(client.get('/api/companies/').status_code, 200)
+                connections.close_all()
+                self.assertEqual(connection.execute_wrappers, before)
+        self.assertTrue(record.called)
+    
+    def test_transaction_control_is_not_a_slow_query(self):
+        with mock.patch.object(slow_query_recorder, 'record') as record:
+            for sql in ('BEGIN IMMEDIATE', 'COMMIT', 'SAVEPOINT "s1"', '  select 1'):
+                slow_query_recorder(lambda *args: None, sql, None, False, {'connection': connection})
+        self.assertEqual([call.args[0] for call in record.call_args_list], ['  select 1'])
+    
+    def test_slow_query_is_logged_with_its_plan(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'slow_queries.jsonl')
+        with override_settings(SLOW_QUERY_LOG=path), self.assertLogs('core.slowqueries', 'WARNING') as logs:
+            with wrap_queries(connection, slow_query_recorder):
+                list(Company.objects.filter(industry='Software'))
+        with open(path) as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual(len(entries), 1)
+        entry = entries[0]
+        self.assertTrue(entry['sql'].startswith('SELECT '))
+        self.assertIn('"companies_company"."industry" = ?', entry['sql'])
+        self.assertGreaterEqual(entry['ms'], 0)
+        self.assertEqual((entry['alias'], entry['vendor']), ('default', 'sqlite'))
+        self.assertTrue(entry['caller'].startswith('core/tests.py:'))
+        self.assertTrue(entry['plan'])
+        self.assertEqual(entry['full_scans'], ['companies_company'])
+        self.assertEqual(entry['hints'], {'companies_company': ['industry']})
+        self.assertIn(f"Slow query {entry['fingerprint']}", logs.output[0])
+        stats = {s['fingerprint']: s for s in slow_query_recorder.snapshot()}[entry['fingerprint']]
+        self.assertGreaterEqual(stats['calls'], 1)
+        self.assertEqual(stats['sql'], entry['sql'])
@@ -0,0 +1,18 @@
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from .metrics import registry
+from .slowqueries import slow_query_recorder
+from .permissions import IsAdmin
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def metrics(request):
+    """Prometheus text exposition of this worker's metrics registry."""
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def slow_queries(request):
+    """Slow queries seen by this worker, grouped by fingerprint."""
+    return Response(slow_query_recorder.snapshot())
@@ -0,0 +1,144 @@
+import logging
+import operator
+import re
+from collections import defaultdict
+from functools import reduce
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import JobAlertMatch, SavedSearch, SavedSearchTerm
+
+logger = logging.getLogger(__name__)
+
+class JobAlertService:
+    """Percolator-style matching of new jobs against saved searches.
+    
+    Each saved search is indexed under terms a matching job must contain:
+    every skill (skills are any-of) or else a single required anchor. A new
+    job looks up candidate searches by its own terms in one query, and only
+    those candidates are checked in full.
+    """
+    def __init__(self):
+        self.semantic_threshold = getattr(settings, 'JOB_ALERT_SEMANTIC_THRESHOLD', 0.45)
+    
+    def index_search(self, saved_search):
+        """Rebuild the reverse-index rows for one saved search."""
+        with transaction.atomic():
+            SavedSearchTerm.objects.filter(saved_search=saved_search).delete()
+            SavedSearchTerm.objects.bulk_create([
+                SavedSearchTerm(saved_search=saved_search, kind=kind, term=term)
+                for kind, term in self._search_terms(saved_search)
+            ])
+    
+    def match_job(self, job):
+        """Record JobAlertMatch rows for every saved search the job satisfies."""
+        lookup = reduce(operator.or_, (Q(kind=kind, term__in=terms) for kind, terms in self._job_terms(job).items()))
+        candidate_ids = set(SavedSearchTerm.objects.filter(lookup).values_list('saved_search_id', flat=True))
+        if not candidate_ids:
+            return []
+        
+        candidates = SavedSearch.objects.filter(id__in=candidate_ids).exclude(user_id=job.posted_by_id)
+        text = self._text(job)
+        matched = [search for search in candidates if self._matches_filters(search, job, text)]
+        matched = self._apply_semantic(matched, job)
+        
+        JobAlertMatch.objects.bulk_create(
+            [JobAlertMatch(saved_search=search, job=job, user_id=search.user_id) for search in matched],
+            ignore_conflicts=True,
+        )
+        return matched
+    
+    def send_digests(self):
+        """One job_match notification per user covering all pending matches."""
+        from notifications.pipeline import notification_pipeline
+        
+        pending = JobAlertMatch.objects.filter(notified_at__isnull=True)
+        per_user = defaultdict(set)
+        match_ids = []
+        for match_id, user_id, job_id in pending.values_list('id', 'user_id', 'job_id').iterator():
+            per_user[user_id].add(job_id)
+            match_ids.append(match_id)
+        
+        # Users with the same count share a message, so publish once per count
+        by_count = defaultdict(list)
+        for user_id, job_ids in per_user.items():
+            by_count[len(job_ids)].append(user_id)
+        for count, user_ids in by_count.items():
+            verb = f"{count} new job{'s' if count > 1 else ''} match your saved searches"
+            notification_pipeline.publish('job_match', user_ids, verb, title='New job matches')
+        
+        for start in range(0, len(match_ids), 1000):
+            JobAlertMatch.objects.filter(id__in=match_ids[start:start + 1000]).update(notified_at=timezone.now())
+        return len(per_user)
+    
+    def _search_terms(self, search):
+        skills = {s.strip().lower() for s in search.skills if s.strip()}
+        if skills:
+            return [('skill', s) for s in skills]
+        keywords = self._phrases(search.keywords)
+        if keywords:
+            # Job keyword terms are single words, so a phrase is anchored on its first word
+            return [('keyword', keywords[0].split()[0])]
+        if search.job_type:
+            return [('job_type', search.job_type)]
+        if search.experience_level:
+            return [('experience_level', search.experience_level)]
+        return [('any', '*')]
+    
+    def _job_terms(self, job):
+        return {
+            'skill': {s.strip().lower() for s in job.skills_required if s.strip()},
+            'keyword': set(self._words(f"{job.title} {job.description}")),
+            'job_type': {job.job_type},
+            'experience_level': {job.experience_level},
+            'any': {'*'},
+        }
+    
+    def _words(self, text):
+        # Dots stay inside words (node.js, .net) but not at the end of a sentence
+        words = (word.rstrip('.') for word in re.findall(r'[a-z0-9+#.]+', text.lower()))
+        return [word for word in words if word]
+    
+    def _phrases(self, keywords):
+        """Saved-search keywords normalized to space-joined words, e.g. 'machine learning'."""
+        phrases = (' '.join(self._words(keyword)) for keyword in keywords)
+        return [phrase for phrase in phrases if phrase]
+    
+    def _text(self, job):
+        """The job's words, space-padded so phrases match on word boundaries."""
+        return f" {' '.join(self._words(f'{job.title} {job.description}'))} "
+    
+    def _matches_filters(self, search, job, text):
+        if search.job_type and search.job_type != job.job_type:
+            return False
+        if search.experience_level and search.experience_level != job.experience_level:
+            return False
+        if search.location and search.location.lower() not in job.location.lower():
+            return False
+        if search.salary_min and job.salary_max is not None and job.salary_max < search.salary_min:
+            return False
+        skills = {s.strip().lower() for s in search.skills}
+        if skills and not skills & {s.strip().lower() for s in job.skills_required}:
+            return False
+        return all(f' {phrase} ' in text for phrase in self._phrases(search.keywords))
+    
+    def _apply_semantic(self, searches, job):
+        """Drop searches whose semantic_query is too far from the job, with one batch encode."""
+        from ai_services.embeddings import cosine_similarity, embedding_service
+        
+        semantic = [s for s in searches if s.semantic_query]
+        if not semantic or not embedding_service.is_loaded:
+            return searches
+        
+        job_text = f"{job.title} {job.description} {' '.join(job.skills_required)}"
+        embeddings = embedding_service.encode_texts([job_text] + [s.semantic_query for s in semantic])
+        if embeddings is None:
+            return searches
+        
+        scores = cosine_similarity([embeddings[0]], embeddings[1:])[0]
+        rejected = {search.pk for search, score in zip(semantic, scores) if score < self.semantic_threshold}
+        return [s for s in searches if s.pk not in rejected]
+
+# Global instance
+job_alert_service = JobAlertService()
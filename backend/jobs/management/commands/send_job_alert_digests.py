@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from jobs.alerts import job_alert_service
+
+class Command(BaseCommand):
+    help = 'Send one job_match digest notification per user for pending saved-search matches.'
+    
+    def handle(self, *args, **options):
+        users = job_alert_service.send_digests()
+        self.stdout.write(self.style.SUCCESS(f'Sent job alert digests to {users} users'))
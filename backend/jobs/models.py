@@ -1,5 +1,5 @@
 from django.db import models
-from core.models import BaseModel
+from core.models import BaseModel, DELETED_ROWS, LIVE_ROWS
 from authentication.models import User
 from companies.models import Company
 
@@ -31,17 +31,43 @@ class Job(BaseModel):
     is_published = models.BooleanField(default=True, db_index=True)
     expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
     
+    soft_delete_cascade = ['views', 'applications']
+    
     class Meta:
         indexes = [
-            models.Index(fields=['company', 'is_published', 'created_at']),
+            models.Index(fields=['company', 'is_published', 'created_at'], condition=LIVE_ROWS, name='job_company_live_idx'),
+            models.Index(fields=['-created_at'], condition=LIVE_ROWS & models.Q(is_published=True), name='job_published_recent_idx'),
             models.Index(fields=['job_type', 'experience_level']),
-            models.Index(fields=['location', 'is_published']),
+            models.Index(fields=['location', 'is_published'], condition=LIVE_ROWS, name='job_location_live_idx'),
             models.Index(fields=['salary_min', 'salary_max']),
-            models.Index(fields=['expires_at', 'is_published']),
+            models.Index(fields=['expires_at', 'is_published'], condition=LIVE_ROWS, name='job_expires_live_idx'),
+            models.Index(fields=['deleted_at'], condition=DELETED_ROWS, name='job_purge_idx'),
         ]
     
     def __str__(self):
         return f"{self.title} at {self.company.name}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_state = instance.tracked_state()
+        return instance
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # post_save receivers diff against _saved_state; advance it once they have run
+        self._saved_state = self.tracked_state()
+    
+    def tracked_state(self):
+        """(company_id, is_published, is_deleted) for save-time diffs, or None if any is deferred.
+        
+        Job alerts and company open-job counters compare against this snapshot.
+        It is taken in from_db() rather than a post_init receiver, so building
+        Job instances costs nothing extra.
+        """
+        if self.get_deferred_fields() & {'company_id', 'is_published', 'is_deleted'}:
+            return None
+        return (self.company_id, self.is_published, self.is_deleted)
 
 class JobView(BaseModel):
     """Track job views for analytics."""
@@ -50,4 +76,47 @@ class JobView(BaseModel):
     ip_address = models.GenericIPAddressField()
     
     class Meta:
-        unique_together = ['job', 'user', 'ip_address']
\ No newline at end of file
+        unique_together = ['job', 'user', 'ip_address']
+
+class SavedSearch(BaseModel):
+    """A candidate's saved job search, matched against new postings."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField(max_length=200, blank=True)
+    keywords = models.JSONField(default=list)
+    skills = models.JSONField(default=list)
+    job_type = models.CharField(max_length=50, blank=True)
+    experience_level = models.CharField(max_length=50, blank=True)
+    location = models.CharField(max_length=200, blank=True)
+    salary_min = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    semantic_query = models.TextField(blank=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+        ]
+
+class SavedSearchTerm(models.Model):
+    """Reverse index from job terms to the saved searches that require them."""
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='terms')
+    kind = models.CharField(max_length=20)
+    term = models.CharField(max_length=200)
+    
+    class Meta:
+        unique_together = ['saved_search', 'kind', 'term']
+        indexes = [
+            models.Index(fields=['kind', 'term']),
+        ]
+
+class JobAlertMatch(models.Model):
+    """A job matched to a saved search, waiting for the user's next digest."""
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='matches')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='alert_matches')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_alert_matches')
+    created_at = models.DateTimeField(auto_now_add=True)
+    notified_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        unique_together = ['saved_search', 'job']
+        indexes = [
+            models.Index(fields=['notified_at', 'user']),
+        ]
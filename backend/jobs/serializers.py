@@ -1,7 +1,14 @@
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
-from .models import Job, JobView
+from .models import Job, JobView, SavedSearch
+from applications.models import Application
 from companies.serializers import CompanySerializer
 
+def _count_per_job(model):
+    rows = model.objects.filter(job=OuterRef('pk')).order_by().values('job').annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(rows), 0)
+
 class JobSerializer(serializers.ModelSerializer):
     company = CompanySerializer(read_only=True)
     posted_by = serializers.StringRelatedField(read_only=True)
@@ -13,13 +20,32 @@ class JobSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['posted_by', 'created_at', 'updated_at']
     
+    @staticmethod
+    def with_counts(queryset):
+        """Annotate the counts this serializer shows, one subquery each instead of two queries per job."""
+        return queryset.annotate(
+            applications_total=_count_per_job(Application),
+            views_total=_count_per_job(JobView),
+        )
+    
     def get_applications_count(self, obj):
-        return obj.applications.count()
+        total = getattr(obj, 'applications_total', None)
+        return obj.applications.count() if total is None else total
     
     def get_views_count(self, obj):
-        return obj.views.count()
+        total = getattr(obj, 'views_total', None)
+        return obj.views.count() if total is None else total
 
 class JobCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Job
-        exclude = ['posted_by', 'created_at', 'updated_at']
\ No newline at end of file
+        exclude = ['posted_by', 'created_at', 'updated_at']
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    keywords = serializers.ListField(child=serializers.CharField(max_length=200), required=False)
+    skills = serializers.ListField(child=serializers.CharField(max_length=200), required=False)
+    
+    class Meta:
+        model = SavedSearch
+        fields = ['id', 'name', 'keywords', 'skills', 'job_type', 'experience_level', 'location', 'salary_min', 'semantic_query', 'created_at']
+        read_only_fields = ['created_at']
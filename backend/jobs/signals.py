@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .alerts import job_alert_service
+from .models import Job, SavedSearch
+
+@receiver(post_save, sender=Job)
+def match_newly_published_job(sender, instance, created, **kwargs):
+    """Percolate a job against saved searches the first time it goes live."""
+    state = getattr(instance, '_saved_state', None)
+    was_published = False if created else state and state[1]
+    if instance.is_published and was_published is False and not instance.is_deleted:
+        transaction.on_commit(lambda: job_alert_service.match_job(instance))
+
+@receiver(post_save, sender=SavedSearch)
+def index_saved_search(sender, instance, **kwargs):
+    job_alert_service.index_search(instance)
@@ -0,0 +1,40 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from authentication.models import User
+from companies.models import Company
+from .alerts import job_alert_service
+from .models import Job, SavedSearch
+
+class JobAlertTests(TestCase):
+    def setUp(self):
+        self.candidate = User.objects.create(username='candidate', email='candidate@example.com')
+        self.recruiter = User.objects.create(username='recruiter', email='recruiter@example.com', role='recruiter')
+        self.company = Company.objects.create(name='Acme', description='', industry='Software', size='1-10', location='Remote')
+    
+    def make_job(self, title, description=''):
+        return Job.objects.create(
+            title=title, description=description, requirements='', company=self.company, posted_by=self.recruiter,
+            location='Remote', job_type='full_time', experience_level='mid', is_published=False,
+        )
+    
+    def matches(self, job, **search):
+        saved = SavedSearch.objects.create(user=self.candidate, **search)
+        return saved in job_alert_service.match_job(job)
+    
+    def test_trailing_dots_do_not_hide_keywords(self):
+        job = self.make_job('Backend engineer', 'We use Python. Also node.js.')
+        self.assertTrue(self.matches(job, keywords=['python', 'node.js']))
+    
+    def test_phrases_match_consecutive_words(self):
+        job = self.make_job('Machine Learning Engineer')
+        self.assertTrue(self.matches(job, keywords=['machine learning']))
+        self.assertFalse(self.matches(self.make_job('Learning machine operator'), keywords=['machine learning']))
+    
+    def test_serializer_requires_lists_of_strings(self):
+        client = APIClient()
+        client.force_authenticate(self.candidate)
+        for payload in ({'keywords': 'python'}, {'skills': [{'name': 'python'}]}, {'keywords': [None]}):
+            response = client.post('/api/jobs/saved-searches/', payload, format='json')
+            self.assertEqual(response.status_code, 400, payload)
+        response = client.post('/api/jobs/saved-searches/', {'keywords': ['machine learning']}, format='json')
+        self.assertEqual(response.status_code, 201)
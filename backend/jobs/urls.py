@@ -4,4 +4,6 @@ from . import views
 urlpatterns = [
     path('', views.JobListCreateView.as_view(), name='job-list-create'),
     path('<uuid:pk>/', views.JobDetailView.as_view(), name='job-detail'),
+    path('saved-searches/', views.SavedSearchListCreateView.as_view(), name='saved-search-list-create'),
+    path('saved-searches/<uuid:pk>/', views.SavedSearchDetailView.as_view(), name='saved-search-detail'),
 ]
\ No newline at end of file
@@ -1,15 +1,17 @@
 from rest_framework import generics, filters, permissions
 from rest_framework.decorators import api_view
-from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Job, JobView
-from .serializers import JobSerializer, JobCreateSerializer
+from .models import Job, JobView, SavedSearch
+from .serializers import JobSerializer, JobCreateSerializer, SavedSearchSerializer
+from core.conditional import ConditionalGetMixin
+from core.db import retry_on_locked
 from core.permissions import IsRecruiterOrReadOnly
 
-class JobListCreateView(generics.ListCreateAPIView):
-    queryset = Job.objects.filter(is_published=True)
+class JobListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
+    queryset = JobSerializer.with_counts(Job.objects.filter(is_published=True).select_related('company', 'posted_by'))
     serializer_class = JobSerializer
     permission_classes = [IsRecruiterOrReadOnly]
+    etag_dependencies = ['applications.Application', 'companies.Company', 'jobs.JobView']
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['job_type', 'experience_level', 'company']
     search_fields = ['title', 'description', 'skills_required']
@@ -24,18 +26,38 @@ class JobListCreateView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save(posted_by=self.request.user)
 
-class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Job.objects.all()
+class JobDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = JobSerializer.with_counts(Job.objects.select_related('company', 'posted_by'))
     serializer_class = JobSerializer
     permission_classes = [IsRecruiterOrReadOnly]
+    etag_dependencies = ['applications.Application', 'companies.Company', 'jobs.JobView']
     
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        # Track job view
-        JobView.objects.get_or_create(
-            job=instance,
-            user=request.user if request.user.is_authenticated else None,
-            ip_address=request.META.get('REMOTE_ADDR', ''),
-        )
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
\ No newline at end of file
+    def get_object(self):
+        instance = super().get_object()
+        if self.request.method == 'GET':
+            # Track job view before the ETag is computed so a first view is not cached stale
+            _, created = retry_on_locked(JobView.objects.get_or_create)(
+                job=instance,
+                user=self.request.user if self.request.user.is_authenticated else None,
+                ip_address=self.request.META.get('REMOTE_ADDR', ''),
+            )
+            if created:
+                instance.views_total += 1
+        return instance
+
+class SavedSearchListCreateView(generics.ListCreateAPIView):
+    serializer_class = SavedSearchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return SavedSearch.objects.filter(user=self.request.user)
+    
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+class SavedSearchDetailView(generics.RetrieveUpdateDestroyAPIView):
+    serializer_class = SavedSearchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return SavedSearch.objects.filter(user=self.request.user)
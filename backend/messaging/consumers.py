@@ -0,0 +1,54 @@
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from authentication.websocket import SUBPROTOCOL
+from core.params import uuid_param
+from .inbox import inbox_service
+from .models import Message
+from .realtime import user_group
+
+class MessagingConsumer(AsyncJsonWebsocketConsumer):
+    """Per-user socket that receives new messages and read receipts.
+    
+    Idle sockets hold no DB connection or thread; all state lives in the
+    channel layer group for the user.
+    """
+    async def connect(self):
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close(code=4401)
+            return
+        self.group_name = user_group(user.id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        # Clients authenticating with the bearer subprotocol expect it echoed back
+        await self.accept(SUBPROTOCOL if SUBPROTOCOL in self.scope.get('subprotocols', []) else None)
+    
+    async def disconnect(self, code):
+        if hasattr(self, 'group_name'):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+    
+    async def receive_json(self, content, **kwargs):
+        if content.get('type') == 'ping':
+            await self.send_json({'type': 'pong'})
+        elif content.get('type') == 'read' and content.get('conversation'):
+            await self.receive_read(content['conversation'], content.get('message'))
+    
+    async def receive_read(self, conversation, message=None):
+        # Malformed ids get an error frame; raising here would close the socket
+        conversation_id, message_id = uuid_param(conversation), uuid_param(message)
+        if conversation_id is None or (message and message_id is None):
+            await self.send_json({'type': 'error', 'error': 'conversation and message must be UUIDs'})
+        elif await self.mark_read(conversation_id, message_id) is None:
+            await self.send_json({'type': 'error', 'error': 'message not found'})
+    
+    @database_sync_to_async
+    def mark_read(self, conversation_id, message_id=None):
+        """Cleared count, or None when message_id is not in the conversation."""
+        up_to = None
+        if message_id:
+            up_to = Message.objects.filter(pk=message_id, conversation_id=conversation_id).first()
+            if up_to is None:
+                return None
+        return inbox_service.mark_read(self.scope['user'], conversation_id, up_to=up_to)
+    
+    async def push_event(self, event):
+        await self.send_json({'type': event['event'], 'data': event['payload']})
@@ -0,0 +1,158 @@
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from .models import Conversation, InboxEntry, Message, UnreadBadge
+
+def _not_after(field, moment):
+    """Rows whose field is unset or not later than moment."""
+    return Q(**{f'{field}__isnull': True}) | Q(**{f'{field}__lte': moment})
+
+class InboxService:
+    """Maintains InboxEntry/UnreadBadge on send and read.
+    
+    Sending a message costs a fixed number of statements regardless of how
+    many messages a conversation has; listing the inbox is one indexed query.
+    """
+    PREVIEW_LENGTH = 200
+    
+    def ensure_entries(self, conversation_id, user_ids):
+        InboxEntry.objects.bulk_create(
+            [InboxEntry(user_id=uid, conversation_id=conversation_id) for uid in user_ids],
+            ignore_conflicts=True,
+        )
+        UnreadBadge.objects.bulk_create([UnreadBadge(user_id=uid) for uid in user_ids], ignore_conflicts=True)
+    
+    def record_message(self, message):
+        """Update snapshots for all participants and unread counters for everyone but the sender."""
+        conversation_id = message.conversation_id
+        participant_ids = list(
+            Conversation.participants.through.objects
+            .filter(conversation_id=conversation_id)
+            .values_list('user_id', flat=True)
+        )
+        recipient_ids = [uid for uid in participant_ids if uid != message.sender_id]
+        
+        # Snapshots and cursors only move forward, so a message saved out of
+        # order never replaces a newer one
+        created_at = message.created_at
+        with transaction.atomic():
+            self.ensure_entries(conversation_id, participant_ids)
+            InboxEntry.objects.filter(_not_after('last_message_at', created_at), conversation_id=conversation_id).update(
+                last_message=message,
+                last_message_at=created_at,
+                last_message_preview=message.content[:self.PREVIEW_LENGTH],
+                last_sender_id=message.sender_id,
+            )
+            InboxEntry.objects.filter(conversation_id=conversation_id, user_id__in=recipient_ids).update(
+                unread_count=F('unread_count') + 1,
+            )
+            InboxEntry.objects.filter(_not_after('last_read_at', created_at), conversation_id=conversation_id, user_id=message.sender_id).update(
+                last_read_message=message,
+                last_read_at=created_at,
+            )
+            UnreadBadge.objects.filter(user_id__in=recipient_ids).update(unread_total=F('unread_total') + 1)
+            Conversation.all_objects.filter(_not_after('last_message_at', created_at), pk=conversation_id).update(last_message_at=created_at)
+    
+    def mark_read(self, user, conversation_id, up_to=None):
+        """Advance the user's read cursor to up_to (a Message) or to the latest message.
+        
+        Returns the number of messages that became read. The cursor only moves
+        forward, so replays and out-of-order acks are no-ops.
+        """
+        with transaction.atomic():
+            entry = InboxEntry.objects.select_for_update().filter(user=user, conversation_id=conversation_id).first()
+            if entry is None:
+                return 0
+            if up_to is not None:
+                target_id, target_at = up_to.pk, up_to.created_at
+            else:
+                target_id, target_at = entry.last_message_id, entry.last_message_at
+            if target_id is None or (entry.last_read_at and target_at <= entry.last_read_at):
+                return 0
+            
+            if target_id == entry.last_message_id:
+                remaining = 0
+            else:
+                remaining = (
+                    Message.objects.filter(conversation_id=conversation_id, created_at__gt=target_at)
+                    .exclude(sender=user)
+                    .count()
+                )
+            cleared = max(entry.unread_count - remaining, 0)
+            InboxEntry.objects.filter(pk=entry.pk).update(
+                unread_count=remaining,
+                last_read_message_id=target_id,
+                last_read_at=target_at,
+            )
+            if cleared:
+                UnreadBadge.objects.filter(user=user).update(unread_total=Greatest(F('unread_total') - cleared, 0))
+        
+        user_id = getattr(user, 'pk', user)
+        transaction.on_commit(lambda: self._push_receipt(user_id, conversation_id, target_id, target_at))
+        return cleared
+    
+    def is_read_by(self, message, user):
+        """Derived per-message read state."""
+        last_read_at = (
+            InboxEntry.objects.filter(user=user, conversation_id=message.conversation_id)
+            .values_list('last_read_at', flat=True).first()
+        )
+        return bool(last_read_at and message.created_at <= last_read_at)
+    
+    def readers_of(self, message):
+        """Users whose read cursor has passed message."""
+        return (
+            InboxEntry.objects.filter(conversation_id=message.conversation_id, last_read_at__gte=message.created_at)
+            .exclude(user_id=message.sender_id)
+            .values_list('user_id', flat=True)
+        )
+    
+    def _push_receipt(self, user_id, conversation_id, message_id, read_at):
+        from .realtime import push_to_users
+        
+        participant_ids = (
+            InboxEntry.objects.filter(conversation_id=conversation_id)
+            .exclude(user_id=user_id)
+            .values_list('user_id', flat=True)
+        )
+        push_to_users(list(participant_ids), 'conversation.read', {
+            'conversation': str(conversation_id),
+            'user': user_id,
+            'message': str(message_id),
+            'read_at': read_at.isoformat(),
+        })
+    
+    def get_inbox(self, user, before=None, limit=20):
+        entries = (
+            InboxEntry.objects.filter(user=user, last_message_at__isnull=False, conversation__is_deleted=False)
+            .select_related('conversation', 'last_sender')
+            .order_by('-last_message_at')
+        )
+        if before:
+            entries = entries.filter(last_message_at__lt=before)
+        return list(entries[:limit])
+    
+    def get_unread_total(self, user):
+        return UnreadBadge.objects.filter(user=user).values_list('unread_total', flat=True).first() or 0
+    
+    def rebuild(self, user):
+        """Recompute a user's counters from messages newer than each read cursor.
+        
+        Soft-deleted messages are not counted, so conversations deleted with
+        their messages drop out of the badge and come back on restore.
+        """
+        user_id = getattr(user, 'pk', user)
+        with transaction.atomic():
+            total = 0
+            for entry in InboxEntry.objects.select_for_update().filter(user_id=user_id):
+                unread = Message.objects.filter(conversation_id=entry.conversation_id).exclude(sender_id=user_id)
+                if entry.last_read_at:
+                    unread = unread.filter(created_at__gt=entry.last_read_at)
+                unread = unread.count()
+                InboxEntry.objects.filter(pk=entry.pk).update(unread_count=unread)
+                total += unread
+            UnreadBadge.objects.update_or_create(user_id=user_id, defaults={'unread_total': total})
+        return total
+
+# Global instance
+inbox_service = InboxService()
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from messaging.inbox import inbox_service
+from messaging.models import InboxEntry
+from authentication.models import User
+
+class Command(BaseCommand):
+    help = 'Recompute per-conversation unread counters and unread badges.'
+    
+    def handle(self, *args, **options):
+        user_ids = InboxEntry.objects.values_list('user_id', flat=True).distinct()
+        for user in User.objects.filter(id__in=user_ids).iterator():
+            inbox_service.rebuild(user)
+        self.stdout.write(self.style.SUCCESS('Inbox counters rebuilt'))
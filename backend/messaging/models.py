@@ -1,5 +1,5 @@
 from django.db import models
-from core.models import BaseModel
+from core.models import BaseModel, DELETED_ROWS, LIVE_ROWS
 from authentication.models import User
 
 class Conversation(BaseModel):
@@ -9,6 +9,8 @@ class Conversation(BaseModel):
     is_group = models.BooleanField(default=False)
     last_message_at = models.DateTimeField(null=True, blank=True, db_index=True)
     
+    soft_delete_cascade = ['messages']
+    
     class Meta:
         indexes = [
             models.Index(fields=['last_message_at', 'is_active']),
@@ -34,20 +36,33 @@ class Message(BaseModel):
     
     class Meta:
         indexes = [
-            models.Index(fields=['conversation', 'created_at']),
+            models.Index(fields=['conversation', 'created_at'], condition=LIVE_ROWS, name='msg_conversation_live_idx'),
             models.Index(fields=['sender', 'created_at']),
             models.Index(fields=['is_read', 'created_at']),
+            models.Index(fields=['deleted_at'], condition=DELETED_ROWS, name='msg_purge_idx'),
         ]
 
-class MessageRead(BaseModel):
-    """Track message read status per user."""
-    message = models.ForeignKey(Message, on_delete=models.CASCADE, related_name='read_by')
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
-    read_at = models.DateTimeField(auto_now_add=True)
+class InboxEntry(models.Model):
+    """Per-(user, conversation) unread counter and last-message snapshot."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='inbox_entries')
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='inbox_entries')
+    unread_count = models.PositiveIntegerField(default=0)
+    last_message = models.ForeignKey(Message, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    last_message_preview = models.CharField(max_length=200, blank=True)
+    last_sender = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    # Read high-water mark: every message created at or before last_read_at
+    # counts as read by this user, so no per-message rows are written
+    last_read_message = models.ForeignKey(Message, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_read_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
-        unique_together = ['message', 'user']
+        unique_together = ['user', 'conversation']
         indexes = [
-            models.Index(fields=['user', 'read_at']),
-            models.Index(fields=['message', 'read_at']),
-        ]
\ No newline at end of file
+            models.Index(fields=['user', '-last_message_at']),
+        ]
+
+class UnreadBadge(models.Model):
+    """Total unread messages per user, so the badge is a primary-key read."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='unread_badge')
+    unread_total = models.PositiveIntegerField(default=0)
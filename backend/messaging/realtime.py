@@ -0,0 +1,20 @@
+import logging
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+logger = logging.getLogger(__name__)
+
+def user_group(user_id):
+    return f'user_{user_id}'
+
+def push_to_users(user_ids, event_type, payload):
+    """Send an event to every open socket of the given users via the channel layer."""
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    send = async_to_sync(channel_layer.group_send)
+    for user_id in user_ids:
+        try:
+            send(user_group(user_id), {'type': 'push.event', 'event': event_type, 'payload': payload})
+        except Exception as e:
+            logger.error(f"Realtime push to user {user_id} failed: {e}")
@@ -0,0 +1,6 @@
+from django.urls import path
+from . import consumers
+
+websocket_urlpatterns = [
+    path('ws/messages/', consumers.MessagingConsumer.as_asgi()),
+]
@@ -0,0 +1,15 @@
+from rest_framework import serializers
+from .models import InboxEntry
+
+class InboxEntrySerializer(serializers.ModelSerializer):
+    conversation_title = serializers.CharField(source='conversation.title', read_only=True)
+    is_group = serializers.BooleanField(source='conversation.is_group', read_only=True)
+    last_sender = serializers.StringRelatedField(read_only=True)
+    
+    class Meta:
+        model = InboxEntry
+        fields = [
+            'conversation', 'conversation_title', 'is_group', 'unread_count',
+            'last_message', 'last_message_at', 'last_message_preview', 'last_sender',
+            'last_read_message', 'last_read_at',
+        ]
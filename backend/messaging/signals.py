@@ -0,0 +1,52 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+from core.signals import bulk_restored, bulk_soft_deleted
+from .inbox import inbox_service
+from .models import Conversation, InboxEntry, Message
+from .realtime import push_to_users
+
+@receiver(m2m_changed, sender=Conversation.participants.through)
+def sync_inbox_participants(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse or not pk_set:
+        return
+    if action == 'post_add':
+        inbox_service.ensure_entries(instance.pk, pk_set)
+    elif action == 'post_remove':
+        for user_id in pk_set:
+            inbox_service.mark_read(user_id, instance.pk)
+        InboxEntry.objects.filter(conversation=instance, user_id__in=pk_set).delete()
+
+@receiver(post_save, sender=Message)
+def on_message_created(sender, instance, created, **kwargs):
+    """Update inbox counters in the sending transaction, push to sockets after commit."""
+    if not created:
+        return
+    inbox_service.record_message(instance)
+    
+    def push():
+        participant_ids = list(instance.conversation.participants.values_list('id', flat=True))
+        push_to_users(participant_ids, 'message.new', {
+            'id': str(instance.id),
+            'conversation': str(instance.conversation_id),
+            'sender': instance.sender_id,
+            'content': instance.content,
+            'message_type': instance.message_type,
+            'file_url': instance.file_url,
+            'created_at': instance.created_at.isoformat(),
+        })
+    transaction.on_commit(push)
+
+@receiver([bulk_soft_deleted, bulk_restored])
+def rebuild_inboxes_after_bulk_soft_delete(sender, affected, **kwargs):
+    """Recount unread totals for everyone in conversations whose messages were bulk deleted or restored."""
+    conversation_ids = set(affected.get(Conversation, []))
+    if Message in affected:
+        conversation_ids.update(
+            Message.all_objects.filter(pk__in=affected[Message]).values_list('conversation_id', flat=True).distinct()
+        )
+    if not conversation_ids:
+        return
+    user_ids = InboxEntry.objects.filter(conversation_id__in=conversation_ids).values_list('user_id', flat=True).distinct()
+    for user_id in user_ids:
+        inbox_service.rebuild(user_id)
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import tracemalloc
+from datetime import timedelta
+from unittest import skipUnless
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.test import TestCase, TransactionTestCase, tag
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from authentication.models import User
+from careeropen.asgi import application
+from .models import Conversation, InboxEntry, Message
+from .realtime import user_group
+
+def make_user(name):
+    return User.objects.create(username=name, email=f'{name}@example.com')
+
+class InboxTests(TestCase):
+    def setUp(self):
+        self.alice, self.bob = make_user('alice'), make_user('bob')
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.alice, self.bob)
+        self.client = APIClient()
+        self.client.force_authenticate(self.bob)
+    
+    def test_malformed_params_are_ignored(self):
+        for params in ({'limit': 'x'}, {'limit': '-5'}, {'before': '2024-13-45T99:00:00'}):
+            response = self.client.get('/api/messages/inbox/', params)
+            self.assertEqual(response.status_code, 200, params)
+    
+    def test_out_of_order_message_keeps_the_newer_snapshot(self):
+        now = timezone.now()
+        newer = Message.objects.create(conversation=self.conversation, sender=self.alice, content='newer', created_at=now)
+        Message.objects.create(
+            conversation=self.conversation, sender=self.alice, content='older', created_at=now - timedelta(minutes=5),
+        )
+        entry = InboxEntry.objects.get(user=self.bob, conversation=self.conversation)
+        self.assertEqual(entry.last_message_id, newer.id)
+        self.assertEqual(entry.unread_count, 2)
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.last_message_at, now)
+    
+    def test_mark_read_rejects_malformed_message_id(self):
+        url = f'/api/messages/conversations/{self.conversation.pk}/read/'
+        self.assertEqual(self.client.post(url, {'message_id': 'x'}).status_code, 400)
+        self.assertEqual(self.client.post(url, {'message_id': str(self.conversation.pk)}).status_code, 404)
+
+class MessagingSocketTests(TransactionTestCase):
+    def setUp(self):
+        self.user = make_user('reader')
+        self.token = str(AccessToken.for_user(self.user))
+    
+    def connect(self, path='/ws/messages/', subprotocols=None):
+        async def run():
+            communicator = WebsocketCommunicator(application, path, subprotocols=subprotocols)
+            connected, detail = await communicator.connect()
+            await communicator.disconnect()
+            return connected, detail
+        return async_to_sync(run)()
+    
+    def test_query_string_token_authenticates(self):
+        self.assertEqual(self.connect(f'/ws/messages/?token={self.token}'), (True, None))
+    
+    def test_bearer_subprotocol_authenticates_and_is_echoed(self):
+        self.assertEqual(self.connect(subprotocols=['bearer', self.token]), (True, 'bearer'))
+    
+    def test_missing_or_bad_token_is_rejected(self):
+        self.assertEqual(self.connect(), (False, 4401))
+        self.assertEqual(self.connect('/ws/messages/?token=garbage'), (False, 4401))
+    
+    def test_malformed_read_frame_gets_an_error_and_keeps_the_socket(self):
+        conversation = Conversation.objects.create()
+        conversation.participants.add(self.user)
+        
+        async def run():
+            communicator = WebsocketCommunicator(application, f'/ws/messages/?token={self.token}')
+            await communicator.connect()
+            frames = []
+            for frame in (
+                {'type': 'read', 'conversation': 'x'},
+                {'type': 'read', 'conversation': str(conversation.pk), 'message': 'x'},
+                {'type': 'read', 'conversation': str(conversation.pk), 'message': str(conversation.pk)},
+                {'type': 'ping'},
+            ):
+                await communicator.send_json_to(frame)
+                frames.append(await communicator.receive_json_from())
+            await communicator.disconnect()
+            return frames
+        
+        frames = async_to_sync(run)()
+        self.assertEqual([frame['type'] for frame in frames], ['error', 'error', 'error', 'pong'])
+
+@tag('load')
+@skipUnless(os.environ.get('MESSAGING_LOAD_SOCKETS'), 'set MESSAGING_LOAD_SOCKETS (e.g. 2000) to run the load test')
+class IdleSocketLoadTests(TransactionTestCase):
+    """Thousands of idle sockets on one worker, then a push to every one of them.
+    
+    Opt-in: MESSAGING_LOAD_SOCKETS sets the socket count; each socket must stay
+    under MESSAGING_LOAD_MAX_KIB of traced memory (default 64).
+    """
+    SOCKETS = int(os.environ.get('MESSAGING_LOAD_SOCKETS') or 0)
+    MAX_KIB = float(os.environ.get('MESSAGING_LOAD_MAX_KIB', 64))
+    
+    def test_idle_sockets_per_worker(self):
+        users = User.objects.bulk_create(
+            [User(username=f'idle{i}', email=f'idle{i}@example.com') for i in range(self.SOCKETS)]
+        )
+        tokens = [str(AccessToken.for_user(user)) for user in users]
+        
+        async def run():
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+            communicators = [WebsocketCommunicator(application, f'/ws/messages/?token={token}') for token in tokens]
+            results = await asyncio.gather(*(communicator.connect(timeout=120) for communicator in communicators))
+            per_socket = (tracemalloc.get_traced_memory()[0] - baseline) / len(communicators)
+            tracemalloc.stop()
+            
+            layer = get_channel_layer()
+            for user in users:
+                await layer.group_send(user_group(user.id), {'type': 'push.event', 'event': 'ping', 'payload': {}})
+            received = await asyncio.gather(*(communicator.receive_json_from(timeout=10) for communicator in communicators))
+            await asyncio.gather(*(communicator.disconnect() for communicator in communicators))
+            return results, received, per_socket
+        
+        results, received, per_socket = async_to_sync(run)()
+        self.assertTrue(all(connected for connected, _ in results))
+        self.assertEqual([frame['type'] for frame in received], ['ping'] * self.SOCKETS)
+        self.assertLess(per_socket / 1024, self.MAX_KIB)
@@ -1,5 +1,8 @@
 from django.urls import path
+from . import views
 
 urlpatterns = [
-    # Messaging endpoints will be implemented later
-]
\ No newline at end of file
+    path('inbox/', views.inbox, name='inbox'),
+    path('unread/', views.unread_badge, name='unread-badge'),
+    path('conversations/<uuid:pk>/read/', views.mark_conversation_read, name='conversation-read'),
+]
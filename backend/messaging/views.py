@@ -0,0 +1,42 @@
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_datetime
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from core.params import int_param, uuid_param
+from .inbox import inbox_service
+from .models import Message
+from .serializers import InboxEntrySerializer
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def inbox(request):
+    """Conversations ordered by latest message, with per-conversation unread counts."""
+    try:
+        before = parse_datetime(request.GET.get('before', ''))
+    except ValueError:
+        before = None
+    limit = int_param(request, 'limit', 20, maximum=100)
+    entries = inbox_service.get_inbox(request.user, before=before, limit=limit)
+    return Response({
+        'results': InboxEntrySerializer(entries, many=True).data,
+        'unread_total': inbox_service.get_unread_total(request.user),
+    })
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def unread_badge(request):
+    return Response({'unread_total': inbox_service.get_unread_total(request.user)})
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def mark_conversation_read(request, pk):
+    """Advance the read cursor; pass message_id to mark read up to a specific message."""
+    up_to = None
+    if request.data.get('message_id'):
+        message_id = uuid_param(request.data['message_id'])
+        if message_id is None:
+            return Response({'error': 'message_id must be a UUID'}, status=status.HTTP_400_BAD_REQUEST)
+        up_to = get_object_or_404(Message, pk=message_id, conversation_id=pk)
+    cleared = inbox_service.mark_read(request.user, pk, up_to=up_to)
+    return Response({'cleared': cleared})
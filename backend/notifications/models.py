@@ -1,5 +1,5 @@
 from django.db import models
-from core.models import BaseModel
+from core.models import BaseModel, DELETED_ROWS, LIVE_ROWS
 from authentication.models import User
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
@@ -26,6 +26,9 @@ class Notification(BaseModel):
     message = models.TextField()
     is_read = models.BooleanField(default=False, db_index=True)
     read_at = models.DateTimeField(null=True, blank=True)
+    # Number of distinct actors folded into this notification ("X and 12 others ...")
+    actor_count = models.PositiveIntegerField(default=1)
+    actor_ids = models.JSONField(default=list, blank=True)
     
     # Generic foreign key for related objects
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, null=True, blank=True)
@@ -35,8 +38,10 @@ class Notification(BaseModel):
     class Meta:
         indexes = [
             models.Index(fields=['recipient', 'is_read', 'created_at']),
+            models.Index(fields=['recipient', '-created_at'], condition=LIVE_ROWS & models.Q(is_read=False), name='notif_unread_live_idx'),
             models.Index(fields=['notification_type', 'created_at']),
             models.Index(fields=['sender', 'created_at']),
+            models.Index(fields=['deleted_at'], condition=DELETED_ROWS, name='notif_purge_idx'),
         ]
 
 class NotificationPreference(BaseModel):
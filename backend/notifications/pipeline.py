@@ -0,0 +1,185 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.mail import send_mass_mail
+from django.db import transaction
+from django.utils import timezone
+from .models import Notification, NotificationPreference
+
+logger = logging.getLogger(__name__)
+
+# Which NotificationPreference flag gates each notification type (None = always on)
+PREFERENCE_FIELDS = {
+    'connection_request': 'connection_requests',
+    'connection_accepted': 'connection_requests',
+    'job_application': 'job_alerts',
+    'application_status': 'job_alerts',
+    'job_match': 'job_alerts',
+    'message': 'message_notifications',
+    'post_like': 'post_interactions',
+    'post_comment': 'post_interactions',
+    'profile_view': None,
+    'system': None,
+}
+
+class DeliveryPool:
+    """Bounded thread pool for email/push delivery.
+    
+    At most max_pending jobs may be queued; when the pool is saturated new
+    jobs are dropped and logged rather than blocking the request thread.
+    """
+    def __init__(self, max_workers, max_pending):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='notify')
+        self.slots = threading.BoundedSemaphore(max_pending)
+    
+    def submit(self, fn, *args):
+        if not self.slots.acquire(blocking=False):
+            logger.warning(f"Notification delivery pool saturated; dropped {fn.__name__}")
+            return False
+        future = self.executor.submit(self._run, fn, *args)
+        future.add_done_callback(lambda _: self.slots.release())
+        return True
+    
+    def _run(self, fn, *args):
+        try:
+            fn(*args)
+        except Exception as e:
+            logger.error(f"Notification delivery error in {fn.__name__}: {e}")
+
+class NotificationPipeline:
+    """Turns events into notifications for many recipients with batched queries.
+    
+    For each batch of recipients: one query for preferences, one for
+    coalescible unread notifications, one bulk_update and one bulk_create.
+    """
+    def __init__(self):
+        self.batch_size = getattr(settings, 'NOTIFICATION_BATCH_SIZE', 500)
+        self.coalesce_window = timedelta(seconds=getattr(settings, 'NOTIFICATION_COALESCE_WINDOW', 3600))
+        self.max_actor_ids = getattr(settings, 'NOTIFICATION_MAX_ACTOR_IDS', 1000)
+        self.delivery = DeliveryPool(
+            max_workers=getattr(settings, 'NOTIFICATION_DELIVERY_WORKERS', 4),
+            max_pending=getattr(settings, 'NOTIFICATION_DELIVERY_QUEUE', 1000),
+        )
+    
+    def publish(self, notification_type, recipient_ids, verb, sender=None, target=None, title=None):
+        """Notify recipient_ids that sender did verb (e.g. 'liked your post') on target."""
+        recipient_ids = [uid for uid in dict.fromkeys(recipient_ids) if not sender or uid != sender.pk]
+        title = title or dict(Notification.NOTIFICATION_TYPES).get(notification_type, 'Notification')
+        content_type = ContentType.objects.get_for_model(target) if target is not None else None
+        object_id = target.pk if target is not None else None
+        
+        created = []
+        for start in range(0, len(recipient_ids), self.batch_size):
+            batch = recipient_ids[start:start + self.batch_size]
+            created += self._publish_batch(notification_type, batch, verb, sender, title, content_type, object_id)
+        return created
+    
+    def _publish_batch(self, notification_type, recipient_ids, verb, sender, title, content_type, object_id):
+        prefs = self._load_preferences(recipient_ids)
+        pref_field = PREFERENCE_FIELDS.get(notification_type)
+        recipient_ids = [uid for uid in recipient_ids if pref_field is None or prefs[uid][pref_field]]
+        if not recipient_ids:
+            return []
+        
+        now = timezone.now()
+        actor = self._actor_name(sender)
+        coalesced, repeated = [], set()
+        if content_type is not None:
+            existing = Notification.objects.filter(
+                recipient_id__in=recipient_ids,
+                notification_type=notification_type,
+                content_type=content_type,
+                object_id=object_id,
+                is_read=False,
+                created_at__gte=now - self.coalesce_window,
+            )
+            for notification in existing:
+                # An actor who already counts (e.g. like, unlike, like again) changes nothing
+                if sender is not None and (sender.pk == notification.sender_id or sender.pk in notification.actor_ids):
+                    repeated.add(notification.recipient_id)
+                    continue
+                if sender is not None and len(notification.actor_ids) < self.max_actor_ids:
+                    notification.actor_ids.append(sender.pk)
+                notification.actor_count += 1
+                notification.sender = sender
+                notification.message = self._message(actor, verb, notification.actor_count)
+                notification.created_at = now
+                coalesced.append(notification)
+            Notification.objects.bulk_update(coalesced, ['actor_count', 'actor_ids', 'sender', 'message', 'created_at'])
+        
+        seen = repeated | {n.recipient_id for n in coalesced}
+        fresh = [
+            Notification(
+                recipient_id=uid,
+                sender=sender,
+                notification_type=notification_type,
+                title=title,
+                message=self._message(actor, verb, 1),
+                actor_ids=[sender.pk] if sender is not None else [],
+                content_type=content_type,
+                object_id=object_id,
+            )
+            for uid in recipient_ids if uid not in seen
+        ]
+        Notification.objects.bulk_create(fresh)
+        
+        # Only brand-new notifications are delivered, and only once the caller's
+        # transaction commits; coalesced ones update in place
+        transaction.on_commit(lambda: self._dispatch(fresh, prefs))
+        return fresh
+    
+    def _load_preferences(self, user_ids):
+        from authentication.models import User
+        
+        defaults = {
+            f.name: f.default for f in NotificationPreference._meta.fields
+            if isinstance(f.default, bool) and f.name not in ('is_active', 'is_deleted')
+        }
+        prefs = {uid: dict(defaults) for uid in user_ids}
+        for row in NotificationPreference.objects.filter(user_id__in=user_ids).values('user_id', *defaults):
+            prefs[row.pop('user_id')].update(row)
+        for uid, email in User.objects.filter(id__in=user_ids).values_list('id', 'email'):
+            prefs[uid]['email'] = email
+        return prefs
+    
+    def _dispatch(self, notifications, prefs):
+        emails = [
+            (n.title, n.message, None, [prefs[n.recipient_id]['email']])
+            for n in notifications
+            if prefs[n.recipient_id]['email_notifications'] and prefs[n.recipient_id].get('email')
+        ]
+        pushes = [n for n in notifications if prefs[n.recipient_id]['push_notifications']]
+        if emails:
+            self.delivery.submit(send_mass_mail, emails)
+        if pushes:
+            self.delivery.submit(self._push, pushes)
+    
+    def _push(self, notifications):
+        from messaging.realtime import push_to_users
+        
+        for n in notifications:
+            push_to_users([n.recipient_id], 'notification.new', {
+                'id': str(n.id),
+                'notification_type': n.notification_type,
+                'title': n.title,
+                'message': n.message,
+            })
+    
+    def _actor_name(self, sender):
+        if sender is None:
+            return None
+        return sender.get_full_name() or sender.email
+    
+    def _message(self, actor, verb, actor_count):
+        if actor is None:
+            return verb
+        if actor_count <= 1:
+            return f"{actor} {verb}"
+        others = actor_count - 1
+        return f"{actor} and {others} other{'s' if others > 1 else ''} {verb}"
+
+# Global instance
+notification_pipeline = NotificationPipeline()
@@ -0,0 +1,9 @@
+from rest_framework import serializers
+from .models import Notification
+
+class NotificationSerializer(serializers.ModelSerializer):
+    sender = serializers.StringRelatedField(read_only=True)
+    
+    class Meta:
+        model = Notification
+        fields = ['id', 'notification_type', 'title', 'message', 'sender', 'is_read', 'read_at', 'object_id', 'created_at']
@@ -0,0 +1,22 @@
+from django.utils import timezone
+from .models import Notification
+
+class NotificationService:
+    """Notification reads as set-based UPDATEs instead of per-row saves."""
+    def unread(self, user):
+        return Notification.objects.filter(recipient=user, is_read=False)
+    
+    def unread_count(self, user):
+        return self.unread(user).count()
+    
+    def mark_read(self, user, ids=None, before=None):
+        """Mark all, the given ids, or everything created up to before as read in one statement."""
+        notifications = self.unread(user)
+        if ids is not None:
+            notifications = notifications.filter(id__in=ids)
+        if before is not None:
+            notifications = notifications.filter(created_at__lte=before)
+        return notifications.update(is_read=True, read_at=timezone.now())
+
+# Global instance
+notification_service = NotificationService()
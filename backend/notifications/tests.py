@@ -0,0 +1,80 @@
+from unittest import mock
+from django.test import TestCase
+from rest_framework.test import APIClient
+from authentication.models import User
+from social.models import Post
+from .models import Notification
+from .pipeline import notification_pipeline
+
+def make_user(name):
+    return User.objects.create(username=name, email=f'{name}@example.com')
+
+class CoalescingTests(TestCase):
+    def setUp(self):
+        self.author = make_user('author')
+        self.post = Post.objects.create(author=self.author, content='hello')
+    
+    def like(self, user):
+        notification_pipeline.publish('post_like', [self.author.pk], 'liked your post', sender=user, target=self.post)
+    
+    def notification(self):
+        return Notification.objects.get(recipient=self.author)
+    
+    def test_repeat_actor_is_counted_once(self):
+        fan = make_user('fan')
+        self.like(fan)
+        self.like(fan)
+        self.assertEqual(self.notification().actor_count, 1)
+        self.assertEqual(self.notification().message, 'fan@example.com liked your post')
+    
+    def test_distinct_actors_are_counted(self):
+        fans = [make_user(f'fan{i}') for i in range(3)]
+        for fan in fans + fans:
+            self.like(fan)
+        notification = self.notification()
+        self.assertEqual(notification.actor_count, 3)
+        self.assertEqual(notification.message, 'fan2@example.com and 2 others liked your post')
+    
+    def test_delivery_waits_for_commit(self):
+        with mock.patch.object(notification_pipeline, '_dispatch') as dispatch:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                self.like(make_user('fan'))
+            dispatch.assert_not_called()
+            for callback in callbacks:
+                callback()
+            dispatch.assert_called_once()
+
+class MarkReadTests(TestCase):
+    def setUp(self):
+        self.user = make_user('reader')
+        self.notifications = [
+            Notification.objects.create(recipient=self.user, notification_type='system', title=str(i), message='')
+            for i in range(3)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+    
+    def mark_read(self, data):
+        return self.client.post('/api/notifications/read/', data, format='json')
+    
+    def unread(self):
+        return Notification.objects.filter(recipient=self.user, is_read=False).count()
+    
+    def test_malformed_before_is_rejected(self):
+        for before in ('yesterday', '2024-13-45T00:00:00', 5):
+            response = self.mark_read({'before': before})
+            self.assertEqual(response.status_code, 400, before)
+        self.assertEqual(self.unread(), 3)
+    
+    def test_malformed_ids_are_rejected(self):
+        for ids in (['nope'], 'abc', [str(self.notifications[0].pk), 'nope'], {'id': 1}):
+            response = self.mark_read({'ids': ids})
+            self.assertEqual(response.status_code, 400, ids)
+        self.assertEqual(self.unread(), 3)
+    
+    def test_valid_filters_mark_only_matching_rows(self):
+        response = self.mark_read({'ids': [str(self.notifications[0].pk)]})
+        self.assertEqual(response.data, {'updated': 1})
+        response = self.mark_read({'before': '2000-01-01T00:00:00Z'})
+        self.assertEqual(response.data, {'updated': 0})
+        self.assertEqual(self.mark_read({}).data, {'updated': 2})
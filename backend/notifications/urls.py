@@ -1,5 +1,8 @@
 from django.urls import path
+from . import views
 
 urlpatterns = [
-    # Notification endpoints will be implemented later
-]
\ No newline at end of file
+    path('', views.NotificationListView.as_view(), name='notification-list'),
+    path('unread/', views.unread_count, name='notification-unread'),
+    path('read/', views.mark_read, name='notification-read'),
+]
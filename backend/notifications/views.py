@@ -0,0 +1,40 @@
+from django.utils.dateparse import parse_datetime
+from rest_framework import generics, permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from core.params import uuid_param
+from .models import Notification
+from .serializers import NotificationSerializer
+from .services import notification_service
+
+class NotificationListView(generics.ListAPIView):
+    serializer_class = NotificationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return Notification.objects.filter(recipient=self.request.user).select_related('sender').order_by('-created_at')
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def unread_count(request):
+    return Response({'unread_count': notification_service.unread_count(request.user)})
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def mark_read(request):
+    """Mark notifications read: all, a list of ids, or everything up to a timestamp."""
+    before = request.data.get('before')
+    if before is not None:
+        try:
+            before = parse_datetime(before)
+        except (TypeError, ValueError):
+            before = None
+        if before is None:
+            return Response({'error': 'before must be an ISO 8601 datetime'}, status=status.HTTP_400_BAD_REQUEST)
+    ids = request.data.get('ids')
+    if ids is not None:
+        ids = [uuid_param(value) for value in ids] if isinstance(ids, list) else [None]
+        if None in ids:
+            return Response({'error': 'ids must be a list of UUIDs'}, status=status.HTTP_400_BAD_REQUEST)
+    updated = notification_service.mark_read(request.user, ids=ids, before=before)
+    return Response({'updated': updated})
@@ -18,6 +18,8 @@ class Profile(BaseModel):
     preferred_salary_min = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     preferred_salary_max = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     
+    soft_delete_cascade = ['experiences', 'education']
+    
     def __str__(self):
         return f"{self.user.email} Profile"
 
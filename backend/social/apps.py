@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class SocialConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'social'
\ No newline at end of file
+    name = 'social'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,75 @@
+import operator
+from functools import reduce
+from django.conf import settings
+from django.db.models import Count, Q
+from .models import Comment
+
+class CommentTreeService:
+    """Loads comment threads via Comment.path and nests them in memory.
+    
+    A page of top-level comments is one query; every visible descendant of
+    that page is a second query. Branches deeper than max_depth are cut off
+    and reported through replies_count so clients can expand them lazily.
+    """
+    def __init__(self):
+        self.page_size = getattr(settings, 'COMMENT_PAGE_SIZE', 20)
+        self.max_depth = getattr(settings, 'COMMENT_MAX_DEPTH', 4)
+    
+    def get_thread(self, post_id, page=1, page_size=None, max_depth=None):
+        """Return (roots, has_more) for a page of a post's discussion."""
+        page_size = page_size or self.page_size
+        max_depth = self.max_depth if max_depth is None else max_depth
+        offset = (page - 1) * page_size
+        
+        roots = list(
+            self._base_queryset()
+            .filter(post_id=post_id, depth=0)
+            .order_by('path')[offset:offset + page_size + 1]
+        )
+        has_more = len(roots) > page_size
+        roots = roots[:page_size]
+        self._attach_descendants(roots, max_depth)
+        return roots, has_more
+    
+    def get_subtree(self, comment, max_depth=None):
+        """Expand a collapsed branch below comment."""
+        max_depth = self.max_depth if max_depth is None else max_depth
+        root = self._base_queryset().get(pk=comment.pk)
+        self._attach_descendants([root], max_depth)
+        return root
+    
+    def _base_queryset(self):
+        return (
+            Comment.objects.select_related('author')
+            .annotate(replies_count=Count('replies', filter=Q(replies__is_deleted=False)))
+        )
+    
+    def _attach_descendants(self, roots, max_depth):
+        for node in roots:
+            node.children = []
+        if not roots or max_depth <= 0:
+            return
+        
+        # Callers always pass roots of a single depth (a page of top-level
+        # comments, or one branch being expanded)
+        root_depth = roots[0].depth
+        prefix_filter = reduce(operator.or_, (Q(path__startswith=root.path) for root in roots))
+        descendants = (
+            self._base_queryset()
+            .filter(prefix_filter, post_id=roots[0].post_id, depth__gt=root_depth, depth__lte=root_depth + max_depth)
+            .order_by('path')
+        )
+        
+        by_path = {root.path: root for root in roots}
+        for node in descendants:
+            # Ordered by path, so a parent is always seen before its children;
+            # a missing parent means it was soft-deleted
+            parent = by_path.get(node.path[:-Comment.PATH_STEP])
+            if parent is None:
+                continue
+            node.children = []
+            parent.children.append(node)
+            by_path[node.path] = node
+
+# Global instance
+comment_tree_service = CommentTreeService()
@@ -0,0 +1,97 @@
+import logging
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from .models import Post, PostLike, Comment
+
+logger = logging.getLogger(__name__)
+
+class PostCounterService:
+    """Keeps Post.likes_count/comments_count/shares_count in step with their rows.
+    
+    Every change is a single UPDATE ... SET col = col + n, so concurrent
+    writers never read-modify-write and never lose increments.
+    """
+    COUNTER_FIELDS = ('likes_count', 'comments_count', 'shares_count')
+    
+    def increment(self, post_id, field, amount=1):
+        if field not in self.COUNTER_FIELDS:
+            raise ValueError(f"Unknown counter field: {field}")
+        Post.all_objects.filter(pk=post_id).update(**{field: F(field) + amount})
+    
+    def like(self, post, user):
+        """Like a post. Returns True if a new like was recorded."""
+        try:
+            with transaction.atomic():
+                PostLike.objects.create(post=post, user=user)
+                self.increment(post.pk, 'likes_count')
+            return True
+        except IntegrityError:
+            # (post, user) already exists; revive it if it was soft-deleted
+            with transaction.atomic():
+                revived = PostLike.all_objects.filter(post=post, user=user, is_deleted=True).update(is_deleted=False, deleted_at=None)
+                if revived:
+                    self.increment(post.pk, 'likes_count')
+            return bool(revived)
+    
+    def unlike(self, post, user):
+        """Remove a like. Returns True if a like was removed."""
+        # Soft delete so a later like() revives the same row
+        with transaction.atomic():
+            removed = PostLike.all_objects.filter(post=post, user=user, is_deleted=False).update(is_deleted=True, deleted_at=timezone.now())
+            if removed:
+                self.increment(post.pk, 'likes_count', -1)
+        return bool(removed)
+    
+    def share(self, post):
+        self.increment(post.pk, 'shares_count')
+    
+    def recount(self, post_ids):
+        """Exact likes/comments recount for a known set of posts."""
+        post_ids = list(post_ids)
+        likes = dict(PostLike.objects.filter(post_id__in=post_ids).values('post_id').annotate(n=Count('id')).values_list('post_id', 'n'))
+        comments = dict(Comment.objects.filter(post_id__in=post_ids).values('post_id').annotate(n=Count('id')).values_list('post_id', 'n'))
+        self._apply([(pk, likes.get(pk, 0), comments.get(pk, 0)) for pk in post_ids])
+    
+    def reconcile(self, batch_size=1000):
+        """Recompute likes/comments counts from their rows and fix drifted posts."""
+        likes = (
+            PostLike.objects.filter(post=OuterRef('pk'))
+            .values('post').annotate(n=Count('id')).values('n')
+        )
+        comments = (
+            Comment.objects.filter(post=OuterRef('pk'))
+            .values('post').annotate(n=Count('id')).values('n')
+        )
+        drifted = (
+            Post.all_objects
+            .annotate(
+                actual_likes=Coalesce(Subquery(likes), 0),
+                actual_comments=Coalesce(Subquery(comments), 0),
+            )
+            .filter(~Q(likes_count=F('actual_likes')) | ~Q(comments_count=F('actual_comments')))
+            .values_list('pk', 'actual_likes', 'actual_comments')
+        )
+        
+        fixed = 0
+        batch = []
+        for row in drifted.iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                fixed += self._apply(batch)
+                batch = []
+        if batch:
+            fixed += self._apply(batch)
+        if fixed:
+            logger.warning(f"Reconciled counters on {fixed} posts")
+        return fixed
+    
+    def _apply(self, rows):
+        with transaction.atomic():
+            for pk, likes_count, comments_count in rows:
+                Post.all_objects.filter(pk=pk).update(likes_count=likes_count, comments_count=comments_count)
+        return len(rows)
+
+# Global instance
+post_counter_service = PostCounterService()
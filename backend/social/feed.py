@@ -0,0 +1,159 @@
+import base64
+import logging
+import uuid
+from datetime import datetime
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from .models import Connection, Post, FeedEntry
+
+logger = logging.getLogger(__name__)
+
+CELEBRITIES_KEY = 'feed:celebrities'
+
+class FeedService:
+    """Home feed built from precomputed per-user timelines.
+    
+    Posts are fanned out to the timelines of the author's accepted connections
+    when they are created. Authors with more connections than the celebrity
+    threshold are skipped at write time and merged in at read time instead.
+    """
+    def __init__(self):
+        self.timeline_size = getattr(settings, 'FEED_TIMELINE_SIZE', 800)
+        self.celebrity_threshold = getattr(settings, 'FEED_CELEBRITY_THRESHOLD', 5000)
+        self.batch_size = getattr(settings, 'FEED_FANOUT_BATCH_SIZE', 1000)
+        self.backfill_size = getattr(settings, 'FEED_BACKFILL_SIZE', 20)
+        self.celebrity_ttl = getattr(settings, 'FEED_CELEBRITY_CACHE_TTL', 600)
+    
+    def get_connection_ids(self, user_id):
+        """Return ids of users with an accepted connection to user_id."""
+        edges = Connection.objects.filter(
+            Q(from_user_id=user_id) | Q(to_user_id=user_id),
+            status='accepted',
+        ).values_list('from_user_id', 'to_user_id')
+        return {to_id if from_id == user_id else from_id for from_id, to_id in edges}
+    
+    def get_celebrity_ids(self):
+        """Ids of every user above the celebrity threshold, cached for FEED_CELEBRITY_CACHE_TTL seconds."""
+        ids = cache.get(CELEBRITIES_KEY)
+        if ids is None:
+            ids = self.count_celebrities()
+            cache.set(CELEBRITIES_KEY, ids, self.celebrity_ttl)
+        return ids
+    
+    def count_celebrities(self):
+        """Recount the celebrity set from accepted connections."""
+        accepted = Connection.objects.filter(status='accepted')
+        fields = ('from_user_id', 'to_user_id')
+        # A user above the threshold has more than half of it on one side of the edge
+        candidates = set()
+        for field in fields:
+            rows = accepted.values(field).annotate(n=Count('id')).filter(n__gt=self.celebrity_threshold // 2)
+            candidates.update(row[field] for row in rows)
+        if not candidates:
+            return frozenset()
+        
+        counts = {}
+        for field in fields:
+            rows = accepted.filter(**{f'{field}__in': candidates}).values(field).annotate(n=Count('id'))
+            for row in rows:
+                counts[row[field]] = counts.get(row[field], 0) + row['n']
+        return frozenset(user_id for user_id, n in counts.items() if n > self.celebrity_threshold)
+    
+    def is_celebrity(self, user_id):
+        """Authors above the threshold use fan-out-on-read."""
+        return user_id in self.get_celebrity_ids()
+    
+    def fan_out_post(self, post):
+        """Write a new post into the timelines of the author's connections."""
+        if self.is_celebrity(post.author_id):
+            return 0
+        
+        recipient_ids = self.get_connection_ids(post.author_id)
+        recipient_ids.add(post.author_id)
+        entries = [
+            FeedEntry(user_id=user_id, post_id=post.id, post_created_at=post.created_at)
+            for user_id in recipient_ids
+        ]
+        FeedEntry.objects.bulk_create(entries, batch_size=self.batch_size, ignore_conflicts=True)
+        return len(entries)
+    
+    def remove_post(self, post):
+        """Drop a deleted post from every timeline."""
+        FeedEntry.objects.filter(post_id=post.id).delete()
+    
+    def backfill_connection(self, user_a_id, user_b_id):
+        """Seed each side's timeline with the other's recent posts after an accept."""
+        for owner_id, author_id in ((user_a_id, user_b_id), (user_b_id, user_a_id)):
+            if self.is_celebrity(author_id):
+                continue
+            recent = Post.objects.filter(author_id=author_id).order_by('-created_at').values_list('id', 'created_at')[:self.backfill_size]
+            FeedEntry.objects.bulk_create(
+                [FeedEntry(user_id=owner_id, post_id=post_id, post_created_at=created_at) for post_id, created_at in recent],
+                ignore_conflicts=True,
+            )
+    
+    def unlink_connection(self, user_a_id, user_b_id):
+        """Remove each side's posts from the other's timeline."""
+        FeedEntry.objects.filter(user_id=user_a_id, post__author_id=user_b_id).delete()
+        FeedEntry.objects.filter(user_id=user_b_id, post__author_id=user_a_id).delete()
+    
+    def trim_timeline(self, user_id):
+        """Cap a timeline at timeline_size entries, dropping the oldest."""
+        boundary = (
+            FeedEntry.objects.filter(user_id=user_id)
+            .order_by('-post_created_at')
+            .values_list('post_created_at', flat=True)[self.timeline_size:self.timeline_size + 1]
+        )
+        boundary = list(boundary)
+        if not boundary:
+            return 0
+        deleted, _ = FeedEntry.objects.filter(user_id=user_id, post_created_at__lte=boundary[0]).delete()
+        return deleted
+    
+    def get_feed(self, user, cursor=None, limit=20):
+        """Return (posts, next_cursor) for a user's home feed."""
+        after = self.decode_cursor(cursor)
+        
+        entries = FeedEntry.objects.filter(user_id=user.id)
+        if after:
+            entries = entries.filter(self._before('post_created_at', 'post_id', *after))
+        post_ids = list(entries.order_by('-post_created_at', '-post_id').values_list('post_id', flat=True)[:limit])
+        
+        # Hybrid path: pull celebrity posts at read time
+        celebrity_ids = self.get_celebrity_ids()
+        if celebrity_ids:
+            celebrity_ids = celebrity_ids & self.get_connection_ids(user.id)
+        if celebrity_ids:
+            celebrity_posts = Post.objects.filter(author_id__in=celebrity_ids)
+            if after:
+                celebrity_posts = celebrity_posts.filter(self._before('created_at', 'id', *after))
+            post_ids += list(celebrity_posts.order_by('-created_at', '-id').values_list('id', flat=True)[:limit])
+        
+        posts = Post.objects.filter(id__in=post_ids).select_related('author').order_by('-created_at', '-id')[:limit]
+        posts = list(posts)
+        next_cursor = self.encode_cursor(posts[-1]) if len(posts) == limit else None
+        return posts, next_cursor
+    
+    def _before(self, time_field, id_field, created_at, post_id):
+        """Keyset condition for rows after (created_at, post_id) in newest-first order."""
+        if post_id is None:
+            return Q(**{f'{time_field}__lt': created_at})
+        return Q(**{f'{time_field}__lt': created_at}) | Q(**{time_field: created_at, f'{id_field}__lt': post_id})
+    
+    def encode_cursor(self, post):
+        return base64.urlsafe_b64encode(f'{post.created_at.isoformat()}|{post.id}'.encode()).decode()
+    
+    def decode_cursor(self, cursor):
+        """(created_at, post_id) from a cursor; timestamp-only cursors from older clients have no id."""
+        if not cursor:
+            return None
+        try:
+            created_at, _, post_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition('|')
+            return datetime.fromisoformat(created_at), uuid.UUID(post_id) if post_id else None
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Invalid feed cursor {cursor!r}: {e}")
+            return None
+
+# Global instance
+feed_service = FeedService()
@@ -0,0 +1,142 @@
+import logging
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from .models import Connection
+
+logger = logging.getLogger(__name__)
+
+class ConnectionGraph:
+    """Accepted-connection adjacency kept as sorted int64 arrays in the cache.
+    
+    Each user's neighbours are stored once as a packed sorted array, so
+    mutuals are a merge of two arrays and second/third-degree lookups fetch
+    whole frontiers with a single cache.get_many.
+    """
+    KEY_PREFIX = 'graph:adj:'
+    
+    def __init__(self):
+        self.timeout = getattr(settings, 'CONNECTION_GRAPH_CACHE_TIMEOUT', 60 * 60 * 24)
+        self.max_frontier = getattr(settings, 'CONNECTION_GRAPH_MAX_FRONTIER', 5000)
+    
+    def neighbors(self, user_id):
+        return self.load([user_id])[user_id]
+    
+    def load(self, user_ids):
+        """Return {user_id: sorted array} for user_ids, filling cache misses from the DB."""
+        user_ids = list(user_ids)
+        cached = cache.get_many([self._key(uid) for uid in user_ids])
+        result = {}
+        missing = []
+        for uid in user_ids:
+            raw = cached.get(self._key(uid))
+            if raw is None:
+                missing.append(uid)
+            else:
+                result[uid] = self._unpack(raw)
+        
+        if missing:
+            adjacency = {uid: [] for uid in missing}
+            edges = Connection.objects.filter(
+                Q(from_user_id__in=missing) | Q(to_user_id__in=missing),
+                status='accepted',
+            ).values_list('from_user_id', 'to_user_id')
+            for from_id, to_id in edges.iterator():
+                if from_id in adjacency:
+                    adjacency[from_id].append(to_id)
+                if to_id in adjacency:
+                    adjacency[to_id].append(from_id)
+            fresh = {uid: array('q', sorted(set(ids))) for uid, ids in adjacency.items()}
+            cache.set_many({self._key(uid): arr.tobytes() for uid, arr in fresh.items()}, self.timeout)
+            result.update(fresh)
+        return result
+    
+    def add_edge(self, user_a_id, user_b_id):
+        self.invalidate(user_a_id, user_b_id)
+    
+    def remove_edge(self, user_a_id, user_b_id):
+        self.invalidate(user_a_id, user_b_id)
+    
+    def invalidate(self, *user_ids):
+        """Drop cached adjacencies; the next load() rebuilds them from committed rows.
+        
+        Deleting instead of patching keeps concurrent accepts from overwriting
+        each other's edges, and with a shared cache (REDIS_URL) every worker
+        sees the change.
+        """
+        cache.delete_many([self._key(uid) for uid in user_ids])
+    
+    def mutuals(self, user_a_id, user_b_id):
+        adjacency = self.load([user_a_id, user_b_id])
+        return self._intersect(adjacency[user_a_id], adjacency[user_b_id])
+    
+    def mutual_count(self, user_a_id, user_b_id):
+        return len(self.mutuals(user_a_id, user_b_id))
+    
+    def degree(self, user_a_id, user_b_id, max_degree=3):
+        """Degree of separation up to max_degree (max 3), or None if further."""
+        if user_a_id == user_b_id:
+            return 0
+        adjacency = self.load([user_a_id, user_b_id])
+        near_a, near_b = adjacency[user_a_id], adjacency[user_b_id]
+        if self._contains(near_a, user_b_id):
+            return 1
+        if max_degree >= 2 and self._intersect(near_a, near_b):
+            return 2
+        if max_degree >= 3:
+            # Expand the smaller side one hop and meet the other side's neighbours
+            small, large = (near_a, near_b) if len(near_a) <= len(near_b) else (near_b, near_a)
+            for neighbours in self.load(small[:self.max_frontier]).values():
+                if self._intersect(neighbours, large):
+                    return 3
+        return None
+    
+    def people_you_may_know(self, user_id, limit=20):
+        """Second-degree users ranked by number of mutual connections."""
+        direct = self.neighbors(user_id)
+        scores = Counter()
+        for neighbours in self.load(direct[:self.max_frontier]).values():
+            scores.update(neighbours)
+        scores.pop(user_id, None)
+        for uid in direct:
+            scores.pop(uid, None)
+        return scores.most_common(limit)
+    
+    def _intersect(self, a, b):
+        """Intersect two sorted arrays; binary search when sizes are lopsided."""
+        if len(a) > len(b):
+            a, b = b, a
+        if not a:
+            return []
+        if len(a) * 16 < len(b):
+            return [x for x in a if self._contains(b, x)]
+        result = []
+        i = j = 0
+        while i < len(a) and j < len(b):
+            if a[i] == b[j]:
+                result.append(a[i])
+                i += 1
+                j += 1
+            elif a[i] < b[j]:
+                i += 1
+            else:
+                j += 1
+        return result
+    
+    def _contains(self, arr, value):
+        pos = bisect_left(arr, value)
+        return pos < len(arr) and arr[pos] == value
+    
+    def _unpack(self, raw):
+        arr = array('q')
+        arr.frombytes(raw)
+        return arr
+    
+    def _key(self, user_id):
+        return f'{self.KEY_PREFIX}{user_id}'
+
+# Global instance
+connection_graph = ConnectionGraph()
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from social.models import Comment
+
+class Command(BaseCommand):
+    help = 'Recompute Comment.path and depth, parents before children.'
+    
+    def handle(self, *args, **options):
+        paths = {}
+        pending = list(Comment.all_objects.order_by('created_at').only('id', 'parent_id', 'created_at'))
+        updated = []
+        while pending:
+            deferred = []
+            for comment in pending:
+                if comment.parent_id and comment.parent_id not in paths:
+                    deferred.append(comment)
+                    continue
+                comment.path = paths.get(comment.parent_id, '') + comment.path_key()
+                comment.depth = len(comment.path) // Comment.PATH_STEP - 1
+                paths[comment.id] = comment.path
+                updated.append(comment)
+            if len(deferred) == len(pending):
+                self.stderr.write(f'{len(deferred)} comments have unreachable parents; skipped')
+                break
+            pending = deferred
+        Comment.all_objects.bulk_update(updated, ['path', 'depth'], batch_size=1000)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt paths for {len(updated)} comments'))
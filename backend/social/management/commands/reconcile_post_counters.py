@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from social.counters import post_counter_service
+
+class Command(BaseCommand):
+    help = 'Recompute Post like/comment counters from PostLike and Comment rows.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+    
+    def handle(self, *args, **options):
+        fixed = post_counter_service.reconcile(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Reconciled {fixed} posts'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from social.feed import feed_service
+from social.models import FeedEntry
+
+class Command(BaseCommand):
+    help = 'Cap every home timeline at FEED_TIMELINE_SIZE entries.'
+    
+    def handle(self, *args, **options):
+        user_ids = FeedEntry.objects.values_list('user_id', flat=True).distinct()
+        trimmed = 0
+        for user_id in user_ids.iterator():
+            trimmed += feed_service.trim_timeline(user_id)
+        self.stdout.write(self.style.SUCCESS(f'Trimmed {trimmed} timeline entries'))
@@ -1,5 +1,5 @@
 from django.db import models
-from core.models import BaseModel
+from core.models import BaseModel, DELETED_ROWS, LIVE_ROWS
 from authentication.models import User
 
 class Connection(BaseModel):
@@ -19,8 +19,8 @@ class Connection(BaseModel):
     class Meta:
         unique_together = ['from_user', 'to_user']
         indexes = [
-            models.Index(fields=['from_user', 'status']),
-            models.Index(fields=['to_user', 'status']),
+            models.Index(fields=['from_user', 'status'], condition=LIVE_ROWS, name='conn_from_live_idx'),
+            models.Index(fields=['to_user', 'status'], condition=LIVE_ROWS, name='conn_to_live_idx'),
             models.Index(fields=['status', 'created_at']),
         ]
 
@@ -43,12 +43,15 @@ class Post(BaseModel):
     shares_count = models.IntegerField(default=0, db_index=True)
     is_pinned = models.BooleanField(default=False)
     
+    soft_delete_cascade = ['comments', 'likes']
+    
     class Meta:
         indexes = [
-            models.Index(fields=['author', 'created_at']),
-            models.Index(fields=['post_type', 'created_at']),
+            models.Index(fields=['author', 'created_at'], condition=LIVE_ROWS, name='post_author_live_idx'),
+            models.Index(fields=['post_type', 'created_at'], condition=LIVE_ROWS, name='post_type_live_idx'),
             models.Index(fields=['likes_count', 'created_at']),
             models.Index(fields=['is_pinned', 'created_at']),
+            models.Index(fields=['deleted_at'], condition=DELETED_ROWS, name='post_purge_idx'),
         ]
 
 class PostLike(BaseModel):
@@ -61,18 +64,68 @@ class PostLike(BaseModel):
         indexes = [
             models.Index(fields=['post', 'created_at']),
             models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['deleted_at'], condition=DELETED_ROWS, name='postlike_purge_idx'),
         ]
 
 class Comment(BaseModel):
     """Post comments."""
+    PATH_STEP = 16
+    # path (max_length 900) fits 56 levels; replies to a comment at MAX_DEPTH
+    # are attached to its parent instead, so threads flatten past this depth
+    MAX_DEPTH = 50
+    
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     content = models.TextField()
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies')
+    # Materialized path: one fixed-width key per ancestor, so a whole thread
+    # sorts depth-first by path and loads with a single prefix query.
+    path = models.CharField(max_length=900, blank=True, db_index=True)
+    depth = models.PositiveSmallIntegerField(default=0)
     
     class Meta:
         indexes = [
             models.Index(fields=['post', 'created_at']),
             models.Index(fields=['author', 'created_at']),
             models.Index(fields=['parent', 'created_at']),
-        ]
\ No newline at end of file
+            models.Index(fields=['post', 'depth', 'created_at'], condition=LIVE_ROWS, name='comment_roots_live_idx'),
+            models.Index(fields=['post', 'path'], condition=LIVE_ROWS, name='comment_path_live_idx'),
+            models.Index(fields=['deleted_at'], condition=DELETED_ROWS, name='comment_purge_idx'),
+        ]
+    
+    def path_key(self):
+        """Fixed-width sortable key: base36 microsecond timestamp plus id prefix."""
+        micros = int(self.created_at.timestamp() * 1_000_000)
+        digits = ''
+        while micros:
+            micros, rem = divmod(micros, 36)
+            digits = '0123456789abcdefghijklmnopqrstuvwxyz'[rem] + digits
+        return digits.rjust(12, '0') + self.id.hex[:4]
+    
+    def save(self, *args, **kwargs):
+        if not self.path:
+            parent_path = ''
+            if self.parent_id:
+                parent = self.parent
+                if parent.depth >= self.MAX_DEPTH:
+                    self.parent_id = parent.parent_id
+                    parent_path = parent.path[:-self.PATH_STEP]
+                else:
+                    parent_path = parent.path
+            self.path = parent_path + self.path_key()
+            self.depth = len(self.path) // self.PATH_STEP - 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'path', 'depth', 'parent'}
+        super().save(*args, **kwargs)
+
+class FeedEntry(models.Model):
+    """Precomputed home-timeline entry (fan-out-on-write)."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='feed_entries')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='feed_entries')
+    post_created_at = models.DateTimeField()
+    
+    class Meta:
+        unique_together = ['user', 'post']
+        indexes = [
+            models.Index(fields=['user', '-post_created_at', '-post']),
+        ]
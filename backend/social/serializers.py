@@ -0,0 +1,23 @@
+from rest_framework import serializers
+from .models import Post, Comment
+from authentication.serializers import UserSerializer
+
+class PostSerializer(serializers.ModelSerializer):
+    author = UserSerializer(read_only=True)
+    
+    class Meta:
+        model = Post
+        fields = '__all__'
+        read_only_fields = ['author', 'likes_count', 'comments_count', 'shares_count', 'created_at', 'updated_at']
+
+class CommentTreeSerializer(serializers.ModelSerializer):
+    author = UserSerializer(read_only=True)
+    replies_count = serializers.IntegerField(read_only=True)
+    children = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Comment
+        fields = ['id', 'post', 'author', 'content', 'parent', 'depth', 'created_at', 'replies_count', 'children']
+    
+    def get_children(self, obj):
+        return CommentTreeSerializer(getattr(obj, 'children', []), many=True).data
@@ -0,0 +1,78 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core.signals import bulk_restored, bulk_soft_deleted
+from .models import Comment, Connection, FeedEntry, Post, PostLike
+from .counters import post_counter_service
+from .feed import feed_service
+from .graph import connection_graph
+
+@receiver(post_save, sender=Post)
+def fan_out_new_post(sender, instance, created, **kwargs):
+    """Push new posts to connection timelines once the insert commits."""
+    if created:
+        transaction.on_commit(lambda: feed_service.fan_out_post(instance))
+    elif instance.is_deleted:
+        feed_service.remove_post(instance)
+
+@receiver(post_delete, sender=Post)
+def remove_deleted_post(sender, instance, **kwargs):
+    feed_service.remove_post(instance)
+
+@receiver(post_save, sender=Connection)
+def sync_timelines_on_connection(sender, instance, created, **kwargs):
+    """Backfill timelines on accept, unlink them when an edge is withdrawn."""
+    if instance.status == 'accepted' and not instance.is_deleted:
+        transaction.on_commit(lambda: connection_graph.add_edge(instance.from_user_id, instance.to_user_id))
+        transaction.on_commit(lambda: feed_service.backfill_connection(instance.from_user_id, instance.to_user_id))
+    elif not created:
+        transaction.on_commit(lambda: connection_graph.remove_edge(instance.from_user_id, instance.to_user_id))
+        feed_service.unlink_connection(instance.from_user_id, instance.to_user_id)
+
+@receiver(post_delete, sender=Connection)
+def remove_connection_edge(sender, instance, **kwargs):
+    transaction.on_commit(lambda: connection_graph.remove_edge(instance.from_user_id, instance.to_user_id))
+    feed_service.unlink_connection(instance.from_user_id, instance.to_user_id)
+
+@receiver(post_save, sender=Comment)
+def count_comment(sender, instance, created, update_fields=None, **kwargs):
+    """Adjust comments_count on create and on soft delete/restore."""
+    if created:
+        delta = 0 if instance.is_deleted else 1
+    elif update_fields and 'is_deleted' in update_fields:
+        delta = -1 if instance.is_deleted else 1
+    else:
+        return
+    if delta:
+        post_counter_service.increment(instance.post_id, 'comments_count', delta)
+
+@receiver(post_delete, sender=Comment)
+def uncount_comment(sender, instance, **kwargs):
+    if not instance.is_deleted:
+        post_counter_service.increment(instance.post_id, 'comments_count', -1)
+
+@receiver([bulk_soft_deleted, bulk_restored])
+def sync_after_bulk_soft_delete(sender, affected, signal, **kwargs):
+    """Batched follow-up for queryset soft_delete()/restore()."""
+    if Post in affected and signal is bulk_soft_deleted:
+        FeedEntry.objects.filter(post_id__in=affected[Post]).delete()
+    if Post in affected and signal is bulk_restored:
+        for post in Post.objects.filter(pk__in=affected[Post]):
+            feed_service.fan_out_post(post)
+    if Connection in affected:
+        # Same graph and timeline upkeep as a single accepted edge being withdrawn or re-added
+        edges = Connection.all_objects.filter(pk__in=affected[Connection], status='accepted').values_list('from_user_id', 'to_user_id')
+        for from_user_id, to_user_id in edges:
+            if signal is bulk_soft_deleted:
+                connection_graph.remove_edge(from_user_id, to_user_id)
+                feed_service.unlink_connection(from_user_id, to_user_id)
+            else:
+                connection_graph.add_edge(from_user_id, to_user_id)
+                feed_service.backfill_connection(from_user_id, to_user_id)
+    
+    post_ids = set()
+    for model in (Comment, PostLike):
+        if model in affected:
+            post_ids.update(model.all_objects.filter(pk__in=affected[model]).values_list('post_id', flat=True))
+    if post_ids:
+        post_counter_service.recount(post_ids)
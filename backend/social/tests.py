@@ -0,0 +1,162 @@
+import threading
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from authentication.models import User
+from .counters import post_counter_service
+from .feed import feed_service
+from .graph import connection_graph
+from .models import Comment, Connection, FeedEntry, Post, PostLike
+
+def make_user(name, **extra):
+    return User.objects.create(username=name, email=f'{name}@example.com', **extra)
+
+class HomeFeedTests(TestCase):
+    def setUp(self):
+        self.user = make_user('reader')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+    
+    def test_malformed_limits_are_clamped(self):
+        for limit in ('abc', '0', '-1', '1000'):
+            response = self.client.get('/api/social/feed/', {'limit': limit})
+            self.assertEqual(response.status_code, 200, limit)
+    
+    def test_cursor_does_not_skip_tied_timestamps(self):
+        now = timezone.now()
+        posts = [Post.objects.create(author=self.user, content=str(i), created_at=now) for i in range(5)]
+        FeedEntry.objects.bulk_create(
+            [FeedEntry(user=self.user, post=post, post_created_at=now) for post in posts], ignore_conflicts=True,
+        )
+        seen, cursor = [], None
+        while True:
+            page, cursor = feed_service.get_feed(self.user, cursor=cursor, limit=2)
+            seen += [post.id for post in page]
+            if cursor is None:
+                break
+        self.assertEqual(sorted(seen), sorted(post.id for post in posts))
+        self.assertEqual(len(seen), len(set(seen)))
+
+class PostCounterTests(TransactionTestCase):
+    THREADS = 16
+    
+    def setUp(self):
+        self.post = Post.objects.create(author=make_user('author'), content='hello')
+    
+    def run_concurrently(self, func, args):
+        barrier = threading.Barrier(len(args))
+        errors = []
+        def target(arg):
+            try:
+                barrier.wait()
+                func(self.post, arg)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+        threads = [threading.Thread(target=target, args=(arg,)) for arg in args]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.post.refresh_from_db()
+    
+    def test_concurrent_likes_are_all_counted(self):
+        users = [make_user(f'fan{i}') for i in range(self.THREADS)]
+        self.run_concurrently(post_counter_service.like, users)
+        self.assertEqual(self.post.likes_count, self.THREADS)
+        self.assertEqual(PostLike.objects.filter(post=self.post).count(), self.THREADS)
+    
+    def test_concurrent_duplicate_likes_count_once(self):
+        user = make_user('fan')
+        self.run_concurrently(post_counter_service.like, [user] * self.THREADS)
+        self.assertEqual(self.post.likes_count, 1)
+    
+    def test_like_unlike_like_revives_the_row(self):
+        user = make_user('fan')
+        self.assertTrue(post_counter_service.like(self.post, user))
+        self.assertTrue(post_counter_service.unlike(self.post, user))
+        self.assertFalse(post_counter_service.unlike(self.post, user))
+        self.assertTrue(post_counter_service.like(self.post, user))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertEqual(PostLike.all_objects.filter(post=self.post, user=user).count(), 1)
+    
+    def test_repeated_comment_soft_delete_counts_once(self):
+        comment = Comment.objects.create(post=self.post, author=self.post.author, content='hi')
+        comment.soft_delete()
+        comment.soft_delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 0)
+
+class CommentThreadTests(TestCase):
+    def test_malformed_page_is_clamped(self):
+        post = Post.objects.create(author=make_user('author'), content='hello')
+        response = APIClient().get(f'/api/social/posts/{post.pk}/comments/', {'page': 'x'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['page'], 1)
+    
+    def test_replies_below_max_depth_attach_to_the_parent(self):
+        post = Post.objects.create(author=make_user('author'), content='hello')
+        comment = None
+        for i in range(Comment.MAX_DEPTH + 5):
+            comment = Comment.objects.create(post=post, author=post.author, content=str(i), parent=comment)
+        self.assertEqual(comment.depth, Comment.MAX_DEPTH)
+        self.assertEqual(comment.parent.depth, Comment.MAX_DEPTH - 1)
+        self.assertTrue(comment.path.startswith(comment.parent.path))
+        self.assertLessEqual(len(comment.path), Comment._meta.get_field('path').max_length)
+
+class ConnectionGraphTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.a, self.b, self.c, self.d, self.e, self.f = (make_user(name) for name in 'abcdef')
+        # a - b - c, a - d - c, c - e; f is unconnected
+        for from_user, to_user in ((self.a, self.b), (self.b, self.c), (self.d, self.a), (self.c, self.d), (self.c, self.e)):
+            self.connect(from_user, to_user)
+    
+    def connect(self, from_user, to_user):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Connection.objects.create(from_user=from_user, to_user=to_user, status='accepted')
+    
+    def test_mutual_connections(self):
+        self.assertEqual(list(connection_graph.mutuals(self.a.id, self.c.id)), [self.b.id, self.d.id])
+        self.assertEqual(connection_graph.mutual_count(self.a.id, self.e.id), 0)
+    
+    def test_degree_of_separation(self):
+        self.assertEqual(connection_graph.degree(self.a.id, self.a.id), 0)
+        self.assertEqual(connection_graph.degree(self.a.id, self.b.id), 1)
+        self.assertEqual(connection_graph.degree(self.a.id, self.c.id), 2)
+        self.assertEqual(connection_graph.degree(self.a.id, self.e.id), 3)
+        self.assertIsNone(connection_graph.degree(self.a.id, self.e.id, max_degree=2))
+        self.assertIsNone(connection_graph.degree(self.a.id, self.f.id))
+    
+    def test_people_you_may_know_ranks_by_mutuals(self):
+        self.connect(self.e, self.b)
+        self.assertEqual(connection_graph.people_you_may_know(self.a.id), [(self.c.id, 2), (self.e.id, 1)])
+        client = APIClient()
+        client.force_authenticate(self.a)
+        response = client.get('/api/social/connections/suggestions/')
+        self.assertEqual([(row['user']['id'], row['mutual_count']) for row in response.data], [(self.c.id, 2), (self.e.id, 1)])
+    
+    def test_new_connection_invalidates_cached_adjacency(self):
+        self.assertNotIn(self.f.id, connection_graph.neighbors(self.a.id))
+        self.connect(self.a, self.f)
+        self.assertIn(self.f.id, connection_graph.neighbors(self.a.id))
+        self.assertIn(self.a.id, connection_graph.neighbors(self.f.id))
+    
+    def test_removed_connection_invalidates_cached_adjacency(self):
+        self.assertEqual(connection_graph.degree(self.a.id, self.b.id), 1)
+        edge = Connection.objects.get(from_user=self.a, to_user=self.b)
+        with self.captureOnCommitCallbacks(execute=True):
+            edge.soft_delete()
+        self.assertNotIn(self.b.id, connection_graph.neighbors(self.a.id))
+        self.assertEqual(connection_graph.degree(self.a.id, self.b.id), 3)
+        
+        edge = Connection.objects.get(from_user=self.c, to_user=self.e)
+        with self.captureOnCommitCallbacks(execute=True):
+            edge.delete()
+        self.assertNotIn(self.e.id, connection_graph.neighbors(self.c.id))
+        self.assertIsNone(connection_graph.degree(self.a.id, self.e.id))
@@ -0,0 +1,11 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('feed/', views.home_feed, name='home-feed'),
+    path('posts/<uuid:pk>/like/', views.like_post, name='post-like'),
+    path('posts/<uuid:pk>/comments/', views.comment_thread, name='post-comments'),
+    path('comments/<uuid:pk>/replies/', views.comment_replies, name='comment-replies'),
+    path('connections/<int:user_id>/insights/', views.connection_insights, name='connection-insights'),
+    path('connections/suggestions/', views.people_you_may_know, name='people-you-may-know'),
+]
@@ -0,0 +1,80 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from .comments import comment_tree_service
+from .counters import post_counter_service
+from .feed import feed_service
+from .graph import connection_graph
+from .models import Post, Comment
+from .serializers import PostSerializer, CommentTreeSerializer
+from authentication.models import User
+from authentication.serializers import UserSerializer
+from core.params import int_param
+from notifications.pipeline import notification_pipeline
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def home_feed(request):
+    """Cursor-paged home feed for the current user."""
+    limit = int_param(request, 'limit', 20, maximum=100)
+    posts, next_cursor = feed_service.get_feed(request.user, cursor=request.GET.get('cursor'), limit=limit)
+    return Response({
+        'results': PostSerializer(posts, many=True).data,
+        'next_cursor': next_cursor,
+    })
+
+@api_view(['POST', 'DELETE'])
+@permission_classes([permissions.IsAuthenticated])
+def like_post(request, pk):
+    """Like (POST) or unlike (DELETE) a post; repeated calls are no-ops."""
+    post = get_object_or_404(Post, pk=pk)
+    if request.method == 'POST':
+        changed = post_counter_service.like(post, request.user)
+        if changed:
+            notification_pipeline.publish('post_like', [post.author_id], 'liked your post', sender=request.user, target=post)
+    else:
+        changed = post_counter_service.unlike(post, request.user)
+    post.refresh_from_db(fields=['likes_count'])
+    return Response({'changed': changed, 'likes_count': post.likes_count})
+
+@api_view(['GET'])
+def comment_thread(request, pk):
+    """Paged top-level comments of a post with their replies nested."""
+    post = get_object_or_404(Post, pk=pk)
+    page = int_param(request, 'page', 1)
+    roots, has_more = comment_tree_service.get_thread(post.pk, page=page)
+    return Response({
+        'results': CommentTreeSerializer(roots, many=True).data,
+        'page': page,
+        'has_more': has_more,
+    })
+
+@api_view(['GET'])
+def comment_replies(request, pk):
+    """Expand a collapsed branch below a comment."""
+    comment = get_object_or_404(Comment, pk=pk)
+    subtree = comment_tree_service.get_subtree(comment)
+    return Response(CommentTreeSerializer(subtree).data)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def connection_insights(request, user_id):
+    """Mutual connections and degree of separation between the current user and user_id."""
+    mutual_ids = connection_graph.mutuals(request.user.id, user_id)
+    return Response({
+        'degree': connection_graph.degree(request.user.id, user_id),
+        'mutual_count': len(mutual_ids),
+        'mutuals': UserSerializer(User.objects.filter(id__in=mutual_ids[:10]), many=True).data,
+    })
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def people_you_may_know(request):
+    """Second-degree suggestions ranked by mutual connections."""
+    ranked = connection_graph.people_you_may_know(request.user.id, limit=int_param(request, 'limit', 20, maximum=100))
+    users = User.objects.in_bulk([uid for uid, _ in ranked])
+    return Response([
+        {'user': UserSerializer(users[uid]).data, 'mutual_count': count}
+        for uid, count in ranked if uid in users
+    ])